@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0029_alter_settings_peer_feedback_1_is_visible_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='symmetry_breaking',
+            field=models.IntegerField(choices=[(0, 'Aus'), (1, 'Geordnete Nutzung der Projektinstanzen'), (2, 'Geordnete Nutzung und Sortierung nach erstem Teammitglied')], default=0, help_text='Instanzen eines Projekts sind austauschbar und erzeugen viele gleichwertige Lösungen.<br />Die Symmetriebrechung schließt diese aus, ohne die bestmögliche Lösung zu verändern.', verbose_name='OR-Tools: Symmetriebrechung der Projektinstanzen'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0030_devsettings_symmetry_breaking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='model_variant',
+            field=models.IntegerField(choices=[(1, 'Modell 1: Zuordnung zu Projektinstanzen'), (2, 'Modell 2: Zuordnung zu Projekten mit Anzahl der Teams je Projekt')], default=1, help_text='Modell 1: Jeder Student wird direkt einer Projektinstanz zugeordnet.<br />Modell 2: Jeder Student wird einem Projekt zugeordnet und die Teams werden danach auf die Projektinstanzen aufgeteilt. Das Modell ist um die Anzahl der Projektinstanzen kleiner, unterstützt aber kein Ambitionsniveau. Die Varianten mit Ambitionsniveau verwenden deshalb immer Modell 1.', verbose_name='OR-Tools: Modellvariante'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0031_devsettings_model_variant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='compress_students',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv, werden Studenten mit gleichen Antworten (Projekte, Wing und ggf. Ambitionsniveau) im Modell als eine Gruppe mit einer Anzahl je Projektinstanz statt einzeln zugeordnet.', verbose_name='OR-Tools: Studenten mit gleichen Antworten zusammenfassen'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0032_devsettings_compress_students'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='use_warm_start',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv, beginnt eine erneute Teamgenerierung mit den vorhandenen Teams als Startlösung. Nach kleinen Änderungen wird so schneller eine gute Lösung gefunden.', verbose_name='OR-Tools: Vorhandene Teams als Startlösung verwenden'),
+        ),
+    ]
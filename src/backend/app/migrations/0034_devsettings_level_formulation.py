@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0033_devsettings_use_warm_start'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='level_formulation',
+            field=models.IntegerField(choices=[(1, 'Reifizierte Bedingungen je Projektinstanz (Fallback)'), (2, 'Lineare Bedingungen mit gemeinsamen Levelvariablen')], default=1, help_text='Gilt nur für die Varianten mit Ambitionsniveau.<br />Die lineare Formulierung liefert engere Schranken und erreicht dadurch schneller eine optimale Lösung.', verbose_name='OR-Tools: Formulierung des Ambitionsniveaus'),
+        ),
+    ]
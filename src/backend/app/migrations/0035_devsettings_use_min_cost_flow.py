@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0034_devsettings_level_formulation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='use_min_cost_flow',
+            field=models.BooleanField(default=False, help_text='Löst die Zuordnung ohne Ambitionsniveau exakt als Min-Cost-Flow, falls alle Projektinstanzen benötigt werden und kein Projekt mindestens 2 Flügelstudenten braucht.<br />Sonst wird OR-Tools CP-SAT verwendet.', verbose_name='Min-Cost-Flow für Variante 1 verwenden'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0035_devsettings_use_min_cost_flow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='lns_min_students',
+            field=models.PositiveIntegerField(default=0, help_text='Ab dieser Anzahl Studenten wird die Zuordnung schrittweise verbessert, indem wiederholt die Teams eines Teils der Studenten neu optimiert werden. Für große Kohorten wird so schneller eine gute Lösung gefunden.<br />Der Wert 0 deaktiviert die Large Neighbourhood Search.', verbose_name='OR-Tools: Large Neighbourhood Search ab Anzahl Studenten'),
+        ),
+    ]
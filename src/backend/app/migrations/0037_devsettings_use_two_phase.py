@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0036_devsettings_lns_min_students'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='use_two_phase',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv, wählt zuerst das kleinere Modell 2 die Anzahl der Teams je Projekt. Danach werden die Studenten nur noch diesen Projektinstanzen zugeordnet.<br />Die Auswahl berücksichtigt kein Ambitionsniveau, die Lösung ist nur für die gewählten Projektinstanzen optimal.', verbose_name='OR-Tools: Genutzte Projektinstanzen vorab wählen'),
+        ),
+    ]
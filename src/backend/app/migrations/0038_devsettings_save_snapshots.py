@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0037_devsettings_use_two_phase'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='save_snapshots',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv, werden die Eingabedaten, Optionen und das Modell jeder Teamgenerierung im Verzeichnis <code>snapshots/</code> gespeichert.<br />Mit <code>python manage.py replay_assignment &lt;snapshot&gt;</code> kann die Teamgenerierung offline mit anderen Parametern wiederholt werden.', verbose_name='OR-Tools: Snapshots der Teamgenerierung speichern'),
+        ),
+    ]
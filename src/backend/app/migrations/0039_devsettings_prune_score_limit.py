@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0038_devsettings_save_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='prune_score_limit',
+            field=models.IntegerField(choices=[(0, 'Aus'), (1, 'Bewertung 1 (sehr schlecht)'), (2, 'Bewertungen 1 und 2')], default=0, help_text='Wenn aktiv, erzeugt Modell 1 keine Variablen für Projekte, die ein Student so schlecht bewertet hat. Das verkleinert das Modell, wenn viele Projekte abgelehnt werden.<br />Studenten ohne besser bewertetes Projekt behalten alle Projekte. Reichen die Plätze nicht aus oder findet sich damit keine Lösung, werden alle Projekte wieder zugelassen.<br />Eine optimale Lösung ist dann nur ohne die ausgeschlossenen Projekte optimal.', verbose_name='OR-Tools: Unerwünschte Projekte ausschließen'),
+        ),
+    ]
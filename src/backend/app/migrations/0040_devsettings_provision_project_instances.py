@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0039_devsettings_prune_score_limit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='provision_project_instances',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv, wird je Projekt nur so viele Projektinstanzen angelegt, wie Teams aus den Studenten gebildet werden können, die das Projekt gut oder sehr gut bewertet haben. Reicht das nicht für die benötigte Anzahl an Teams, erhalten die beliebtesten Projekte weitere Instanzen.<br />Die Anzahl der Projektinstanzen je Projekt bzw. die Standardanzahl bleibt die Obergrenze.', verbose_name='Projektinstanzen nach Nachfrage anlegen'),
+        ),
+    ]
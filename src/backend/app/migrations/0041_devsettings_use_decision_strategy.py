@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0040_devsettings_provision_project_instances'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='use_decision_strategy',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv, belegt die Suche von Modell 1 zuerst die beliebtesten Projektinstanzen und ordnet die Studenten zuerst ihren am besten bewerteten Projekten zu.<br />Das kann schneller zu einer ersten guten Lösung führen.', verbose_name='OR-Tools: Suche nach Beliebtheit der Projekte steuern'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0041_devsettings_use_decision_strategy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='use_greedy_start',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv und keine gültigen vorhandenen Teams existieren, wird vorab schnell eine Zuordnung erstellt, bei der die Studenten mit dem größten Verlust zuerst ihr bestes freies Projekt erhalten.<br />Sie dient dem Solver als Startlösung und wird verwendet, falls er in der Laufzeit keine Lösung findet.', verbose_name='OR-Tools: Greedy-Startlösung verwenden'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:54
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0042_devsettings_use_greedy_start'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devsettings',
+            name='local_search_runtime',
+            field=models.PositiveIntegerField(default=0, help_text='Muss zwischen 0 und 60 Sekunden liegen.<br />Ist die Lösung nach der Laufzeit nicht nachweislich optimal, werden danach einzelne Studenten in ein anderes Team verschoben oder zwischen zwei Teams getauscht, solange sich die Lösung verbessert und alle Bedingungen erfüllt bleiben.<br />Der Wert 0 deaktiviert die lokale Nachverbesserung.', validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(60)], verbose_name='OR-Tools: Laufzeit der lokalen Nachverbesserung in Sekunden'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0043_devsettings_local_search_runtime'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='devsettings',
+            name='use_min_cost_flow',
+            field=models.BooleanField(default=False, help_text='Löst die Zuordnung ohne Ambitionsniveau exakt als Min-Cost-Flow, falls kein Projekt mindestens 2 Flügelstudenten braucht.<br />Werden nicht alle Projektinstanzen benötigt, wählt vorab Modell 2 die genutzten Projektinstanzen. Das ist nur möglich, wenn die Flügelstudenten eines Teams in ein Team mit minimaler Größe passen.<br />Sonst wird OR-Tools CP-SAT verwendet und der Grund in den Informationen zum Ergebnis angezeigt.', verbose_name='Min-Cost-Flow für Variante 1 verwenden'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:23
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0044_alter_devsettings_use_min_cost_flow'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='devsettings',
+            name='max_runtime',
+            field=models.PositiveIntegerField(default=300, help_text='Muss zwischen 1 und 3600 Sekunden liegen.<br />Dauert die Laufzeit länger als die angegeben Zeit, wird die Teamgenerierung abgebrochen.<br />Die Teamgenerierung läuft im Hintergrund (<code>run_generation_worker</code>) und ist daher nicht durch den Timeout des Webservers begrenzt.<br />Die Teamreparatur läuft innerhalb der Anfrage und ist zusätzlich auf 10 Sekunden begrenzt.', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(3600)], verbose_name='OR-Tools: Maximale Laufzeit der Teamgenerierung in Sekunden'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0045_alter_devsettings_max_runtime'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='devsettings',
+            name='symmetry_breaking',
+            field=models.IntegerField(choices=[(0, 'Aus'), (1, 'Geordnete Nutzung der Projektinstanzen'), (2, 'Geordnete Nutzung und Sortierung nach erstem Teammitglied')], default=0, help_text='Instanzen eines Projekts sind austauschbar und erzeugen viele gleichwertige Lösungen.<br />Die Symmetriebrechung schließt diese aus, ohne die bestmögliche Lösung zu verändern.<br />Werden Studenten mit gleichen Antworten zusammengefasst, wird nur die geordnete Nutzung verwendet.', verbose_name='OR-Tools: Symmetriebrechung der Projektinstanzen'),
+        ),
+    ]
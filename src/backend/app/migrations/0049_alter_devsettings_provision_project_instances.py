@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0048_alter_devsettings_use_min_cost_flow_verbose_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='devsettings',
+            name='provision_project_instances',
+            field=models.BooleanField(default=False, help_text='Wenn aktiv, wird je Projekt nur so viele Projektinstanzen angelegt, wie Teams aus den Studenten gebildet werden können, die das Projekt gut oder sehr gut bewertet haben. Reicht das nicht für die benötigte Anzahl an Teams, erhalten die beliebtesten Projekte weitere Instanzen.<br />Die Anzahl der Projektinstanzen je Projekt bzw. die Standardanzahl bleibt die Obergrenze.', verbose_name='OR-Tools: Projektinstanzen nach Nachfrage anlegen'),
+        ),
+    ]
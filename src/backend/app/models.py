@@ -226,11 +226,14 @@ class DevSettings(Singleton):
         help_text="Wenn aktiv, werden leere Fragebögen nicht mit neutralen Antworten (3), sondern mit zufälligen Anworten (1-5) ausgefüllt.",
     )
     max_runtime = models.PositiveIntegerField(
-        default=300,  # 300 seconds = 5 minutes
+        # 300 seconds = 5 minutes, the generation runs in the worker and not within the gunicorn timeout (60 seconds).
+        default=300,
         verbose_name="OR-Tools: Maximale Laufzeit der Teamgenerierung in Sekunden",
         help_text="Muss zwischen 1 und 3600 Sekunden liegen.<br />"
         + "Dauert die Laufzeit länger als die angegeben Zeit, wird die Teamgenerierung abgebrochen.<br />"
-        + '<span class="text-danger">Achtung: In der Dockerumgebung ist die maximale Laufzeit auf unter 300 Sekunden limitiert.</span>',
+        + "Die Teamgenerierung läuft im Hintergrund (<code>run_generation_worker</code>) "
+        + "und ist daher nicht durch den Timeout des Webservers begrenzt.<br />"
+        + "Die Teamreparatur läuft innerhalb der Anfrage und ist zusätzlich auf 1 Sekunde begrenzt.",
         validators=[MinValueValidator(1), MaxValueValidator(3600)],
     )
     relative_gap_limit = models.FloatField(
@@ -250,6 +253,130 @@ class DevSettings(Singleton):
         + "This should usually be lower than your number of available cpus + hyperthread in your machine.",
         validators=[MinValueValidator(0), MaxValueValidator(64)],
     )
+    model_variant = models.IntegerField(
+        default=1,
+        choices=[
+            (1, "Modell 1: Zuordnung zu Projektinstanzen"),
+            (2, "Modell 2: Zuordnung zu Projekten mit Anzahl der Teams je Projekt"),
+        ],
+        verbose_name="OR-Tools: Modellvariante",
+        help_text="Modell 1: Jeder Student wird direkt einer Projektinstanz zugeordnet.<br />"
+        + "Modell 2: Jeder Student wird einem Projekt zugeordnet und die Teams werden danach auf die Projektinstanzen aufgeteilt. "
+        + "Das Modell ist um die Anzahl der Projektinstanzen kleiner, unterstützt aber kein Ambitionsniveau. "
+        + "Die Varianten mit Ambitionsniveau verwenden deshalb immer Modell 1.",
+    )
+    compress_students = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Studenten mit gleichen Antworten zusammenfassen",
+        help_text="Wenn aktiv, werden Studenten mit gleichen Antworten (Projekte, Wing und ggf. Ambitionsniveau) "
+        + "im Modell als eine Gruppe mit einer Anzahl je Projektinstanz statt einzeln zugeordnet.",
+    )
+    use_warm_start = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Vorhandene Teams als Startlösung verwenden",
+        help_text="Wenn aktiv, beginnt eine erneute Teamgenerierung mit den vorhandenen Teams als Startlösung. "
+        + "Nach kleinen Änderungen wird so schneller eine gute Lösung gefunden.",
+    )
+    symmetry_breaking = models.IntegerField(
+        default=0,
+        choices=[
+            (0, "Aus"),
+            (1, "Geordnete Nutzung der Projektinstanzen"),
+            (2, "Geordnete Nutzung und Sortierung nach erstem Teammitglied"),
+        ],
+        verbose_name="OR-Tools: Symmetriebrechung der Projektinstanzen",
+        help_text="Instanzen eines Projekts sind austauschbar und erzeugen viele gleichwertige Lösungen.<br />"
+        + "Die Symmetriebrechung schließt diese aus, ohne die bestmögliche Lösung zu verändern.<br />"
+        + "Werden Studenten mit gleichen Antworten zusammengefasst, wird nur die geordnete Nutzung verwendet.",
+    )
+    level_formulation = models.IntegerField(
+        default=1,
+        choices=[
+            (1, "Reifizierte Bedingungen je Projektinstanz (Fallback)"),
+            (2, "Lineare Bedingungen mit gemeinsamen Levelvariablen"),
+        ],
+        verbose_name="OR-Tools: Formulierung des Ambitionsniveaus",
+        help_text="Gilt nur für die Varianten mit Ambitionsniveau.<br />"
+        + "Die lineare Formulierung liefert engere Schranken und erreicht dadurch schneller eine optimale Lösung.",
+    )
+    use_min_cost_flow = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Min-Cost-Flow für Variante 1 verwenden",
+        help_text="Löst die Zuordnung ohne Ambitionsniveau exakt als Min-Cost-Flow, "
+        + "falls kein Projekt mindestens 2 Flügelstudenten braucht.<br />"
+        + "Werden nicht alle Projektinstanzen benötigt, wählt vorab Modell 2 die genutzten Projektinstanzen. "
+        + "Das ist nur möglich, wenn die Flügelstudenten eines Teams in ein Team mit minimaler Größe passen.<br />"
+        + "Sonst wird OR-Tools CP-SAT verwendet und der Grund in den Informationen zum Ergebnis angezeigt.",
+    )
+    lns_min_students = models.PositiveIntegerField(
+        default=0,
+        verbose_name="OR-Tools: Large Neighbourhood Search ab Anzahl Studenten",
+        help_text="Ab dieser Anzahl Studenten wird die Zuordnung schrittweise verbessert, "
+        + "indem wiederholt die Teams eines Teils der Studenten neu optimiert werden. "
+        + "Für große Kohorten wird so schneller eine gute Lösung gefunden.<br />"
+        + "Der Wert 0 deaktiviert die Large Neighbourhood Search.",
+    )
+    use_two_phase = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Genutzte Projektinstanzen vorab wählen",
+        help_text="Wenn aktiv, wählt zuerst das kleinere Modell 2 die Anzahl der Teams je Projekt. "
+        + "Danach werden die Studenten nur noch diesen Projektinstanzen zugeordnet.<br />"
+        + "Die Auswahl berücksichtigt kein Ambitionsniveau, die Lösung ist nur für die gewählten Projektinstanzen optimal.",
+    )
+    prune_score_limit = models.IntegerField(
+        default=0,
+        choices=[
+            (0, "Aus"),
+            (1, "Bewertung 1 (sehr schlecht)"),
+            (2, "Bewertungen 1 und 2"),
+        ],
+        verbose_name="OR-Tools: Unerwünschte Projekte ausschließen",
+        help_text="Wenn aktiv, erzeugt Modell 1 keine Variablen für Projekte, die ein Student so schlecht bewertet hat. "
+        + "Das verkleinert das Modell, wenn viele Projekte abgelehnt werden.<br />"
+        + "Studenten ohne besser bewertetes Projekt behalten alle Projekte. Reichen die Plätze nicht aus "
+        + "oder findet sich damit keine Lösung, werden alle Projekte wieder zugelassen.<br />"
+        + "Eine optimale Lösung ist dann nur ohne die ausgeschlossenen Projekte optimal.",
+    )
+    use_decision_strategy = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Suche nach Beliebtheit der Projekte steuern",
+        help_text="Wenn aktiv, belegt die Suche von Modell 1 zuerst die beliebtesten Projektinstanzen "
+        + "und ordnet die Studenten zuerst ihren am besten bewerteten Projekten zu.<br />"
+        + "Das kann schneller zu einer ersten guten Lösung führen.",
+    )
+    use_greedy_start = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Greedy-Startlösung verwenden",
+        help_text="Wenn aktiv und keine gültigen vorhandenen Teams existieren, wird vorab schnell eine Zuordnung "
+        + "erstellt, bei der die Studenten mit dem größten Verlust zuerst ihr bestes freies Projekt erhalten.<br />"
+        + "Sie dient dem Solver als Startlösung und wird verwendet, falls er in der Laufzeit keine Lösung findet.",
+    )
+    local_search_runtime = models.PositiveIntegerField(
+        default=0,
+        verbose_name="OR-Tools: Laufzeit der lokalen Nachverbesserung in Sekunden",
+        help_text="Muss zwischen 0 und 60 Sekunden liegen.<br />"
+        + "Ist die Lösung nach der Laufzeit nicht nachweislich optimal, werden danach einzelne Studenten "
+        + "in ein anderes Team verschoben oder zwischen zwei Teams getauscht, solange sich die Lösung verbessert "
+        + "und alle Bedingungen erfüllt bleiben.<br />"
+        + "Der Wert 0 deaktiviert die lokale Nachverbesserung.",
+        validators=[MinValueValidator(0), MaxValueValidator(60)],
+    )
+    provision_project_instances = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Projektinstanzen nach Nachfrage anlegen",
+        help_text="Wenn aktiv, wird je Projekt nur so viele Projektinstanzen angelegt, wie Teams aus den Studenten "
+        + "gebildet werden können, die das Projekt gut oder sehr gut bewertet haben. "
+        + "Reicht das nicht für die benötigte Anzahl an Teams, erhalten die beliebtesten Projekte weitere Instanzen.<br />"
+        + "Die Anzahl der Projektinstanzen je Projekt bzw. die Standardanzahl bleibt die Obergrenze.",
+    )
+    save_snapshots = models.BooleanField(
+        default=False,
+        verbose_name="OR-Tools: Snapshots der Teamgenerierung speichern",
+        help_text="Wenn aktiv, werden die Eingabedaten, Optionen und das Modell jeder Teamgenerierung "
+        + "im Verzeichnis <code>snapshots/</code> gespeichert.<br />"
+        + "Mit <code>python manage.py replay_assignment &lt;snapshot&gt;</code> kann die Teamgenerierung "
+        + "offline mit anderen Parametern wiederholt werden.",
+    )
     show_debug_info = models.BooleanField(
         default=False,
         verbose_name="Debug-Informationen anzeigen",
@@ -22,6 +22,13 @@ urlpatterns = [
     # Teams
     path("teams/", views.teams, name="teams"),
     path("teams/generate", views.teams_generate, name="teams-generate"),
+    path("teams/generate/cancel", views.teams_generation_cancel, name="teams-generation-cancel"),
+    path("teams/generate/status", views.teams_generation_status, name="teams-generation-status"),
+    path("teams/portfolio", views.teams_portfolio, name="teams-portfolio"),
+    path("teams/portfolio/<int:variant>/apply", views.teams_portfolio_apply, name="teams-portfolio-apply"),
+    path("teams/sweep", views.teams_sweep, name="teams-sweep"),
+    path("teams/sweep/<int:min_size>/apply", views.teams_sweep_apply, name="teams-sweep-apply"),
+    path("teams/repair", views.teams_repair, name="teams-repair"),
     path("teams/delete", views.teams_delete, name="teams-delete"),
     path("teams/print", views.teams_print, name="teams-print"),
     path("teams/<int:id>", views.team_edit, name="team-update"),
@@ -5,7 +5,7 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.forms import AuthenticationForm
 from django.db.models import F, ProtectedError
-from django.http import FileResponse
+from django.http import FileResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.html import format_html
@@ -28,8 +28,16 @@ from poll.helper import (
 from poll.models import POLL_LEVELS, POLL_SCORES
 from team.algorithm import AssignmentAlgorithm
 from team.forms import TeamForm
-from team.helper import delete_team_data, delete_team_member_data_for_student, generate_teams, get_teams_for_view
-from team.models import Team, TeamMember
+from team.helper import (
+    cancel_generation_job,
+    delete_team_data,
+    delete_team_member_data_for_student,
+    get_active_generation_job,
+    get_teams_for_view,
+    queue_generation_job,
+    repair_teams,
+)
+from team.models import GenerationJob, Team, TeamMember
 
 from .forms import (
     DevSettingsForm,
@@ -408,7 +416,17 @@ def teams(request):
     context["is_management_view"] = True
     context["settings"] = settings
     context["dev_settings"] = dev_settings
-    context["is_team_generation_running"] = AssignmentAlgorithm.get_is_running()
+    context["generation_job"] = GenerationJob.objects.first()
+    context["portfolio_job"] = GenerationJob.objects.filter(
+        kind=GenerationJob.Kind.PORTFOLIO, status=GenerationJob.Status.DONE
+    ).first()
+    context["sweep_job"] = GenerationJob.objects.filter(
+        kind=GenerationJob.Kind.SWEEP, status=GenerationJob.Status.DONE
+    ).first()
+    context["sweep_min_sizes"] = (max(1, settings.team_min_member - 2), min(99, settings.team_min_member + 2))
+    context["is_team_generation_running"] = (
+        get_active_generation_job() is not None or AssignmentAlgorithm.get_is_running()
+    )
     context["info"] = info
     data = get_teams_for_view()
     context["teams"] = data.get("teams", [])
@@ -437,12 +455,182 @@ def teams_generate(request):
             )
             return redirect("teams")
 
-        generate_missing_poll_data()
-        generate_teams()
+        # Queues the generation, which is run by the generation worker.
+        if queue_generation_job(force_solve=request.POST.get("force_solve") == "on") is None:
+            messages.error(request, "Achtung: Es ist bereits eine Teamgenerierung geplant oder aktiv.")
+
+    return redirect("teams")
+
+
+@login_required
+@permission_required("team.add_team")
+@permission_required("team.update_team")
+@permission_required("team.delete_team")
+def teams_portfolio(request):
+    # Queues the comparison of the assignment variants, which is run by the generation worker.
+    if request.method == "POST" and queue_generation_job(kind=GenerationJob.Kind.PORTFOLIO) is None:
+        messages.error(request, "Achtung: Es ist bereits eine Teamgenerierung geplant oder aktiv.")
+
+    return redirect("teams")
+
+
+@login_required
+@permission_required("team.add_team")
+@permission_required("team.update_team")
+@permission_required("team.delete_team")
+@permission_required("app.change_devsettings")
+def teams_portfolio_apply(request, variant: int):
+    settings = Settings.load()
+
+    if request.method == "POST":
+        # Check: Do not allow changes, if teams are visible.
+        if settings.teams_is_visible:
+            messages.error(request, "Achtung: Die Teams sind bereits sichtbar.")
+            return redirect("teams")
+
+        # Check: Only allow the compared variants.
+        if variant not in [1, 2, 3]:
+            messages.error(request, f"Achtung: Die Variante {variant} existiert nicht.")
+            return redirect("teams")
+
+        # Sets the variant and generates the teams, which returns the cached result of the comparison.
+        dev_settings = DevSettings.load()
+        dev_settings.assignment_variant = variant
+        dev_settings.save()
+        if queue_generation_job() is None:
+            messages.error(request, "Achtung: Es ist bereits eine Teamgenerierung geplant oder aktiv.")
+        else:
+            messages.success(request, f"Variante {variant} wird übernommen.")
+
+    return redirect("teams")
+
+
+@login_required
+@permission_required("team.add_team")
+@permission_required("team.update_team")
+@permission_required("team.delete_team")
+def teams_sweep(request):
+    if request.method == "POST":
+        try:
+            min_size_from = int(request.POST.get("min_size_from", ""))
+            min_size_to = int(request.POST.get("min_size_to", ""))
+            max_runtime = int(request.POST.get("max_runtime", ""))
+        except ValueError:
+            messages.error(request, "Achtung: Die Teamgrößen und die Laufzeit müssen ganze Zahlen sein.")
+            return redirect("teams")
+
+        # Check: Only allow a small range of sizes with a short runtime.
+        if not 1 <= min_size_from <= min_size_to <= 99 or min_size_to - min_size_from >= 10:
+            messages.error(request, "Achtung: Es können bis zu 10 Teamgrößen zwischen 1 und 99 verglichen werden.")
+            return redirect("teams")
+        if not 1 <= max_runtime <= 600:
+            messages.error(request, "Achtung: Die Laufzeit je Teamgröße muss zwischen 1 und 600 Sekunden liegen.")
+            return redirect("teams")
+
+        # Queues the comparison of the team sizes, which is run by the generation worker.
+        params = {"min_sizes": list(range(min_size_from, min_size_to + 1)), "max_runtime": max_runtime}
+        if queue_generation_job(kind=GenerationJob.Kind.SWEEP, params=params) is None:
+            messages.error(request, "Achtung: Es ist bereits eine Teamgenerierung geplant oder aktiv.")
+
+    return redirect("teams")
+
+
+@login_required
+@permission_required("app.view_settings")
+@permission_required("app.change_settings")
+def teams_sweep_apply(request, min_size: int):
+    if request.method == "POST":
+        # Check: Only allow valid sizes (see `Settings.team_min_member`).
+        if not 1 <= min_size <= 99:
+            messages.error(request, "Achtung: Die Mindestanzahl der Studenten je Team muss zwischen 1 und 99 liegen.")
+            return redirect("teams")
+
+        settings = Settings.load()
+        settings.team_min_member = min_size
+        settings.save()
+        messages.success(request, f"Die Mindestanzahl der Studenten je Team wurde auf {min_size} gesetzt.")
+
+    return redirect("teams")
+
+
+@login_required
+@permission_required("team.add_team")
+@permission_required("team.update_team")
+@permission_required("team.delete_team")
+def teams_generation_cancel(request):
+    if request.method == "POST":
+        job = get_active_generation_job()
+        if cancel_generation_job():
+            if job is None or job.kind == GenerationJob.Kind.GENERATION:
+                messages.success(
+                    request, "Die Teamgenerierung wird abgebrochen. Die bisher beste Teamzuordnung wird gespeichert."
+                )
+            else:
+                messages.success(request, f"Der {job.get_kind_display()} wird abgebrochen.")
+        else:
+            messages.error(request, "Achtung: Es ist keine Teamgenerierung geplant oder aktiv.")
 
     return redirect("teams")
 
 
+@login_required
+@permission_required("team.view_team")
+def teams_generation_status(request):
+    job = GenerationJob.objects.first()
+    if job is None:
+        return JsonResponse({"status": None, "is_active": False})
+
+    elapsed = (timezone.now() - job.started_at).total_seconds() if job.started_at else 0
+    if job.finished_at and job.started_at:
+        elapsed = (job.finished_at - job.started_at).total_seconds()
+
+    return JsonResponse({
+        "status": job.status,
+        "status_name": job.get_status_display(),
+        "is_active": job.is_active,
+        "elapsed": elapsed,
+        "error": job.error,
+        "cancel_requested": job.cancel_requested,
+        "n_solutions": job.n_solutions,
+        "objective_value": job.objective_value,
+        "best_objective_bound": job.best_objective_bound,
+        "gap": job.gap,
+        "wall_time": job.wall_time,
+    })
+
+
+@login_required
+@permission_required("team.add_team")
+@permission_required("team.update_team")
+@permission_required("team.delete_team")
+def teams_repair(request):
+    settings = Settings.load()
+
+    if request.method == "POST":
+        # Check: Do not allow repair, if teams are visible.
+        if settings.teams_is_visible:
+            messages.error(request, "Achtung: Teamreparatur fehlgeschlagen! Die Teams sind bereits sichtbar.")
+            return redirect("students")
+        # Check: Do not allow repair, if an algorithm is running.
+        if AssignmentAlgorithm.get_is_running():
+            messages.error(request, "Achtung: Teamreparatur fehlgeschlagen! Es läuft bereits eine Teamgenerierung.")
+            return redirect("students")
+
+        generate_missing_poll_data()
+        result_info = repair_teams()
+        if result_info is None:
+            messages.error(
+                request, "Achtung: Teamreparatur fehlgeschlagen! Es wurde keine gültige Teamzuordnung gefunden."
+            )
+        else:
+            messages.success(
+                request,
+                f"Teams wurden repariert! {result_info['n_moved_students']} Student(en) wurden verschoben.",
+            )
+
+    return redirect("students")
+
+
 @login_required
 @permission_required("team.delete_team")
 def teams_delete(request):
@@ -307,6 +307,11 @@ LOGGING = {
     },
 }
 
+# --- SNAPSHOTS -------------------------------------------------------
+# - Snapshots of the assignment algorithm (see `team.snapshot`).
+
+SNAPSHOT_DIR = BASE_DIR / "snapshots"
+
 # --- Bootstrap 5 (django-bootstrap5)----------------------------------
 # - https://django-bootstrap5.readthedocs.io/en/latest/settings.html
 
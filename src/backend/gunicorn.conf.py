@@ -22,8 +22,9 @@ backlog = 2048
 workers = max_workers()
 worker_class = "sync"
 worker_connections = 1000
-# The timeout depends on the duration of team generation.
-timeout = 300
+# The team generation runs in the generation worker (see `manage.py run_generation_worker`),
+# so the timeout does not depend on the duration of team generation anymore.
+timeout = 60
 graceful_timeout = 30
 keepalive = 2  # 5
 
@@ -5,10 +5,147 @@ to projects as optimally as possible based on their survey responses.
 
 import logging
 import math
+import threading
+import time
+from collections import Counter
+from itertools import pairwise
 
+import numpy as np
 from django.conf import settings
+from ortools.graph.python import max_flow, min_cost_flow
 from ortools.sat.python import cp_model
 
+# The descriptions of the solver statuses.
+SOLVER_STATUS = {
+    "OPTIMAL": "An optimal feasible solution was found.",
+    "FEASIBLE": "A feasible solution was found, but we don't know if it's optimal.",
+    "INFEASIBLE": "The problem was proven infeasible.",
+    "MODEL_INVALID": "The given CpModelProto didn't pass the validation step.",
+    "UNKNOWN": "The status of the model is unknown.",
+}
+
+
+class AssignmentLock:
+    """
+    The lock, which allows only one running algorithm at a time.
+
+    This default lock only works within one process. Subclasses can share
+    the lock across processes (see `team.lock.DatabaseLock`), which is set
+    with `AssignmentAlgorithm.set_lock()`.
+
+    The thread holding the lock can acquire it again, e.g. to hold it from
+    the start of a team generation until its teams are saved, while the
+    algorithm itself acquires it to run. It must be released as often.
+    """
+
+    def __init__(self):
+        self.__is_locked = False
+        # The thread holding the lock and how often it acquired the lock.
+        self.__holder = None
+        self.__n_acquired = 0
+
+    def acquire(self) -> bool:
+        """
+        Acquires the lock and returns whether it was acquired.
+        """
+
+        if self.__is_locked:
+            if self.__holder != threading.get_ident():
+                return False
+            self.__n_acquired += 1
+            return True
+
+        self.__is_locked = True
+        self.__holder = threading.get_ident()
+        self.__n_acquired = 1
+        return True
+
+    def release(self):
+        """
+        Releases the lock. If it was acquired several times, only the last release frees it.
+        """
+
+        if self.__n_acquired > 1:
+            self.__n_acquired -= 1
+            return
+
+        self.__is_locked = False
+        self.__holder = None
+        self.__n_acquired = 0
+
+    def reset(self):
+        """
+        Releases the lock, even if it is held by someone else.
+        """
+
+        self.__is_locked = False
+        self.__holder = None
+        self.__n_acquired = 0
+
+    def is_locked(self) -> bool:
+        """
+        Returns whether the lock is held.
+        """
+
+        return self.__is_locked
+
+
+class ProgressCallback(cp_model.CpSolverSolutionCallback):
+    """
+    The solution callback, which records the progress of every improving solution.
+    """
+
+    def __init__(self, on_progress=None, print_solutions: bool = False):
+        """
+        The constructor of the progress callback.
+
+        Args:
+            on_progress: The function called with the progress of every improving solution.
+            print_solutions: Whether the progress is printed (e.g. for debugging).
+        """
+
+        super().__init__()
+
+        self.__on_progress = on_progress
+        self.__print_solutions = print_solutions
+
+        # The progress of every improving solution.
+        self.progress: list[dict] = []
+
+    def on_solution_callback(self):
+        """
+        Records the progress of the found solution.
+        """
+
+        self.record(self.objective_value, self.best_objective_bound, self.wall_time)
+
+    def record(self, objective_value: float, best_objective_bound: float, wall_time: float):
+        """
+        Records the progress of an improving solution, e.g. of a search with several solvers.
+
+        Args:
+            objective_value: The objective value of the solution.
+            best_objective_bound: The best known bound of the objective value.
+            wall_time: The wall time of the search in seconds.
+        """
+
+        progress = {
+            "n_solutions": len(self.progress) + 1,
+            "objective_value": objective_value,
+            "best_objective_bound": best_objective_bound,
+            "gap": abs(1 - objective_value / best_objective_bound) if best_objective_bound != 0 else None,
+            "wall_time": wall_time,
+        }
+        self.progress.append(progress)
+
+        if self.__print_solutions:
+            print(
+                f"Solution {progress['n_solutions']}, time = {progress['wall_time']:0.2f} s, "
+                + f"objective = {objective_value}, bound = {best_objective_bound}"
+            )
+        if self.__on_progress is not None:
+            self.__on_progress(progress)
+
 
 class AssignmentAlgorithm:
     """
@@ -24,17 +161,62 @@ class AssignmentAlgorithm:
       - `__add_hc_students_assigned_equally()`
       - `__add_hc_wing_students_assigned_equally()`
       - `__add_hc_number_used_projects_equals_number_required()`
+      - `__add_hc_symmetry_breaking()` (optional)
 
     - Soft constraints evaluate the quality of a potential solution.
       - `__add_sc_maximize_project_score()`
 
+    Without the level and with all project instances used, the assignment
+    is a transportation problem. With the option `use_min_cost_flow` it is
+    solved exactly as min cost flow in milliseconds instead of CP-SAT
+    (see `__solve_min_cost_flow()`). If not all project instances are
+    required, the aggregated model chooses the used ones first. The
+    reason why the flow is not used is part of the result info.
+
+    For large cohorts, the monolithic model does not converge within the
+    max runtime. With the option `lns_min_students`, cohorts with at least
+    this number of students are solved with a large neighbourhood search
+    instead, which repeatedly re-optimizes the assignment of a part of the
+    students (see `__solve_lns()`).
+
+    Deciding which project instances are used is the hardest part of the
+    instance model. With the option `use_two_phase`, the aggregated model
+    (model `2`) first chooses the number of teams per instance group and
+    the instance model then only assigns the students to these project
+    instances (see `__solve_used_projects()`).
+
+    Most students veto several projects. With the option `prune_score_limit`,
+    the instance model has no variables for pairs of project instance and
+    student with a poll answer up to this limit (see `__find_allowed_pairs()`).
+    The status and bound then refer to the remaining pairs. If the pruned
+    model has no solution, all pairs are restored.
+
+    The default search of CP-SAT ignores the order of the variables. With
+    the option `use_decision_strategy`, the search branches first on the
+    usage of popular project instances and then on the pairs with the
+    highest score (see `__add_decision_strategy()`).
+
+    Students with identical answers and wing flag are interchangeable as
+    well. With the option `compress_students` they are grouped into one
+    student class, which is assigned with an integer count variable per
+    project instance instead of one boolean variable per student.
+
+    The model variants are:
+    - `1`: One boolean variable per project instance and student.
+    - `2`: One boolean variable per group of interchangeable project
+      instances (e.g. a project) and student together with the number
+      of teams opened per group. The members of a group are split into
+      the project instances when the result is extracted. This model is
+      smaller by the number of instances per project, but does not
+      support the ambition level, so the level variants use model `1`.
+
     Sources:
     - https://developers.google.com/optimization/
     - https://medium.com/data-science/where-you-should-drop-deep-learning-in-favor-of-constraint-solvers-eaab9f11ef45
     """
 
-    # Indicates whether the algorithm is running.
-    __is_running = False
+    # The lock, which indicates whether an algorithm is running.
+    __lock = AssignmentLock()
 
     def __init__(self, data: dict[int, dict], limits: dict, opts: dict):
         """
@@ -55,6 +237,26 @@ class AssignmentAlgorithm:
             `max_runtime`: The maximum runtime of the solver in seconds.
             `relative_gap_limit`: The relative gap limit for the solver.
             `num_workers`: The number of workers for the solver.
+            `symmetry_breaking`: The symmetry breaking mode for interchangeable project instances.
+            `model_variant`: The model variant (see class description).
+            `compress_students`: Whether students with identical answers are grouped into classes.
+            `level_formulation`: The formulation of the level constraints (variants `2` and `3`).
+            `use_min_cost_flow`: Whether the min cost flow engine is used if possible.
+            `lns_min_students`: The min number of students for the large neighbourhood search (`0` disables it).
+            `use_two_phase`: Whether the used project instances are chosen before the students are assigned.
+            `prune_score_limit`: The max poll answer of the pruned project/student pairs (`0` disables it).
+            `use_decision_strategy`: Whether the search branches first on popular project instances and high scores.
+            `use_greedy_start`: Whether a greedy assignment is used as hint and fallback, if the hint is not feasible.
+            `local_search_runtime`: The max runtime of the local search after a feasible result (`0` disables it).
+
+        The symmetry breaking modes are:
+            `0`: No symmetry breaking.
+            `1`: Interchangeable project instances are used in order.
+            `2`: Like `1` and additionally ordered by their first team member.
+
+        The level formulations are:
+            `1`: Reified bool variables per project instance (fallback).
+            `2`: Shared level variables per project instance with linear constraints.
         """
 
         # Sets the given data.
@@ -73,6 +275,28 @@ class AssignmentAlgorithm:
         self.__relative_gap_limit = opts["relative_gap_limit"]
         # Sets the number of workers.
         self.__num_workers = opts["num_workers"]
+        # Sets the symmetry breaking mode.
+        self.__symmetry_breaking = opts["symmetry_breaking"]
+        # Sets the model variant.
+        self.__model_variant = opts["model_variant"]
+        # Sets whether interchangeable students are grouped into classes.
+        self.__compress_students = opts["compress_students"]
+        # Sets the formulation of the level constraints.
+        self.__level_formulation = opts["level_formulation"]
+        # Sets whether the min cost flow engine may be used.
+        self.__allow_min_cost_flow = opts["use_min_cost_flow"]
+        # Sets the min number of students for the large neighbourhood search.
+        self.__lns_min_students = opts["lns_min_students"]
+        # Sets whether the used project instances are chosen first.
+        self.__allow_two_phase = opts["use_two_phase"]
+        # Sets the max poll answer of the pruned project/student pairs.
+        self.__prune_score_limit = opts["prune_score_limit"]
+        # Sets whether the search is guided by the popularity and the scores.
+        self.__use_decision_strategy = opts["use_decision_strategy"]
+        # Sets whether a greedy assignment is used as start.
+        self.__use_greedy_start = opts["use_greedy_start"]
+        # Sets the max runtime of the local search in seconds.
+        self.__local_search_runtime = opts["local_search_runtime"]
 
         # Sets if the score, level or both are used in the assignment.
         # Variants:
@@ -89,6 +313,20 @@ class AssignmentAlgorithm:
             first_student_data = self.__data_per_student[self.__student_ids[0]]
             self.__project_ids = list(first_student_data.get("project_answers", {}).keys())
 
+        # Sets the normalized score matrix (student x project instance)
+        # and the row and column index of every student and project instance.
+        self.__student_idx = {s_id: idx for idx, s_id in enumerate(self.__student_ids)}
+        self.__project_idx = {p_id: idx for idx, p_id in enumerate(self.__project_ids)}
+        self.__score_matrix = self.__create_score_matrix()
+
+        # Groups the interchangeable students into classes. The model uses the
+        # first student of each class as representative for the whole class.
+        self.__class_members = self.__find_student_classes()
+        self.__class_ids = list(self.__class_members.keys())
+
+        # Groups the interchangeable project instances.
+        self.__instance_groups = self.__find_instance_groups()
+
         # Sets the number of projects, students and wing students.
         self.__n_students = len(self.__student_ids)
         self.__n_projects = len(self.__project_ids)
@@ -125,11 +363,101 @@ class AssignmentAlgorithm:
         )
         self.__use_hc_no_level_24 = not x < 2 * self.__min_students_per_project
 
-        # Creates the model.
+        # Uses the aggregated model only if it can represent all constraints.
+        # - The ambition level needs the members per project instance.
+        # - The wings of a team must fit in a team of minimum size to be
+        #   able to split the members of a group into project instances.
+        self.__use_aggregated_model = (
+            self.__model_variant == 2
+            and not self.__use_level
+            and self.__max_wings_per_project <= self.__min_students_per_project
+        )
+
+        # Uses the min cost flow engine only if it can represent all constraints exactly.
+        # - The ambition level needs the members per project instance.
+        # - A used project instance must not need 2 or more wings, because
+        #   a flow can't express "0 or at least 2".
+        # - All project instances must be used, because a flow can't decide
+        #   whether a project instance is used or not. Otherwise, the used
+        #   project instances are chosen first with the aggregated model (see
+        #   `run()`), which needs the wings of a team to fit in a team of minimum size.
+        self.__min_cost_flow_skip_reason = None
+        if not self.__allow_min_cost_flow:
+            self.__min_cost_flow_skip_reason = "disabled"
+        elif self.__use_level:
+            self.__min_cost_flow_skip_reason = "level"
+        elif self.__min_wings_per_project > 1:
+            self.__min_cost_flow_skip_reason = "min_wings_per_project > 1"
+        elif (
+            self.__n_projects_required < self.__n_projects
+            and self.__max_wings_per_project > self.__min_students_per_project
+        ):
+            self.__min_cost_flow_skip_reason = "max_wings_per_project > min_students_per_project"
+        self.__use_min_cost_flow = self.__min_cost_flow_skip_reason is None
+
+        # Uses the large neighbourhood search only for large cohorts, which
+        # are solved with the instance model and not as min cost flow.
+        self.__use_lns = (
+            0 < self.__lns_min_students <= self.__n_students
+            and not self.__use_min_cost_flow
+            and not self.__use_aggregated_model
+        )
+
+        # Chooses the used project instances first only for the instance model
+        # and only if the aggregated model can split the wings into the teams.
+        self.__use_two_phase = (
+            self.__allow_two_phase
+            and not self.__use_min_cost_flow
+            and not self.__use_aggregated_model
+            and self.__max_wings_per_project <= self.__min_students_per_project
+        )
+
+        # Prunes the project/student pairs with a low score only in the instance model.
+        self.__use_pruning = (
+            self.__prune_score_limit > 0 and not self.__use_min_cost_flow and not self.__use_aggregated_model
+        )
+        # Whether the next built model is pruned (see `run()`).
+        self.__is_pruned = False
+
+        # The model (created by `__build_model()`).
         self.__model = cp_model.CpModel()
 
         # The model variables.
         self.__model_x = {}
+        # The existing model variables (project instance x student class)
+        # and the student classes per project instance and vice versa.
+        self.__is_pair = np.ones((0, 0), dtype=bool)
+        self.__project_classes = {}
+        self.__class_projects = {}
+        # The number of students and the usage per project instance.
+        self.__project_size = {}
+        self.__project_is_used = {}
+        # The presence of a level and of only one level per project instance and level.
+        self.__project_has_level = {}
+        self.__project_has_only_level = {}
+        # The model variables of the aggregated model.
+        self.__model_y = {}
+        self.__model_teams = {}
+
+        # The objective (sum of the soft constraints) to maximize.
+        self.__objective = 0
+
+        # The result info of the first phase (see `__solve_used_projects()`).
+        self.__phase_one_info: dict = {}
+
+        # The solution hint as `(project_id, student_id)` tuples.
+        self.__hint: list[tuple[int, int]] = []
+
+        # The feasible start assignment and its origin (see `__find_start_assignment()`).
+        self.__start: list[tuple[int, int]] = []
+        self.__start_name = None
+
+        # The function called with the progress of every improving solution (see `set_progress_callback()`).
+        self.__on_progress = None
+
+        # The running solver and whether the search was stopped (see `stop()`).
+        self.__solver = None
+        self.__is_stopped = False
 
         # Indicates whether the algorithm has already been executed and a result exists.
         self.__has_result = False
@@ -140,6 +468,64 @@ class AssignmentAlgorithm:
         # The information about the result of the solver.
         self.__result_info: dict = {}
 
+    def __find_student_classes(self) -> dict[int, list[int]]:
+        """
+        Returns the classes of interchangeable students as a dictionary
+        from the representative student id to the ids of all members.
+
+        Students are interchangeable if they have the same project answers,
+        wing flag and, if the level is used, the same level answer. Without
+        the option `compress_students`, every student is a class of its own.
+        """
+
+        if not self.__compress_students:
+            return {s_id: [s_id] for s_id in self.__student_ids}
+
+        classes = {}
+        for s_id in self.__student_ids:
+            student_data = self.__data_per_student[s_id]
+            key = (
+                tuple(student_data["project_answers"].get(p_id) for p_id in self.__project_ids),
+                student_data["is_wing"],
+                student_data["level_answer"] if self.__use_level else None,
+            )
+            classes.setdefault(key, []).append(s_id)
+
+        return {members[0]: members for members in classes.values()}
+
+    def __new_class_var(self, s_id: int, name: str) -> cp_model.IntVar:
+        """
+        Returns a new model variable for the number of assigned members of
+        the student class. It is a bool 0-1 variable for a single student.
+
+        Args:
+            s_id: The representative student id of the class.
+            name: The name of the variable.
+        """
+
+        n_members = len(self.__class_members[s_id])
+        if n_members == 1:
+            return self.__model.new_bool_var(name)
+        return self.__model.new_int_var(0, n_members, name)
+
+    def __find_instance_groups(self) -> list[list[int]]:
+        """
+        Returns the groups of interchangeable project instances.
+
+        Project instances are interchangeable if every student has the same
+        answer for them, e.g. the instances of the same project. Any solution
+        stays valid with the same score if the members of two interchangeable
+        instances are swapped, so the solver would otherwise have to search
+        through all these equivalent solutions.
+        """
+
+        groups = {}
+        for p_id in self.__project_ids:
+            answers = tuple(self.__data_per_student[s_id]["project_answers"].get(p_id) for s_id in self.__class_ids)
+            groups.setdefault(answers, []).append(p_id)
+
+        return list(groups.values())
+
     def __init_model_variables(self):
         """
         Creates a dictionary which contains OR-Tools bool 0-1 variables for
@@ -148,11 +534,180 @@ class AssignmentAlgorithm:
         The value of a bool 0-1 variable, for example `[(4,2)]`, means the following:
         - `0` (`False`) ... The student with id `2` is not in project with id `4`.
         - `1` (`True`) ... The student with id `2` is in project with id `4`.
+
+        For a class of interchangeable students, the variable is an int
+        variable with the number of class members in the project.
+
+        Every project instance additionally gets one shared expression with
+        its number of students and one bool 0-1 variable for its usage,
+        which are used by all constraints.
+
+        If the model is pruned, a pair without a variable can't be assigned
+        (see `__find_allowed_pairs()`).
         """
 
+        self.__is_pair = np.ones((len(self.__project_ids), len(self.__class_ids)), dtype=bool)
+        if self.__is_pruned:
+            self.__is_pair = self.__find_allowed_pairs()
+
+        self.__project_classes = {p_id: [] for p_id in self.__project_ids}
+        self.__class_projects = {s_id: [] for s_id in self.__class_ids}
+        for p_idx, c_idx in zip(*np.nonzero(self.__is_pair), strict=True):
+            p_id = self.__project_ids[p_idx]
+            s_id = self.__class_ids[c_idx]
+            self.__model_x[(p_id, s_id)] = self.__new_class_var(s_id, f"({p_id}, {s_id})")
+            self.__project_classes[p_id].append(s_id)
+            self.__class_projects[s_id].append(p_id)
+
         for p_id in self.__project_ids:
-            for s_id in self.__student_ids:
-                self.__model_x[(p_id, s_id)] = self.__model.new_bool_var(f"({p_id}, {s_id})")
+            self.__project_size[p_id] = cp_model.LinearExpr.sum([
+                self.__model_x[(p_id, s_id)] for s_id in self.__project_classes[p_id]
+            ])
+            self.__project_is_used[p_id] = self.__model.new_bool_var(f"p_{p_id}_is_used")
+
+    def __find_allowed_pairs(self) -> np.ndarray:
+        """
+        Returns whether a pair of project instance (row) and student class
+        (column) gets a model variable, if the model is pruned.
+
+        Pairs with a poll answer up to `prune_score_limit` are pruned, which
+        are only used as last resort. Students without a better answer keep
+        all their pairs. The pairs of the start assignment (see
+        `__find_start_assignment()`) are kept, so it remains feasible. If the
+        remaining pairs can't take all students (see `__has_capacity()`),
+        no pair is pruned.
+        """
+
+        limit = self.__normalize_scores(np.array([self.__prune_score_limit]))[0]
+        is_allowed = self.__get_scores(self.__class_ids).T > limit
+        is_allowed[:, ~is_allowed.any(axis=0)] = True
+
+        # Keeps the pairs of the start assignment for all interchangeable project
+        # instances, because the hint is reordered (see `__add_hints()`).
+        project_idx = {p_id: idx for idx, p_id in enumerate(self.__project_ids)}
+        group_idx = {p_id: [project_idx[g_id] for g_id in group] for group in self.__instance_groups for p_id in group}
+        class_idx = {m_id: idx for idx, s_id in enumerate(self.__class_ids) for m_id in self.__class_members[s_id]}
+        for p_id, s_id in self.__start:
+            if p_id in group_idx and s_id in class_idx:
+                is_allowed[group_idx[p_id], class_idx[s_id]] = True
+
+        if not self.__has_capacity(is_allowed):
+            is_allowed[:] = True
+
+        return is_allowed
+
+    def __has_capacity(self, is_allowed: np.ndarray) -> bool:
+        """
+        Returns whether all students fit into the project instances with
+        the given pairs, if every project instance takes at most the max
+        number of students and wings.
+
+        The check is a max flow and necessary, but not sufficient for a
+        feasible model, because it ignores the min number of students, the
+        number of required project instances and the level.
+
+        Args:
+            is_allowed: Whether a pair of project instance and student class is allowed.
+        """
+
+        n_classes = len(self.__class_ids)
+        n_instances = len(self.__project_ids)
+        source_node = 0
+        class_nodes = 1 + np.arange(n_classes)
+        instance_nodes = 1 + n_classes + np.arange(n_instances)
+        wing_nodes = 1 + n_classes + n_instances + np.arange(n_instances)
+        sink_node = 1 + n_classes + 2 * n_instances
+
+        class_sizes = np.array([len(self.__class_members[s_id]) for s_id in self.__class_ids])
+        class_is_wing = np.array([bool(self.__data_per_student[s_id]["is_wing"]) for s_id in self.__class_ids])
+
+        flow = max_flow.SimpleMaxFlow()
+
+        # Adds the arcs from the source to every student class.
+        flow.add_arcs_with_capacity(np.full(n_classes, source_node), class_nodes, class_sizes)
+        # Adds the arcs of the allowed pairs. Wings go through the wing node of the project instance.
+        p_idx, c_idx = np.nonzero(is_allowed)
+        flow.add_arcs_with_capacity(
+            class_nodes[c_idx],
+            np.where(class_is_wing[c_idx], wing_nodes[p_idx], instance_nodes[p_idx]),
+            class_sizes[c_idx],
+        )
+        # Adds the arcs from the wing nodes to the project instances and from them to the sink.
+        flow.add_arcs_with_capacity(wing_nodes, instance_nodes, np.full(n_instances, self.__max_wings_per_project))
+        flow.add_arcs_with_capacity(
+            instance_nodes, np.full(n_instances, sink_node), np.full(n_instances, self.__max_students_per_project)
+        )
+
+        status = flow.solve(source_node, sink_node)
+        return status == flow.OPTIMAL and flow.optimal_flow() == self.__n_students
+
+    def __init_level_variables(self):
+        """
+        Creates the shared level variables of every project instance
+        for the levels 2, 3 and 4 (`level_formulation` `2`):
+        - `has_level`: The project instance has students with the level.
+        - `has_only_level`: All students of the project instance have the level.
+
+        The variables are linked to every single assignment variable
+        (`has_level = max(students with the level)`) instead of to the
+        number of students with reified constraints. Together with the
+        minimum number of projects per level, this gives the solver a
+        much tighter bound to prove optimality.
+        """
+
+        for level in [2, 3, 4]:
+            # The students (classes) with and without the level.
+            level_ids = [s_id for s_id in self.__class_ids if self.__data_per_student[s_id]["level_answer"] == level]
+            other_ids = [s_id for s_id in self.__class_ids if self.__data_per_student[s_id]["level_answer"] != level]
+
+            for p_id in self.__project_ids:
+                project_level_ids = [s_id for s_id in level_ids if (p_id, s_id) in self.__model_x]
+                project_other_ids = [s_id for s_id in other_ids if (p_id, s_id) in self.__model_x]
+
+                # Identifies whether the project instance has students with the level.
+                has_level = self.__model.new_bool_var(f"p_{p_id}_has_level_{level}")
+                for s_id in project_level_ids:
+                    self.__model.add(self.__model_x[(p_id, s_id)] <= len(self.__class_members[s_id]) * has_level)
+                self.__model.add(
+                    cp_model.LinearExpr.sum([self.__model_x[(p_id, s_id)] for s_id in project_level_ids]) >= has_level
+                )
+
+                # Identifies whether all students of the project instance have the level.
+                has_only_level = self.__model.new_bool_var(f"p_{p_id}_has_only_level_{level}")
+                self.__model.add_implication(has_only_level, has_level)
+                for s_id in project_other_ids:
+                    self.__model.add(
+                        self.__model_x[(p_id, s_id)] <= len(self.__class_members[s_id]) * (1 - has_only_level)
+                    )
+
+                self.__project_has_level[(p_id, level)] = has_level
+                self.__project_has_only_level[(p_id, level)] = has_only_level
+
+            has_level = [self.__project_has_level[(p_id, level)] for p_id in self.__project_ids]
+            has_only_level = [self.__project_has_only_level[(p_id, level)] for p_id in self.__project_ids]
+
+            # The students with the level need at least this number of projects.
+            n_level_students = sum(len(self.__class_members[s_id]) for s_id in level_ids)
+            self.__model.add(
+                cp_model.LinearExpr.sum(has_level) >= math.ceil(n_level_students / self.__max_students_per_project)
+            )
+
+            # At least one project with the level has other levels too, if
+            # the students with the level can't be split into full projects.
+            if not self.__can_split_into_projects(n_level_students):
+                self.__model.add(cp_model.LinearExpr.sum(has_level) - cp_model.LinearExpr.sum(has_only_level) >= 1)
+
+    def __can_split_into_projects(self, n_students: int) -> bool:
+        """
+        Returns whether the given number of students can be split into
+        projects with a number of students between min and max.
+
+        Args:
+            n_students: The number of students.
+        """
+
+        n_projects = math.ceil(n_students / self.__max_students_per_project)
+        return n_projects * self.__min_students_per_project <= n_students
 
     def __add_hc_one_project_per_student(self):
         """
@@ -160,11 +715,15 @@ class AssignmentAlgorithm:
         - A student is assigned to exactly one project.
         """
 
-        for s_id in self.__student_ids:
+        for s_id in self.__class_ids:
             student_projects = []
-            for p_id in self.__project_ids:
+            for p_id in self.__class_projects[s_id]:
                 student_projects.append(self.__model_x[(p_id, s_id)])
-            self.__model.add(sum(student_projects) == 1)
+
+            if len(self.__class_members[s_id]) == 1:
+                self.__model.add_exactly_one(student_projects)
+            else:
+                self.__model.add(cp_model.LinearExpr.sum(student_projects) == len(self.__class_members[s_id]))
 
     def __add_hc_students_assigned_equally(self):
         """
@@ -173,42 +732,41 @@ class AssignmentAlgorithm:
         - Number of students per project should be 0 or between min and max.
         """
 
+        min = self.__min_students_per_project
+        max = self.__max_students_per_project
+
         for p_id in self.__project_ids:
-            project_students = []
-            for s_id in self.__student_ids:
-                project_students.append(self.__model_x[(p_id, s_id)])
+            n_project_students = self.__project_size[p_id]
+            is_used = self.__project_is_used[p_id]
 
             # Number of students should be 0 or between min and max.
-            project_has_students1 = self.__model.new_bool_var("project_has_students1")
-            self.__model.add(sum(project_students) == 0).only_enforce_if(project_has_students1.Not())
-            self.__model.add(sum(project_students) >= self.__min_students_per_project).only_enforce_if(
-                project_has_students1
-            )
-            self.__model.add(sum(project_students) <= self.__max_students_per_project).only_enforce_if(
-                project_has_students1
+            self.__model.add_linear_expression_in_domain(
+                n_project_students, cp_model.Domain.from_intervals([[0, 0], [min, max]])
             )
 
+            # Number of students is 0 if the project is unused, otherwise between min and max.
+            self.__model.add(n_project_students >= min * is_used)
+            self.__model.add(n_project_students <= max * is_used)
+
     def __add_hc_wing_students_assigned_equally(self):
         """
         Adds the following hard constraints to the model:
         - Wing students are assigned equally to projects.
         """
 
+        domain = cp_model.Domain.from_intervals([
+            [0, 0],
+            [self.__min_wings_per_project, self.__max_wings_per_project],
+        ])
+
         for p_id in self.__project_ids:
             project_wing_students = []
-            for s_id in self.__student_ids:
+            for s_id in self.__project_classes[p_id]:
                 if self.__data_per_student[s_id]["is_wing"]:
                     project_wing_students.append(self.__model_x[(p_id, s_id)])
 
             # Number of wings should be 0 or between min and max.
-            project_has_wing_students = self.__model.new_bool_var("project_has_wing_students")
-            self.__model.add(sum(project_wing_students) == 0).only_enforce_if(project_has_wing_students.Not())
-            self.__model.add(sum(project_wing_students) >= self.__min_wings_per_project).only_enforce_if(
-                project_has_wing_students
-            )
-            self.__model.add(sum(project_wing_students) <= self.__max_wings_per_project).only_enforce_if(
-                project_has_wing_students
-            )
+            self.__model.add_linear_expression_in_domain(cp_model.LinearExpr.sum(project_wing_students), domain)
 
     def __add_hc_number_used_projects_equals_number_required(self):
         """
@@ -216,18 +774,8 @@ class AssignmentAlgorithm:
         - Number of used projects should be the number of required projects.
         """
 
-        used_projects_count = 0
-        for p_id in self.__project_ids:
-            project_students = []
-            for s_id in self.__student_ids:
-                project_students.append(self.__model_x[(p_id, s_id)])
-
-            project_has_students2 = self.__model.new_bool_var("project_has_students2")
-            self.__model.add(sum(project_students) == 0).only_enforce_if(project_has_students2.Not())
-            self.__model.add(sum(project_students) > 0).only_enforce_if(project_has_students2)
-            used_projects_count += project_has_students2
-
-        self.__model.add(used_projects_count == self.__n_projects_required)
+        used_projects = [self.__project_is_used[p_id] for p_id in self.__project_ids]
+        self.__model.add(cp_model.LinearExpr.sum(used_projects) == self.__n_projects_required)
 
     def __add_hc_no_level_24(self):
         """
@@ -242,22 +790,247 @@ class AssignmentAlgorithm:
         if not self.__use_hc_no_level_24:
             return
 
+        if self.__level_formulation == 2:
+            # Uses the shared level variables of the project instances.
+            for p_id in self.__project_ids:
+                self.__model.add_bool_or([
+                    self.__project_has_level[(p_id, 2)].Not(),
+                    self.__project_has_level[(p_id, 4)].Not(),
+                ])
+            return
+
         for p_id in self.__project_ids:
             students_per_level = {1: [], 2: [], 3: [], 4: []}
-            for s_id in self.__student_ids:
+            for s_id in self.__project_classes[p_id]:
                 level = self.__data_per_student[s_id]["level_answer"]
                 students_per_level[level].append(self.__model_x[(p_id, s_id)])
 
+            n_level_2 = cp_model.LinearExpr.sum(students_per_level[2])
             has_level_2 = self.__model.new_bool_var("has_level_2")
-            self.__model.add(sum(students_per_level[2]) < 1).only_enforce_if(has_level_2.Not())
-            self.__model.add(sum(students_per_level[2]) >= 1).only_enforce_if(has_level_2)
+            self.__model.add(n_level_2 < 1).only_enforce_if(has_level_2.Not())
+            self.__model.add(n_level_2 >= 1).only_enforce_if(has_level_2)
 
+            n_level_4 = cp_model.LinearExpr.sum(students_per_level[4])
             has_level_4 = self.__model.new_bool_var("has_level_4")
-            self.__model.add(sum(students_per_level[4]) < 1).only_enforce_if(has_level_4.Not())
-            self.__model.add(sum(students_per_level[4]) >= 1).only_enforce_if(has_level_4)
+            self.__model.add(n_level_4 < 1).only_enforce_if(has_level_4.Not())
+            self.__model.add(n_level_4 >= 1).only_enforce_if(has_level_4)
 
             self.__model.add(has_level_4 + has_level_2 < 2)
 
+    def __add_hc_symmetry_breaking(self):
+        """
+        Adds the following hard constraints to the model:
+        - Interchangeable project instances are used in order.
+        - Used interchangeable project instances are ordered by their
+          first team member (mode `2`).
+
+        The constraints only remove equivalent solutions. The best
+        possible score is not changed.
+
+        With student classes of several members, mode `2` falls back to
+        mode `1`. The members of a class can be split over several project
+        instances of a group, which then have the same first team member,
+        so ordering them strictly would remove optimal solutions.
+        """
+
+        if self.__symmetry_breaking == 0:
+            return
+
+        order_by_first_member = self.__symmetry_breaking == 2 and all(
+            len(members) == 1 for members in self.__class_members.values()
+        )
+        n = len(self.__class_ids)
+        for group in self.__instance_groups:
+            if len(group) < 2:
+                continue
+
+            is_used = self.__project_is_used
+            first_member = {}
+            for p_id in group:
+                if order_by_first_member:
+                    # Identifies whether the student is in the project instance.
+                    is_member = [
+                        (idx, self.__model_x[(p_id, s_id)])
+                        for idx, s_id in enumerate(self.__class_ids)
+                        if (p_id, s_id) in self.__model_x
+                    ]
+
+                    # Sets the index of the first team member or `n` if the instance is not used.
+                    # - `n - (n - idx) * (p_id, s_id)` is `idx` if assigned, otherwise `n`.
+                    first_member[p_id] = self.__model.new_int_var(0, n, f"p_{p_id}_first_member")
+                    self.__model.add_min_equality(
+                        first_member[p_id],
+                        [n - (n - idx) * x for idx, x in is_member] + [n],
+                    )
+
+            for p_id, next_p_id in pairwise(group):
+                # The next instance is only used if the previous one is used.
+                self.__model.add_implication(is_used[next_p_id], is_used[p_id])
+
+                if order_by_first_member:
+                    # The first member of the next used instance comes after the previous one.
+                    self.__model.add(first_member[p_id] + is_used[next_p_id] <= first_member[next_p_id])
+
+    def __init_aggregated_model_variables(self):
+        """
+        Creates the variables of the aggregated model:
+        - A bool 0-1 variable for every combination of instance group and
+          student, e.g. `[(4,2)]` means the student with id `2` is in one
+          of the project instances of the group with index `4`.
+        - An int variable for every instance group with the number of
+          opened teams of the group.
+        """
+
+        for g_idx, group in enumerate(self.__instance_groups):
+            for s_id in self.__class_ids:
+                self.__model_y[(g_idx, s_id)] = self.__new_class_var(s_id, f"({g_idx}, {s_id})")
+            self.__model_teams[g_idx] = self.__model.new_int_var(0, len(group), f"g_{g_idx}_teams")
+
+    def __add_aggregated_hc(self):
+        """
+        Adds the hard constraints of the aggregated model:
+        - A student is assigned to exactly one instance group.
+        - The number of opened teams equals the number of required projects.
+        - The members of a group can be split into its opened teams with
+          a size between min and max.
+        - The wings of a group can be split into its opened teams with
+          0 or between min and max wings.
+        """
+
+        # A student is assigned to exactly one instance group.
+        for s_id in self.__class_ids:
+            student_groups = [self.__model_y[(g_idx, s_id)] for g_idx in self.__model_teams]
+            if len(self.__class_members[s_id]) == 1:
+                self.__model.add_exactly_one(student_groups)
+            else:
+                self.__model.add(cp_model.LinearExpr.sum(student_groups) == len(self.__class_members[s_id]))
+
+        # The number of opened teams equals the number of required projects.
+        self.__model.add(cp_model.LinearExpr.sum(list(self.__model_teams.values())) == self.__n_projects_required)
+
+        for g_idx, group in enumerate(self.__instance_groups):
+            n_teams = self.__model_teams[g_idx]
+            n_group_students = cp_model.LinearExpr.sum([self.__model_y[(g_idx, s_id)] for s_id in self.__class_ids])
+            n_group_wing_students = cp_model.LinearExpr.sum([
+                self.__model_y[(g_idx, s_id)] for s_id in self.__class_ids if self.__data_per_student[s_id]["is_wing"]
+            ])
+
+            # Number of students should be between min and max per opened team.
+            self.__model.add(n_group_students >= self.__min_students_per_project * n_teams)
+            self.__model.add(n_group_students <= self.__max_students_per_project * n_teams)
+
+            # Number of wings should be between min and max per team with wings.
+            n_wing_teams = self.__model.new_int_var(0, len(group), f"g_{g_idx}_wing_teams")
+            self.__model.add(n_wing_teams <= n_teams)
+            self.__model.add(n_group_wing_students >= self.__min_wings_per_project * n_wing_teams)
+            self.__model.add(n_group_wing_students <= self.__max_wings_per_project * n_wing_teams)
+
+    def __add_aggregated_sc(self):
+        """
+        Adds the soft constraints of the aggregated model:
+        - Maximizes the project score per student.
+        """
+
+        # The scores of the student classes per instance group.
+        class_rows = [self.__student_idx[s_id] for s_id in self.__class_ids]
+        group_cols = [self.__project_idx[group[0]] for group in self.__instance_groups]
+        scores = self.__score_matrix[np.ix_(class_rows, group_cols)]
+
+        variables = []
+        coefficients = []
+        for g_idx in range(len(self.__instance_groups)):
+            variables.extend(self.__model_y[(g_idx, s_id)] for s_id in self.__class_ids)
+            coefficients.extend(scores[:, g_idx].tolist())
+
+        self.__objective = cp_model.LinearExpr.weighted_sum(variables, coefficients)
+
+    def __split_group_into_instances(self, group: list[int], n_teams: int, s_ids: list[int]) -> dict[int, list[int]]:
+        """
+        Splits the members of an instance group into the first `n_teams`
+        project instances of the group.
+
+        The wings are distributed as evenly as possible over the minimum
+        number of teams needed, then the other members fill the teams up
+        to an evenly distributed team size.
+
+        Args:
+            group: The project instance ids of the group.
+            n_teams: The number of opened teams of the group.
+            s_ids: The student ids of the group members.
+        """
+
+        p_ids = group[:n_teams]
+        wing_ids = [s_id for s_id in s_ids if self.__data_per_student[s_id]["is_wing"]]
+        other_ids = [s_id for s_id in s_ids if not self.__data_per_student[s_id]["is_wing"]]
+
+        # Sets the number of teams with wings.
+        n_wing_teams = 0
+        if len(wing_ids) > 0:
+            n_wing_teams = math.ceil(len(wing_ids) / self.__max_wings_per_project)
+
+        # Distributes the wings and sets the team sizes evenly.
+        members = {p_id: [] for p_id in p_ids}
+        for idx, s_id in enumerate(wing_ids):
+            members[p_ids[idx % n_wing_teams]].append(s_id)
+        sizes = [len(s_ids) // n_teams + (1 if idx < len(s_ids) % n_teams else 0) for idx in range(n_teams)]
+
+        # Fills up the teams with the other members.
+        for p_id, size in zip(p_ids, sizes, strict=True):
+            n_missing = size - len(members[p_id])
+            members[p_id].extend(other_ids[:n_missing])
+            other_ids = other_ids[n_missing:]
+
+        return members
+
+    def __add_hints(self, hint: list[tuple[int, int]] | None = None):
+        """
+        Adds the solution hint to the model variables.
+
+        The hinted members of interchangeable project instances are reordered
+        like the symmetry breaking expects it: used instances first, ordered
+        by their first member. For the aggregated model, the hint is summed
+        up per instance group.
+
+        Args:
+            hint: The solution hint as `(project_id, student_id)` tuples (default: the hint of `add_hint()`).
+        """
+
+        if hint is None:
+            hint = self.__hint
+        if len(hint) == 0:
+            return
+
+        # Collects the hinted students (classes) per project instance.
+        class_of_student = {m_id: s_id for s_id, members in self.__class_members.items() for m_id in members}
+        hinted_members = {p_id: [] for p_id in self.__project_ids}
+        for p_id, s_id in hint:
+            if p_id in hinted_members:
+                hinted_members[p_id].append(class_of_student[s_id])
+
+        # Reorders the hinted members of interchangeable project instances.
+        # Without symmetry breaking, the hinted instances are kept as they are.
+        if self.__symmetry_breaking != 0:
+            class_idx = {s_id: idx for idx, s_id in enumerate(self.__class_ids)}
+            for group in self.__instance_groups:
+                group_members = sorted(
+                    (hinted_members[p_id] for p_id in group),
+                    key=lambda members: min((class_idx[s_id] for s_id in members), default=len(class_idx)),
+                )
+                for p_id, members in zip(group, group_members, strict=True):
+                    hinted_members[p_id] = members
+
+        if self.__use_aggregated_model:
+            for g_idx, group in enumerate(self.__instance_groups):
+                n_members = Counter(s_id for p_id in group for s_id in hinted_members[p_id])
+                for s_id in self.__class_ids:
+                    self.__model.add_hint(self.__model_y[(g_idx, s_id)], n_members[s_id])
+                self.__model.add_hint(self.__model_teams[g_idx], sum(1 for p_id in group if hinted_members[p_id]))
+        else:
+            for p_id in self.__project_ids:
+                n_members = Counter(hinted_members[p_id])
+                for s_id in self.__project_classes[p_id]:
+                    self.__model.add_hint(self.__model_x[(p_id, s_id)], n_members[s_id])
+
     def __add_sc_maximize_project_score(self):
         """
         Adds the following soft constraints to the model:
@@ -279,10 +1052,6 @@ class AssignmentAlgorithm:
         # TODO:
         # - [ ] Optimize the results (factor vs score impact)
 
-        # Min and max number of students per project.
-        min = self.__min_students_per_project
-        max = self.__max_students_per_project
-
         # Sets the factor for the level impact of the project score.
         #
         # - Projects have a score of 0, 25, 50, 75 or 100 points.
@@ -295,71 +1064,32 @@ class AssignmentAlgorithm:
         soft_constraints = []
         assignments_per_level = {1: [], 2: [], 3: [], 4: []}
         projects_with_only_level = {1: [], 2: [], 3: [], 4: []}
-        # Iterates over all projects.
-        for p_id in self.__project_ids:
-            p_level = {1: [], 2: [], 3: [], 4: []}
-            p_students = []
-            # Iterates over all students.
-            for s_id in self.__student_ids:
-                if self.__use_score:
-                    # Gets the score (poll wish) for the current project+student and
-                    # adds it to the soft constraints. If the student is not assigned adds 0.
-                    #
-                    # - `score * (p_id, s_id)`, where
-                    #   `(p_id, s_id)` gives a boolean with 0 or 1
-                    #
-                    #   not assigned: 0|25|50|75|100 * 0 = 0
-                    #   assigned:     0|25|50|75|100 * 1 = 0|25|50|75|100
-                    #
-                    score = self.__get_total_score(p_id, s_id)
-                    soft_constraints.append(score * self.__model_x[(p_id, s_id)])
-
-                if self.__use_level:
-                    # Collects the students of the current project.
-                    p_students.append(self.__model_x[(p_id, s_id)])
-                    # Collects the students per level of the current project.
-                    level = self.__data_per_student[s_id]["level_answer"]
-                    p_level[level].append(self.__model_x[(p_id, s_id)])
-
-            if self.__use_level:
-                # Identifies the number of students in the current project.
-                has_max_students = self.__model.new_bool_var("has_max_students")
-                self.__model.add(sum(p_students) < max).only_enforce_if(has_max_students.Not())
-                self.__model.add(sum(p_students) >= max).only_enforce_if(has_max_students)
-                min_max = min + has_max_students
 
-                # Identifies the existing student levels of the current project
-                # and collects the presence of them.
-                has_level = {
-                    # 1: self.__model.new_bool_var("p_{p_id}_has_students_level_1"),
-                    2: self.__model.new_bool_var(f"p_{p_id}_has_level_2"),
-                    3: self.__model.new_bool_var(f"p_{p_id}_has_level_3"),
-                    4: self.__model.new_bool_var(f"p_{p_id}_has_level_4"),
-                }
-                # for level in has_level:
-                #     self.__model.add(sum(p_level[level]) < 1).only_enforce_if(has_level[level].Not())
-                #     self.__model.add(sum(p_level[level]) >= 1).only_enforce_if(has_level[level])
-                #     assignments_per_level[level].append(has_level[level])
-                for level, has_only_level_value in has_level.items():
-                    self.__model.add(sum(p_level[level]) < 1).only_enforce_if(has_only_level_value.Not())
-                    self.__model.add(sum(p_level[level]) >= 1).only_enforce_if(has_only_level_value)
-                    assignments_per_level[level].append(has_only_level_value)
-
-                # Identifies whether the current project only has students
-                # from a certain level and collects the result.
-                has_only_level = {
-                    2: self.__model.new_bool_var(f"p_{p_id}_has_only_level_2"),
-                    3: self.__model.new_bool_var(f"p_{p_id}_has_only_level_3"),
-                    4: self.__model.new_bool_var(f"p_{p_id}_has_only_level_4"),
-                }
-                # for level in has_only_level:
-                #     self.__model.add(sum(p_level[level]) < min_max).only_enforce_if(has_only_level[level].Not())
-                #     self.__model.add(sum(p_level[level]) >= min_max).only_enforce_if(has_only_level[level])
-                #     projects_with_only_level[level].append(has_only_level[level])
-                for level, has_only_level_value in has_only_level.items():
-                    self.__model.add(sum(p_level[level]) < min_max).only_enforce_if(has_only_level_value.Not())
-                    self.__model.add(sum(p_level[level]) >= min_max).only_enforce_if(has_only_level_value)
-                    assignments_per_level[level].append(has_only_level_value)
+        if self.__use_score:
+            # Adds the score (poll wish) of every project+student combination
+            # as weight to the soft constraints. If the student is not assigned adds 0.
+            #
+            # - `score * (p_id, s_id)`, where
+            #   `(p_id, s_id)` gives a boolean with 0 or 1
+            #
+            #   not assigned: 0|25|50|75|100 * 0 = 0
+            #   assigned:     0|25|50|75|100 * 1 = 0|25|50|75|100
+            #
+            scores = self.__get_scores(self.__class_ids).T
+            variables = [
+                self.__model_x[(p_id, s_id)] for p_id in self.__project_ids for s_id in self.__project_classes[p_id]
+            ]
+            soft_constraints.append(cp_model.LinearExpr.weighted_sum(variables, scores[self.__is_pair].tolist()))
+
+        if self.__use_level and self.__level_formulation == 1:
+            # Identifies the level combinations with reified constraints.
+            self.__add_legacy_level_variables(assignments_per_level, projects_with_only_level)
+        elif self.__use_level:
+            # Collects the shared level variables of the project instances.
+            for (_, level), has_level_value in self.__project_has_level.items():
+                assignments_per_level[level].append(has_level_value)
+            for (_, level), has_only_level_value in self.__project_has_only_level.items():
+                projects_with_only_level[level].append(has_only_level_value)
 
         if self.__use_level:
             # Adds the weighted level combinations to the soft constraints.
@@ -367,49 +1097,140 @@ class AssignmentAlgorithm:
                 0
                 # Positive combinations:
                 # Prefer projects that only have a student level of 2, 3 or 4.
-                + 4 * factor * sum(projects_with_only_level[2])
-                + 1 * factor * sum(projects_with_only_level[3])
-                + 4 * factor * sum(projects_with_only_level[4])
+                + 4 * factor * cp_model.LinearExpr.sum(projects_with_only_level[2])
+                + 1 * factor * cp_model.LinearExpr.sum(projects_with_only_level[3])
+                + 4 * factor * cp_model.LinearExpr.sum(projects_with_only_level[4])
                 # Negative combinations:
                 # Use students with Level 2, 3 or 4 in as few projects as possible.
-                - 4 * factor * sum(assignments_per_level[2])
-                - 1 * factor * sum(assignments_per_level[3])
-                - 4 * factor * sum(assignments_per_level[4])
+                - 4 * factor * cp_model.LinearExpr.sum(assignments_per_level[2])
+                - 1 * factor * cp_model.LinearExpr.sum(assignments_per_level[3])
+                - 4 * factor * cp_model.LinearExpr.sum(assignments_per_level[4])
             )
 
-        # Maximizes the soft constraints.
-        self.__model.maximize(sum(soft_constraints))
+        # Sets the soft constraints as objective to maximize.
+        self.__objective = cp_model.LinearExpr.sum(soft_constraints)
+
+    def __add_legacy_level_variables(self, assignments_per_level: dict, projects_with_only_level: dict):
+        """
+        Adds the level variables of the reified level formulation
+        (`level_formulation` `1`) and collects them per level.
+
+        Every project instance gets its own bool 0-1 variables for the
+        presence of a level and for projects with only one level, which
+        are linked to the number of students with reified constraints.
+
+        Args:
+            assignments_per_level: Collects the presence of the levels per project.
+            projects_with_only_level: Collects the projects with only one level.
+        """
+
+        # Min and max number of students per project.
+        min = self.__min_students_per_project
+        max = self.__max_students_per_project
+
+        # Iterates over all projects.
+        for p_id in self.__project_ids:
+            p_level = {1: [], 2: [], 3: [], 4: []}
+            # Iterates over all students (classes) with a variable.
+            for s_id in self.__project_classes[p_id]:
+                # Collects the students per level of the current project.
+                level = self.__data_per_student[s_id]["level_answer"]
+                p_level[level].append(self.__model_x[(p_id, s_id)])
+
+            # Identifies the number of students in the current project.
+            # If min and max are equal, every used project has min students.
+            min_max = min
+            if max > min:
+                has_max_students = self.__model.new_bool_var("has_max_students")
+                self.__model.add(self.__project_size[p_id] < max).only_enforce_if(has_max_students.Not())
+                self.__model.add(self.__project_size[p_id] >= max).only_enforce_if(has_max_students)
+                min_max = min + has_max_students
 
-    def __normalize_score(self, answer_score: int) -> int:
+            # Identifies the existing student levels of the current project
+            # and collects the presence of them.
+            has_level = {
+                # 1: self.__model.new_bool_var("p_{p_id}_has_students_level_1"),
+                2: self.__model.new_bool_var(f"p_{p_id}_has_level_2"),
+                3: self.__model.new_bool_var(f"p_{p_id}_has_level_3"),
+                4: self.__model.new_bool_var(f"p_{p_id}_has_level_4"),
+            }
+            # for level in has_level:
+            #     self.__model.add(sum(p_level[level]) < 1).only_enforce_if(has_level[level].Not())
+            #     self.__model.add(sum(p_level[level]) >= 1).only_enforce_if(has_level[level])
+            #     assignments_per_level[level].append(has_level[level])
+            for level, has_only_level_value in has_level.items():
+                self.__model.add(cp_model.LinearExpr.sum(p_level[level]) < 1).only_enforce_if(
+                    has_only_level_value.Not()
+                )
+                self.__model.add(cp_model.LinearExpr.sum(p_level[level]) >= 1).only_enforce_if(has_only_level_value)
+                assignments_per_level[level].append(has_only_level_value)
+
+            # Identifies whether the current project only has students
+            # from a certain level and collects the result.
+            has_only_level = {
+                2: self.__model.new_bool_var(f"p_{p_id}_has_only_level_2"),
+                3: self.__model.new_bool_var(f"p_{p_id}_has_only_level_3"),
+                4: self.__model.new_bool_var(f"p_{p_id}_has_only_level_4"),
+            }
+            # for level in has_only_level:
+            #     self.__model.add(sum(p_level[level]) < min_max).only_enforce_if(has_only_level[level].Not())
+            #     self.__model.add(sum(p_level[level]) >= min_max).only_enforce_if(has_only_level[level])
+            #     projects_with_only_level[level].append(has_only_level[level])
+            for level, has_only_level_value in has_only_level.items():
+                self.__model.add(cp_model.LinearExpr.sum(p_level[level]) < min_max).only_enforce_if(
+                    has_only_level_value.Not()
+                )
+                self.__model.add(cp_model.LinearExpr.sum(p_level[level]) >= min_max).only_enforce_if(
+                    has_only_level_value
+                )
+                projects_with_only_level[level].append(has_only_level_value)
+
+    def __normalize_scores(self, answer_scores: np.ndarray) -> np.ndarray:
         """
-        Normalizes the given score to a value between 0 and 100.
+        Normalizes the given scores to values between 0 and 100.
 
         Args:
-            answer_score: The score to normalize.
+            answer_scores: The scores to normalize.
         """
 
-        # Limits the score to the maximum and minimum possible scores.
-        score = max(1, min(answer_score, self.__max_project_score))
+        # Limits the scores to the maximum and minimum possible scores.
+        scores = np.clip(answer_scores, 1, self.__max_project_score)
 
-        # Decreases the score by 1 to start with 0.
-        score = answer_score - 1
+        # Decreases the scores by 1 to start with 0.
+        scores = scores - 1
         max_score = self.__max_project_score - 1
 
-        # Normalizes the answer score to be between 0 and 100.
-        score = score * 100 / max_score
+        # Normalizes the answer scores to be between 0 and 100.
+        scores = scores * 100 / max_score
 
-        return int(score)
+        return scores.astype(int)
 
-    def __get_normalized_project_score(self, project: int, answers: dict[int, int]) -> int:
+    def __create_score_matrix(self) -> np.ndarray:
         """
-        Returns the normalized project score for the given project and answers.
+        Returns the normalized project scores of all students and project
+        instances as matrix with one row per student and one column per
+        project instance (see `__student_idx` and `__project_idx`).
+        """
+
+        answer_scores = np.zeros((len(self.__student_ids), len(self.__project_ids)), dtype=int)
+        for row, s_id in enumerate(self.__student_ids):
+            answers = self.__data_per_student[s_id].get("project_answers", {})
+            answer_scores[row] = [answers.get(p_id) or 0 for p_id in self.__project_ids]
+
+        return self.__normalize_scores(answer_scores)
+
+    def __get_scores(self, s_ids: list[int]) -> np.ndarray:
+        """
+        Returns the normalized scores of the given students (rows)
+        for the project instances of the model (columns).
 
         Args:
-            project: The project id.
-            answers: The project answers.
+            s_ids: The student ids.
         """
 
-        return self.__normalize_score(answers.get(project) or 0)
+        rows = [self.__student_idx[s_id] for s_id in s_ids]
+        cols = [self.__project_idx[p_id] for p_id in self.__project_ids]
+        return self.__score_matrix[np.ix_(rows, cols)]
 
     def __get_total_score(self, project: int, student: int) -> int:
         """
@@ -424,12 +1245,7 @@ class AssignmentAlgorithm:
         - `0.8 * project_score + 0.2 * x_score`
         """
 
-        project_score = self.__get_normalized_project_score(
-            project, self.__data_per_student[student]["project_answers"]
-        )
-        score = project_score
-
-        return score
+        return int(self.__score_matrix[self.__student_idx[student], self.__project_idx[project]])
 
     def __extract_result_info(self, solver: cp_model.CpSolver):
         """
@@ -439,29 +1255,8 @@ class AssignmentAlgorithm:
             solver: The constraint solver.
         """
 
-        # The descriptions of the solver statuses.
-        SOLVER_STATUS = {
-            "OPTIMAL": "An optimal feasible solution was found.",
-            "FEASIBLE": "A feasible solution was found, but we don't know if it's optimal.",
-            "INFEASIBLE": "The problem was proven infeasible.",
-            "MODEL_INVALID": "The given CpModelProto didn't pass the validation step.",
-            "UNKNOWN": "The status of the model is unknown.",
-        }
-
         self.__result_info = {
-            # Sets the data info.
-            "n_students": self.__n_students,
-            "n_projects": self.__n_projects,
-            "n_wing_students": self.__n_wing_students,
-            "n_projects_required": self.__n_projects_required,
-            "min_students_per_project": f"{self.__min_students_per_project} ({self.__initial_min_students_per_project})",
-            "max_students_per_project": self.__max_students_per_project,
-            "min_wings_per_project": self.__min_wings_per_project,
-            "max_wings_per_project": self.__max_wings_per_project,
-            # Sets the settings info.
-            "use_score": self.__use_score,
-            "use_level": self.__use_level,
-            "use_hc_no_level_24": f"{self.__use_hc_no_level_24}\n",
+            **self.__get_model_info(),
             # Sets the solver parameters info.
             "max_time_in_seconds": solver.parameters.max_time_in_seconds,
             "num_workers": solver.parameters.num_workers,
@@ -474,71 +1269,214 @@ class AssignmentAlgorithm:
             "solution_gap": abs(1 - solver.objective_value / solver.best_objective_bound)
             if solver.best_objective_bound != 0
             else "-",
+            "objective_value": solver.objective_value,
+            "best_objective_bound": solver.best_objective_bound,
+            "wall_time": solver.wall_time,
             "total_score": "-",
         }
 
+    def __get_engine(self) -> str:
+        """
+        Returns the name of the engine, which solves the assignment.
+        """
+
+        if self.__use_min_cost_flow and self.__n_projects_required < self.__n_projects:
+            return "two_phase_min_cost_flow"
+        if self.__use_min_cost_flow:
+            return "min_cost_flow"
+        engine = "lns" if self.__use_lns else "cp_sat"
+        if self.__use_two_phase:
+            return f"two_phase_{engine}"
+        return engine
+
+    def __get_model_info(self) -> dict:
+        """
+        Returns the data info and settings info of the model.
+        """
+
+        return {
+            # Sets the data info.
+            "n_students": self.__n_students,
+            "n_student_classes": len(self.__class_ids),
+            "n_hinted_students": len(self.__hint),
+            "n_projects": self.__n_projects,
+            "n_wing_students": self.__n_wing_students,
+            "n_projects_required": self.__n_projects_required,
+            "min_students_per_project": f"{self.__min_students_per_project} ({self.__initial_min_students_per_project})",
+            "max_students_per_project": self.__max_students_per_project,
+            "min_wings_per_project": self.__min_wings_per_project,
+            "max_wings_per_project": self.__max_wings_per_project,
+            # Sets the settings info.
+            "use_score": self.__use_score,
+            "use_level": self.__use_level,
+            "use_hc_no_level_24": self.__use_hc_no_level_24,
+            "level_formulation": self.__level_formulation,
+            "model_variant": 2 if self.__use_aggregated_model else 1,
+            "symmetry_breaking": self.__symmetry_breaking,
+            "n_instance_groups": len(self.__instance_groups),
+            "n_pruned_pairs": int((~self.__is_pair).sum()),
+            "use_decision_strategy": self.__use_decision_strategy,
+            "start_assignment": self.__start_name or "-",
+            "min_cost_flow_skip_reason": self.__min_cost_flow_skip_reason or "-",
+            "local_search_runtime": self.__local_search_runtime,
+            "engine": f"{self.__get_engine()}\n",
+        }
+
     def __extract_result(self, solver: cp_model.CpSolver):
         """
         Extracts all successful assignments between projects and students,
         including their scores in the `self.__result` list.
 
         Successful assignments are those where the boolean value of `(p_id, s_id)` is `1` (`True`).
+        For a student class, the value is the number of its members in the project.
 
         Args:
             solver: The constraint solver.
         """
 
+        if self.__use_aggregated_model:
+            self.__extract_aggregated_result(solver)
+            return
+
+        # The not yet assigned members per student class.
+        unassigned_members = {s_id: list(members) for s_id, members in self.__class_members.items()}
+
         total_score = 0
         self.__results = []
         for p_id in self.__project_ids:
-            for s_id in self.__student_ids:
-                if solver.Value(self.__model_x[(p_id, s_id)]) == 1:
+            for s_id in self.__project_classes[p_id]:
+                n_members = solver.Value(self.__model_x[(p_id, s_id)])
+                for _ in range(n_members):
+                    member_id = unassigned_members[s_id].pop(0)
+                    score = self.__get_total_score(p_id, member_id)
+                    total_score += score
+                    self.__results.append((p_id, member_id, score))
+
+        self.__result_info["total_score"] = total_score
+
+    def __extract_aggregated_result(self, solver: cp_model.CpSolver):
+        """
+        Extracts all successful assignments of the aggregated model and
+        splits the members of each instance group into its project instances.
+
+        Args:
+            solver: The constraint solver.
+        """
+
+        # The not yet assigned members per student class.
+        unassigned_members = {s_id: list(members) for s_id, members in self.__class_members.items()}
+
+        total_score = 0
+        self.__results = []
+        for g_idx, group in enumerate(self.__instance_groups):
+            n_teams = solver.Value(self.__model_teams[g_idx])
+            if n_teams == 0:
+                continue
+
+            s_ids = []
+            for s_id in self.__class_ids:
+                n_members = solver.Value(self.__model_y[(g_idx, s_id)])
+                s_ids.extend(unassigned_members[s_id][:n_members])
+                del unassigned_members[s_id][:n_members]
+            for p_id, members in self.__split_group_into_instances(group, n_teams, s_ids).items():
+                for s_id in members:
                     score = self.__get_total_score(p_id, s_id)
                     total_score += score
                     self.__results.append((p_id, s_id, score))
 
+        # Sorts the assignments like the result of the instance model.
+        self.__results.sort()
         self.__result_info["total_score"] = total_score
 
-    def run(self):
+    def __build_model(self):
+        """
+        Creates a new model with the model variables and the hard and soft constraints.
         """
-        Initializes needed variables, adds the hard and soft constraints,
-        starts the solver and extracts the result.
 
-        The function blocks until the calculation is finished or aborted.
+        self.__model = cp_model.CpModel()
+        self.__model_x = {}
+        self.__project_size = {}
+        self.__project_is_used = {}
+        self.__project_has_level = {}
+        self.__project_has_only_level = {}
+        self.__model_y = {}
+        self.__model_teams = {}
+
+        if self.__use_aggregated_model:
+            # Initializes all possible combinations of instance group and student.
+            self.__init_aggregated_model_variables()
+
+            # Adds the hard and soft constraints.
+            self.__add_aggregated_hc()
+            self.__add_aggregated_sc()
+        else:
+            # Initializes all possible combinations of project and student.
+            self.__init_model_variables()
+            if self.__use_level and self.__level_formulation == 2:
+                self.__init_level_variables()
+
+            # Adds the hard constraints.
+            self.__add_hc_one_project_per_student()
+            self.__add_hc_number_used_projects_equals_number_required()
+            self.__add_hc_students_assigned_equally()
+            self.__add_hc_wing_students_assigned_equally()
+            if self.__use_level:
+                self.__add_hc_no_level_24()
+            self.__add_hc_symmetry_breaking()
 
-        The calculation is stopped if
-        - an optimal result was found,
-        - the given data or constraints are not solvable or
-        - the max runtime was exceeded. In this case, the best solution
-          found will be used.
+            # Adds the soft constraints.
+            self.__add_sc_maximize_project_score()
+
+            # Guides the search to a good first solution.
+            if self.__use_decision_strategy:
+                self.__add_decision_strategy()
+
+    def __add_decision_strategy(self):
+        """
+        Adds a search strategy to the model, which first uses the popular
+        project instances and then assigns the students to the project
+        instances with their highest score.
+
+        The popularity of a project instance is its total score over all
+        students, like the order of `poll.helper.get_project_ids_ordered_by_score()`.
+        Ties keep the order of the project instances, so the interchangeable
+        project instances are used in order like the symmetry breaking
+        expects it. With several workers, one worker follows the strategy.
         """
 
-        # Checks if the algorithm is already running.
-        if AssignmentAlgorithm.__is_running:
-            raise AssignmentAlgorithmException("Tried to run the algorithm while it is already running.")
+        popularity = self.__get_scores(self.__student_ids).sum(axis=0)
+        scores = self.__get_scores(self.__class_ids).T
 
-        # Sets the algorithm as running.
-        AssignmentAlgorithm.__is_running = True
+        # Branches on the usage of the project instances, most popular first.
+        p_order = np.argsort(-popularity, kind="stable")
+        self.__model.add_decision_strategy(
+            [self.__project_is_used[self.__project_ids[p_idx]] for p_idx in p_order],
+            cp_model.CHOOSE_FIRST,
+            cp_model.SELECT_MAX_VALUE,
+        )
 
-        # Initializes all possible combinations of project and student.
-        self.__init_model_variables()
+        # Branches on the pairs of project instance and student, highest score first
+        # and with the same score, most popular project instance first.
+        p_idx, c_idx = np.nonzero(self.__is_pair)
+        order = np.lexsort((-popularity[p_idx], -scores[p_idx, c_idx]))
+        self.__model.add_decision_strategy(
+            [self.__model_x[(self.__project_ids[p_idx[idx]], self.__class_ids[c_idx[idx]])] for idx in order],
+            cp_model.CHOOSE_FIRST,
+            cp_model.SELECT_MAX_VALUE,
+        )
 
-        # Adds the hard constraints.
-        self.__add_hc_one_project_per_student()
-        self.__add_hc_number_used_projects_equals_number_required()
-        self.__add_hc_students_assigned_equally()
-        self.__add_hc_wing_students_assigned_equally()
-        if self.__use_level:
-            self.__add_hc_no_level_24()
+    def __create_solver(self, max_runtime: float) -> cp_model.CpSolver:
+        """
+        Returns a new solver with the parameters of the options.
 
-        # Adds the soft constraints.
-        self.__add_sc_maximize_project_score()
+        Args:
+            max_runtime: The maximum runtime of the solver in seconds.
+        """
 
-        # Creates the solver.
         solver = cp_model.CpSolver()
 
         # Sets the time limit for the solver.
-        solver.parameters.max_time_in_seconds = self.__max_runtime
+        solver.parameters.max_time_in_seconds = max_runtime
         # Sets the relative gap limit for the solver.
         solver.parameters.relative_gap_limit = self.__relative_gap_limit
         # Sets the number of workers for the solver.
@@ -547,24 +1485,35 @@ class AssignmentAlgorithm:
         # Set only for testing/debugging purposes to `True`.
         solver.parameters.log_search_progress = False
 
+        return solver
+
+    def __solve(self):
+        """
+        Starts the solver on the built model and extracts the result.
+        """
+
+        # Creates the solver.
+        solver = self.__create_solver(self.__max_runtime)
+
         # Solves the equation.
         self.__results = []
         self.__result_info = {}
         self.__has_result = False
 
-        if settings.DEBUG:
-            # With the solution printer.
-            solution_printer = cp_model.ObjectiveSolutionPrinter()
-            status = solver.Solve(self.__model, solution_printer)
-        else:
-            # Without the solution printer.
-            status = solver.Solve(self.__model)
+        # Does not search anymore, if the search was stopped before.
+        if self.__is_stopped:
+            solver.parameters.max_time_in_seconds = 0
 
-        # Sets the algorithm as not running.
-        AssignmentAlgorithm.__is_running = False
+        # Records the progress of every improving solution (printed in debug mode).
+        progress_callback = ProgressCallback(self.__on_progress, print_solutions=settings.DEBUG)
+        self.__solver = solver
+        status = solver.Solve(self.__model, progress_callback)
+        self.__solver = None
 
         # Sets the result info.
         self.__extract_result_info(solver)
+        self.__result_info["n_solutions"] = len(progress_callback.progress)
+        self.__result_info["is_stopped"] = self.__is_stopped
 
         # Logs the result info.
         logger = logging.getLogger(__name__)
@@ -578,9 +1527,1008 @@ class AssignmentAlgorithm:
         # UNKNOWN       The status of the model is unknown.
 
         # Extracts the solution of the assignments, if the solver is feasible.
+        # Otherwise, uses the start assignment, if there is one.
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
             self.__extract_result(solver)
             self.__has_result = True
+        elif self.__start:
+            self.__extract_start_result()
+
+    def __create_initial_assignment(self) -> list[tuple[int, int]]:
+        """
+        Returns a quick assignment as `(project_id, student_id)` tuples,
+        e.g. as start of the large neighbourhood search.
+
+        The required number of project instances with the highest total
+        score are used. The wings and the other students are distributed
+        evenly over them, each ordered by level (2, 1, 3, 4), so students
+        with level 2 and 4 only meet in a project instance, if there are
+        too few students with level 1 and 3 in between. The assignment
+        ignores the project scores of the single students.
+        """
+
+        n_projects = self.__n_projects_required
+
+        # Uses the project instances with the highest total score.
+        total_scores = self.__get_scores(self.__student_ids).sum(axis=0)
+        p_ids = [self.__project_ids[idx] for idx in np.argsort(-total_scores, kind="stable")[:n_projects]]
+
+        # Sets the number of students and wings per project instance.
+        n_larger_projects = self.__n_students - n_projects * self.__min_students_per_project
+        n_wings, n_wing_rest = divmod(self.__n_wing_students, n_projects)
+
+        # Sorts the wings and the other students by level.
+        level_order = {2: 0, 1: 1, 3: 2, 4: 3}
+        s_ids = sorted(self.__student_ids, key=lambda s_id: level_order[self.__data_per_student[s_id]["level_answer"]])
+        wing_ids = [s_id for s_id in s_ids if self.__data_per_student[s_id]["is_wing"]]
+        other_ids = [s_id for s_id in s_ids if not self.__data_per_student[s_id]["is_wing"]]
+
+        assignment = []
+        for idx, p_id in enumerate(p_ids):
+            n_project_students = self.__min_students_per_project + (idx < n_larger_projects)
+            n_project_wings = n_wings + (idx < n_wing_rest)
+            members = wing_ids[:n_project_wings] + other_ids[: n_project_students - n_project_wings]
+            del wing_ids[:n_project_wings]
+            del other_ids[: n_project_students - n_project_wings]
+            assignment.extend((p_id, s_id) for s_id in members)
+
+        return assignment
+
+    def __create_greedy_assignment(self) -> list[tuple[int, int]]:
+        """
+        Returns a greedy assignment as `(project_id, student_id)` tuples,
+        e.g. as solution hint, or an empty list if it gets stuck.
+
+        The required number of project instances with the highest total
+        score are used. First the wings and then the other students are
+        assigned in regret order: The student, who would lose the most score
+        compared to the best free project instance of another project, gets
+        their best free project instance first. Every project instance gets
+        the min number of students and wings and the remaining ones are
+        spread over the project instances one each.
+
+        With the level, a project instance without the level of a student
+        costs the penalty of the objective for a new project instance with
+        this level, so students of the same level are grouped. Students with
+        level 2 and 4 are not assigned to the same project instance and are
+        assigned first.
+        """
+
+        n_projects = self.__n_projects_required
+
+        # Uses the project instances with the highest total score.
+        all_scores = self.__get_scores(self.__student_ids)
+        p_order = np.argsort(-all_scores.sum(axis=0), kind="stable")[:n_projects]
+        p_ids = [self.__project_ids[p_idx] for p_idx in p_order]
+        scores = all_scores[:, p_order].astype(float)
+
+        # The instance group of every used project instance to compare different projects.
+        group_of_project = {p_id: g_idx for g_idx, group in enumerate(self.__instance_groups) for p_id in group}
+        group_ids = np.array([group_of_project[p_id] for p_id in p_ids])
+
+        levels = np.array([self.__data_per_student[s_id]["level_answer"] for s_id in self.__student_ids])
+        is_wing = np.array([bool(self.__data_per_student[s_id]["is_wing"]) for s_id in self.__student_ids])
+        separate_levels = self.__use_level and self.__use_hc_no_level_24
+        has_level = {level: np.zeros(n_projects, dtype=bool) for level in [2, 3, 4]}
+        other_level = {2: 4, 4: 2}
+        # The penalty of the objective for a project instance with the level (see `__add_sc_maximize_project_score()`).
+        level_penalty = {2: 100, 3: 25, 4: 100}
+        project = np.full(len(self.__student_ids), -1)
+
+        def assign(rows: np.ndarray, n_free: np.ndarray, n_extra: int) -> bool:
+            # Assigns the students (rows) to the free places and at most `n_extra`
+            # extra places (one per project instance). Returns whether all are assigned.
+            has_extra = np.zeros(n_projects, dtype=bool)
+            while len(rows) > 0:
+                # Sets the scores of the free project instances, which the students may use.
+                is_free = (n_free > 0) | ((n_extra > 0) & ~has_extra)
+                is_allowed = np.tile(is_free, (len(rows), 1))
+                if separate_levels:
+                    for level in [2, 4]:
+                        is_allowed[levels[rows] == level] &= ~has_level[other_level[level]]
+                candidates = scores[rows]
+                if self.__use_level:
+                    for level, penalty in level_penalty.items():
+                        is_level = levels[rows] == level
+                        candidates[is_level] -= penalty * ~has_level[level]
+                candidates = np.where(is_allowed, candidates, -np.inf)
+
+                best_idx = candidates.argmax(axis=1)
+                best = candidates[np.arange(len(rows)), best_idx]
+                if np.isneginf(best).any():
+                    return False
+                other_groups = group_ids[None, :] != group_ids[best_idx][:, None]
+                second = np.where(other_groups, candidates, -np.inf).max(axis=1)
+                regret = best - second
+
+                # Assigns the students in regret order, until the best project
+                # instance of a student is not free anymore. Then the regrets are updated.
+                # Students with level 2 and 4 go first, because the others fit everywhere.
+                is_flexible = ~(separate_levels & np.isin(levels[rows], [2, 4]))
+                order = np.lexsort((-best, -regret, is_flexible))
+                n_assigned = 0
+                for idx in order:
+                    row, p_idx = rows[idx], best_idx[idx]
+                    level = levels[row]
+                    if n_free[p_idx] <= 0 and (n_extra <= 0 or has_extra[p_idx]):
+                        break
+                    if separate_levels and level in other_level and has_level[other_level[level]][p_idx]:
+                        break
+                    project[row] = p_idx
+                    if n_free[p_idx] > 0:
+                        n_free[p_idx] -= 1
+                    else:
+                        has_extra[p_idx] = True
+                        n_extra -= 1
+                    if self.__use_level and level in has_level:
+                        has_level[level][p_idx] = True
+                    n_assigned += 1
+                rows = rows[order[n_assigned:]]
+            return True
+
+        # Assigns the wings and then the other students to the remaining places.
+        n_wings, n_wing_rest = divmod(self.__n_wing_students, n_projects)
+        if not assign(np.flatnonzero(is_wing), np.full(n_projects, n_wings), n_wing_rest):
+            return []
+        n_project_wings = np.bincount(project[is_wing], minlength=n_projects)
+        n_free = self.__min_students_per_project - n_project_wings
+        n_larger_projects = self.__n_students - n_projects * self.__min_students_per_project
+        if (n_free < 0).any() or not assign(np.flatnonzero(~is_wing), n_free, n_larger_projects):
+            return []
+
+        return [(p_ids[project[row]], s_id) for row, s_id in enumerate(self.__student_ids)]
+
+    def __find_start_assignment(self) -> tuple[str | None, list[tuple[int, int]]]:
+        """
+        Returns the name and the first feasible of the following start
+        assignments or `(None, [])`, if none of them is feasible:
+        - `hint`: The hint, e.g. the previous teams (see `add_hint()`).
+        - `greedy`: The greedy assignment (see `__create_greedy_assignment()`).
+        - `quick`: The quick assignment (see `__create_initial_assignment()`),
+          only for the large neighbourhood search.
+        """
+
+        if self.__is_feasible_assignment(self.__hint):
+            return "hint", self.__hint
+        if self.__use_greedy_start:
+            assignment = self.__create_greedy_assignment()
+            if self.__is_feasible_assignment(assignment):
+                return "greedy", assignment
+        if self.__use_lns:
+            assignment = self.__create_initial_assignment()
+            if self.__is_feasible_assignment(assignment):
+                return "quick", assignment
+
+        return None, []
+
+    def __extract_start_result(self):
+        """
+        Extracts the start assignment as result, if the solver found no solution in time.
+        """
+
+        total_score = 0
+        self.__results = []
+        for p_id, s_id in sorted(self.__start):
+            score = self.__get_total_score(p_id, s_id)
+            total_score += score
+            self.__results.append((p_id, s_id, score))
+
+        self.__result_info |= {
+            "solver_status_name": self.__result_info.get("status_name", "-"),
+            "status_name": "FEASIBLE",
+            "status_description": f"The solver found no solution, the start assignment ({self.__start_name}) is used.",
+            "objective_value": None,
+            "solution_gap": "-",
+            "total_score": total_score,
+            "start_name": self.__start_name,
+        }
+        self.__has_result = True
+
+    def __is_feasible_assignment(self, assignment: list[tuple[int, int]]) -> bool:
+        """
+        Returns whether the given assignment assigns every student to one
+        of the required number of project instances without violating a
+        hard constraint.
+
+        Args:
+            assignment: The assignment as `(project_id, student_id)` tuples.
+        """
+
+        project = {s_id: p_id for p_id, s_id in assignment}
+        return (
+            len(assignment) == self.__n_students
+            and len(project) == self.__n_students
+            and len(set(project.values())) == self.__n_projects_required
+            and set(project.values()) <= set(self.__project_ids)
+            and len(self.__find_broken_projects(project)) == 0
+        )
+
+    def __improve_result(self):
+        """
+        Improves a feasible result with a local search within the runtime
+        of the local search.
+
+        A student is moved to another used project instance or swapped with
+        a student of another used project instance, if this improves the
+        objective and keeps all hard constraints. Every student gets the
+        best of these moves in turn, until no move improves the objective.
+        The used project instances are not changed.
+
+        The gain of a move is calculated with the score matrix and the level
+        combinations of both project instances (see `__add_sc_maximize_project_score()`).
+        Project instances are compared by their number of students per level
+        and wing, so every move only updates the tables of two project instances.
+        """
+
+        start_time = time.monotonic()
+
+        # The used project instances (columns) and the project instance of every student (row).
+        s_ids = [s_id for _, s_id, _ in self.__results]
+        used_p_ids = {p_id for p_id, _, _ in self.__results}
+        p_ids = [p_id for p_id in self.__project_ids if p_id in used_p_ids]
+        p_cols = {p_id: col for col, p_id in enumerate(p_ids)}
+        project = np.array([p_cols[p_id] for p_id, _, _ in self.__results])
+        n_students, n_projects = len(s_ids), len(p_ids)
+        rows = np.arange(n_students)
+
+        scores = np.zeros((n_students, n_projects), dtype=int)
+        if self.__use_score:
+            # Uses the whole score matrix, because `__project_ids` may be restricted (see `__solve_used_projects()`).
+            student_rows = [self.__student_idx[s_id] for s_id in s_ids]
+            scores = self.__score_matrix[np.ix_(student_rows, [self.__project_idx[p_id] for p_id in p_ids])]
+
+        # The type of every student as `2 * (level - 1) + is_wing` and the number of students per type.
+        types = np.array([
+            2 * (self.__data_per_student[s_id]["level_answer"] - 1) + bool(self.__data_per_student[s_id]["is_wing"])
+            for s_id in s_ids
+        ])
+        counts = np.zeros((n_projects, 8), dtype=int)
+        np.add.at(counts, (project, types), 1)
+
+        separate_levels = self.__use_level and self.__use_hc_no_level_24
+        # The weight of the level combinations (see `__add_sc_maximize_project_score()`).
+        level_weights = {2: 100, 3: 25, 4: 100}
+
+        def get_level_value(count: np.ndarray) -> int | None:
+            # Returns the level combination value of a project instance or `None`, if it is not valid.
+            size, n_wings = count.sum(), count[1::2].sum()
+            n_per_level = count[0::2] + count[1::2]
+            if not self.__min_students_per_project <= size <= self.__max_students_per_project:
+                return None
+            if n_wings != 0 and not self.__min_wings_per_project <= n_wings <= self.__max_wings_per_project:
+                return None
+            if separate_levels and n_per_level[1] > 0 and n_per_level[3] > 0:
+                return None
+            if not self.__use_level:
+                return 0
+            # A project instance with only one level has this level, so its value is `0`.
+            return -sum(weight for level, weight in level_weights.items() if 0 < n_per_level[level - 1] < size)
+
+        # The level gain of a project instance, if it loses a student, gets a student or
+        # replaces a student of one type with another type (`-inf` if it is not valid).
+        remove_gains = np.zeros((n_projects, 8))
+        add_gains = np.zeros((n_projects, 8))
+        replace_gains = np.zeros((n_projects, 8, 8))
+        identity = np.eye(8, dtype=int)
+
+        def update_gains(col: int):
+            def get_gain(count: np.ndarray) -> float:
+                value = get_level_value(count)
+                return -np.inf if value is None else value - current_value
+
+            current_value = get_level_value(counts[col])
+            for a in range(8):
+                add_gains[col, a] = get_gain(counts[col] + identity[a])
+                if counts[col, a] == 0:
+                    remove_gains[col, a] = -np.inf
+                    replace_gains[col, a] = -np.inf
+                    continue
+                remove_gains[col, a] = get_gain(counts[col] - identity[a])
+                for b in range(8):
+                    replace_gains[col, a, b] = 0 if a == b else get_gain(counts[col] - identity[a] + identity[b])
+
+        for col in range(n_projects):
+            update_gains(col)
+
+        n_moves = n_swaps = 0
+        gain = 0
+        is_improved = True
+        while is_improved and not self.__is_stopped:
+            is_improved = False
+            for row in range(n_students):
+                if time.monotonic() - start_time > self.__local_search_runtime:
+                    break
+
+                col, s_type = project[row], types[row]
+                current_scores = scores[rows, project]
+
+                # The gains of moving the student to every other project instance.
+                move_gains = scores[row] - scores[row, col] + remove_gains[col, s_type] + add_gains[:, s_type]
+                move_gains[col] = -np.inf
+
+                # The gains of swapping the student with every student of another project instance.
+                swap_gains = (
+                    scores[row, project]
+                    - scores[row, col]
+                    + scores[:, col]
+                    - current_scores
+                    + replace_gains[col, s_type, types]
+                    + replace_gains[project, types, s_type]
+                )
+                swap_gains[project == col] = -np.inf
+
+                move_idx, swap_idx = int(move_gains.argmax()), int(swap_gains.argmax())
+                best_gain = max(move_gains[move_idx], swap_gains[swap_idx])
+                if best_gain <= 0:
+                    continue
+
+                # Applies the best move and updates the tables of both project instances.
+                if move_gains[move_idx] >= swap_gains[swap_idx]:
+                    other_col = move_idx
+                    counts[col, s_type] -= 1
+                    counts[other_col, s_type] += 1
+                    project[row] = other_col
+                    n_moves += 1
+                else:
+                    other_col = project[swap_idx]
+                    counts[col, s_type] -= 1
+                    counts[col, types[swap_idx]] += 1
+                    counts[other_col, types[swap_idx]] -= 1
+                    counts[other_col, s_type] += 1
+                    project[row], project[swap_idx] = other_col, col
+                    n_swaps += 1
+                update_gains(col)
+                update_gains(other_col)
+                gain += int(best_gain)
+                is_improved = True
+
+        # Sets the improved result and info.
+        order = np.argsort(project, kind="stable")
+        self.__results = [
+            (p_ids[project[row]], s_ids[row], self.__get_total_score(p_ids[project[row]], s_ids[row])) for row in order
+        ]
+        self.__result_info["total_score"] = sum(score for _, _, score in self.__results)
+        self.__result_info |= {
+            "local_search_gain": gain,
+            "local_search_moves": n_moves,
+            "local_search_swaps": n_swaps,
+            "local_search_time": time.monotonic() - start_time,
+        }
+        if gain == 0 or not isinstance(self.__result_info.get("objective_value"), int | float):
+            return
+
+        # The objective of a feasible solution may be lower than the objective of its
+        # assignment, because the level variables only need to be bounds. So the
+        # objective of the improved assignment is calculated.
+        objective_value = float(scores[rows, project].sum() + sum(get_level_value(count) for count in counts))
+        best_objective_bound = self.__result_info["best_objective_bound"]
+        gap = abs(1 - objective_value / best_objective_bound) if best_objective_bound != 0 else None
+        self.__result_info |= {
+            "objective_value": objective_value,
+            "solution_gap": gap if gap is not None else "-",
+            "n_solutions": self.__result_info.get("n_solutions", 0) + 1,
+        }
+
+        # Records the improved solution as progress (see `set_progress_callback()`).
+        if self.__on_progress is not None:
+            self.__on_progress({
+                "n_solutions": self.__result_info["n_solutions"],
+                "objective_value": objective_value,
+                "best_objective_bound": best_objective_bound,
+                "gap": gap,
+                "wall_time": self.__result_info["wall_time"] + self.__result_info["local_search_time"],
+            })
+
+    def __get_score_bound(self) -> int:
+        """
+        Returns an upper bound of the objective, which is the sum of the
+        best project score of every student.
+
+        The level combinations never add a positive value, because a project
+        instance with only one level also has this level.
+        """
+
+        if not self.__use_score:
+            return 0
+        return int(self.__score_matrix.max(axis=1).sum())
+
+    def __solve_lns(self):
+        """
+        Solves the built model with a large neighbourhood search (LNS) and extracts the result.
+
+        The search starts from the start assignment, e.g. the previous teams
+        or a greedy assignment (see `__find_start_assignment()`). Without
+        a start assignment, it starts from the first feasible solution of
+        the whole model. Then it repeatedly frees the
+        members of some used project instances and re-optimizes their
+        assignment with a short time limit, while all other students keep
+        their project instance. Project instances whose members are far
+        from their best score are freed more often.
+
+        The number of freed project instances grows while the subproblems
+        are solved optimally and shrinks while they hit the time limit. If
+        all project instances are freed and solved optimally, the solution
+        is optimal.
+
+        The best solution found so far is kept at any point, so it is used
+        if the max runtime is exceeded or `stop()` is called.
+        """
+
+        start_time = time.monotonic()
+        rnd = np.random.default_rng(0)
+
+        self.__results = []
+        self.__result_info = {}
+        self.__has_result = False
+
+        # Evaluates the start with all variables fixed to their hinted values.
+        # Otherwise, finds the first feasible solution of the whole model.
+        for fix_start in [True, False] if self.__start else [False]:
+            solver = self.__create_solver(self.__max_runtime)
+            solver.parameters.stop_after_first_solution = True
+            solver.parameters.fix_variables_to_their_hinted_value = fix_start
+            if self.__is_stopped:
+                solver.parameters.max_time_in_seconds = 0
+
+            self.__solver = solver
+            status = solver.Solve(self.__model)
+            self.__solver = None
+            if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE or self.__is_stopped:
+                break
+
+        if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+            self.__extract_result_info(solver)
+            self.__result_info["n_solutions"] = 0
+            self.__result_info["is_stopped"] = self.__is_stopped
+            if self.__start:
+                self.__extract_start_result()
+            return
+
+        # The proto indices of the model variables (project instance x student class).
+        # Pruned pairs have no variable and keep the value `0`.
+        is_pair = self.__is_pair
+        x_indices = np.zeros(is_pair.shape, dtype=int)
+        for p_idx, c_idx in zip(*np.nonzero(is_pair), strict=True):
+            x_indices[p_idx, c_idx] = self.__model_x[(self.__project_ids[p_idx], self.__class_ids[c_idx])].index
+        # The score, which the members of a student class lose in a project instance
+        # compared to their best project instance.
+        lost_scores = np.zeros(x_indices.shape)
+        if self.__use_score:
+            scores = self.__get_scores(self.__class_ids).T
+            lost_scores = scores.max(axis=0) - scores
+
+        # The best solution found so far. The bound of a solve with fixed variables is its objective.
+        best_solver = solver
+        values = np.array(solver.response_proto.solution)[x_indices] * is_pair
+        objective_value = solver.objective_value
+        best_objective_bound = self.__get_score_bound()
+        if not fix_start:
+            best_objective_bound = min(best_objective_bound, solver.best_objective_bound)
+        is_optimal = objective_value == best_objective_bound
+
+        # Records the progress of every improving solution (printed in debug mode).
+        progress_callback = ProgressCallback(self.__on_progress, print_solutions=settings.DEBUG)
+        progress_callback.record(objective_value, best_objective_bound, time.monotonic() - start_time)
+
+        # The time limit per subproblem and the initial number of freed project instances.
+        iteration_runtime = max(1.0, self.__max_runtime / 30)
+        n_free = max(2, round(50 / self.__max_students_per_project))
+        n_iterations = 0
+
+        # Hints the best solution for every subproblem.
+        proto = self.__model.proto
+        self.__model.clear_hints()
+        proto.solution_hint.vars[:] = x_indices[is_pair].tolist()
+
+        while not is_optimal and not self.__is_stopped:
+            remaining_runtime = self.__max_runtime - (time.monotonic() - start_time)
+            if remaining_runtime <= 0:
+                break
+
+            # Frees the members of some used project instances, weighted by their lost score.
+            used = np.flatnonzero(values.sum(axis=1))
+            weights = (values * lost_scores).sum(axis=1)[used] + 1
+            free = rnd.choice(used, size=min(n_free, len(used)), replace=False, p=weights / weights.sum())
+
+            # Keeps all other students in their project instance by raising the lower bound
+            # of their variables. The original domains are restored after the subproblem.
+            fixed_values = values.copy()
+            fixed_values[free] = 0
+            original_domains = {}
+            for p_idx, c_idx in zip(*np.nonzero(fixed_values), strict=True):
+                var_index = int(x_indices[p_idx, c_idx])
+                domain = proto.variables[var_index].domain
+                original_domains[var_index] = list(domain)
+                domain[:] = [int(fixed_values[p_idx, c_idx]), domain[-1]]
+            proto.solution_hint.values[:] = values[is_pair].tolist()
+
+            # Re-optimizes the assignment of the freed students. Most variables are fixed,
+            # so a light presolve leaves more of the short time limit for the search.
+            solver = self.__create_solver(min(iteration_runtime, remaining_runtime))
+            solver.parameters.max_presolve_iterations = 1
+            solver.parameters.cp_model_probing_level = 0
+            solver.parameters.symmetry_level = 0
+            self.__solver = solver
+            status = solver.Solve(self.__model)
+            self.__solver = None
+            n_iterations += 1
+
+            for var_index, domain in original_domains.items():
+                proto.variables[var_index].domain[:] = domain
+
+            # Keeps the solution of the subproblem, if it is at least as good as the best solution.
+            has_solution = status == cp_model.OPTIMAL or status == cp_model.FEASIBLE
+            if has_solution and solver.objective_value >= objective_value:
+                if solver.objective_value > objective_value:
+                    wall_time = time.monotonic() - start_time
+                    progress_callback.record(solver.objective_value, best_objective_bound, wall_time)
+                best_solver = solver
+                values = np.array(solver.response_proto.solution)[x_indices] * is_pair
+                objective_value = solver.objective_value
+
+            # Adapts the number of freed project instances.
+            if status == cp_model.OPTIMAL:
+                is_optimal = len(free) == len(used)
+                n_free = min(len(used), math.ceil(n_free * 1.2))
+            else:
+                n_free = max(2, math.floor(n_free * 0.8))
+
+        # Sets the result info of the best solution.
+        self.__extract_result_info(best_solver)
+        if is_optimal:
+            best_objective_bound = objective_value
+        status_name = "OPTIMAL" if is_optimal else "FEASIBLE"
+        self.__result_info |= {
+            "max_time_in_seconds": self.__max_runtime,
+            "status_name": status_name,
+            "status_description": SOLVER_STATUS[status_name],
+            "solution_gap": abs(1 - objective_value / best_objective_bound) if best_objective_bound != 0 else "-",
+            "best_objective_bound": best_objective_bound,
+            "wall_time": time.monotonic() - start_time,
+            "n_solutions": len(progress_callback.progress),
+            "is_stopped": self.__is_stopped,
+            "lns_start": self.__start_name if fix_start else "first_solution",
+            "lns_iterations": n_iterations,
+            "lns_free_projects": n_free,
+        }
+
+        # Logs the result info.
+        logger = logging.getLogger(__name__)
+        logger.debug(f"LNS: Result info: {self.__result_info}")
+
+        # Extracts the solution of the assignments.
+        self.__extract_result(best_solver)
+        self.__has_result = True
+
+    def __solve_min_cost_flow(self):
+        """
+        Solves the assignment as min cost flow and extracts the result.
+
+        The flow network has the following nodes:
+        - A node per student class with its number of members as supply.
+        - A node per project instance with the min number of students as demand.
+        - A wing node per project instance, which passes at most the max
+          number of wings to the project instance.
+        - An overflow node with the remaining students as demand, which takes
+          at most `max - min` students from every project instance.
+
+        The arcs from the students to the project instances cost `100 - score`
+        per student, so the min cost flow maximizes the total score.
+        """
+
+        start_time = time.perf_counter()
+
+        n_classes = len(self.__class_ids)
+        n_instances = len(self.__project_ids)
+        class_nodes = np.arange(n_classes)
+        instance_nodes = n_classes + np.arange(n_instances)
+        wing_nodes = n_classes + n_instances + np.arange(n_instances)
+        overflow_node = n_classes + 2 * n_instances
+
+        class_sizes = np.array([len(self.__class_members[s_id]) for s_id in self.__class_ids])
+        class_is_wing = np.array([bool(self.__data_per_student[s_id]["is_wing"]) for s_id in self.__class_ids])
+        scores = self.__get_scores(self.__class_ids)
+
+        flow = min_cost_flow.SimpleMinCostFlow()
+
+        # Adds the arcs from every student class to every project instance.
+        # Wings go through the wing node of the project instance.
+        flow.add_arcs_with_capacity_and_unit_cost(
+            np.repeat(class_nodes, n_instances),
+            np.where(
+                np.repeat(class_is_wing, n_instances),
+                np.tile(wing_nodes, n_classes),
+                np.tile(instance_nodes, n_classes),
+            ),
+            np.repeat(class_sizes, n_instances),
+            (100 - scores).ravel(),
+        )
+        # Adds the arcs from the wing nodes to the project instances.
+        flow.add_arcs_with_capacity_and_unit_cost(
+            wing_nodes,
+            instance_nodes,
+            np.full(n_instances, self.__max_wings_per_project),
+            np.zeros(n_instances, dtype=int),
+        )
+        # Adds the arcs from the project instances to the overflow node.
+        flow.add_arcs_with_capacity_and_unit_cost(
+            instance_nodes,
+            np.full(n_instances, overflow_node),
+            np.full(n_instances, self.__max_students_per_project - self.__min_students_per_project),
+            np.zeros(n_instances, dtype=int),
+        )
+
+        # Sets the supplies of the students and the demands of the project instances.
+        n_overflow_students = self.__n_students - n_instances * self.__min_students_per_project
+        flow.set_nodes_supplies(
+            np.concatenate([class_nodes, instance_nodes, [overflow_node]]),
+            np.concatenate([
+                class_sizes,
+                np.full(n_instances, -self.__min_students_per_project),
+                [-n_overflow_students],
+            ]),
+        )
+
+        build_time = time.perf_counter() - start_time
+        status = flow.solve()
+
+        # The flow is only optimal for the chosen project instances, if they are not proven optimal.
+        status_name = "INFEASIBLE"
+        status_description = f"The min cost flow is not solvable ({status.name})."
+        if status == flow.OPTIMAL and self.__phase_one_info.get("phase_one_status_name", "OPTIMAL") == "OPTIMAL":
+            status_name = "OPTIMAL"
+            status_description = SOLVER_STATUS[status_name]
+        elif status == flow.OPTIMAL:
+            status_name = "FEASIBLE"
+            status_description = "The min cost flow is optimal for the chosen project instances."
+
+        self.__results = []
+        self.__has_result = False
+        self.__result_info = {
+            **self.__get_model_info(),
+            "status_name": status_name,
+            "status_description": status_description,
+            "solution_gap": 0 if status_name == "OPTIMAL" else "-",
+            "wall_time": time.perf_counter() - start_time,
+            "build_time": build_time,
+            "total_score": "-",
+        }
+
+        if status == flow.OPTIMAL:
+            # Extracts the number of members per project instance and student class.
+            n_members = flow.flows(np.arange(n_classes * n_instances)).reshape(n_classes, n_instances)
+            unassigned_members = {s_id: list(members) for s_id, members in self.__class_members.items()}
+
+            total_score = 0
+            for p_idx, p_id in enumerate(self.__project_ids):
+                for c_idx, s_id in enumerate(self.__class_ids):
+                    for _ in range(n_members[c_idx, p_idx]):
+                        member_id = unassigned_members[s_id].pop(0)
+                        score = self.__get_total_score(p_id, member_id)
+                        total_score += score
+                        self.__results.append((p_id, member_id, score))
+
+            self.__result_info["objective_value"] = total_score
+            self.__result_info["total_score"] = total_score
+            self.__has_result = True
+
+        # Logs the result info.
+        logger = logging.getLogger(__name__)
+        logger.debug(f"Min cost flow: Result info: {self.__result_info}")
+
+    def __solve_used_projects(self, max_runtime: float):
+        """
+        Chooses the used project instances with the aggregated model
+        (phase one) and restricts the instance model to them (phase two).
+
+        The aggregated model decides the number of teams per instance group
+        from the project scores of all students, but without the level. Its
+        runtime is subtracted from the runtime of phase two. The first project instances of every
+        group are used, so the symmetry breaking still holds.
+
+        The status and bound of phase two refer to the chosen project
+        instances, so an optimal result may be beaten by other instances.
+        If phase one finds no solution, all project instances are kept.
+
+        Args:
+            max_runtime: The maximum runtime of phase one in seconds.
+        """
+
+        start_time = time.monotonic()
+
+        # Builds and solves the aggregated model.
+        use_aggregated_model = self.__use_aggregated_model
+        self.__use_aggregated_model = True
+        self.__build_model()
+        self.__model.maximize(self.__objective)
+        self.__add_hints()
+        self.__use_aggregated_model = use_aggregated_model
+
+        solver = self.__create_solver(max_runtime)
+        if self.__is_stopped:
+            solver.parameters.max_time_in_seconds = 0
+        self.__solver = solver
+        status = solver.Solve(self.__model)
+        self.__solver = None
+
+        wall_time = time.monotonic() - start_time
+        self.__max_runtime = max(1.0, self.__max_runtime - wall_time)
+        self.__phase_one_info = {
+            "phase_one_status_name": solver.status_name(),
+            "phase_one_wall_time": wall_time,
+        }
+        if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+            return
+
+        # Restricts the instance model to the first project instances of every group.
+        self.__instance_groups = [
+            group[: solver.Value(self.__model_teams[g_idx])] for g_idx, group in enumerate(self.__instance_groups)
+        ]
+        self.__instance_groups = [group for group in self.__instance_groups if group]
+        self.__project_ids = [p_id for group in self.__instance_groups for p_id in group]
+
+    def __get_objective_bound(self) -> int:
+        """
+        Returns an upper bound for the absolute value of the objective of the
+        built model, based on the objective coefficients and variable domains.
+        """
+
+        proto = self.__model.proto
+        bound = 0
+        for var_idx, coeff in zip(proto.objective.vars, proto.objective.coeffs, strict=True):
+            domain = proto.variables[var_idx if var_idx >= 0 else -var_idx - 1].domain
+            bound += abs(coeff) * max(abs(domain[0]), abs(domain[-1]))
+
+        return bound
+
+    def __find_broken_projects(self, previous_project: dict[int, int]) -> set[int]:
+        """
+        Returns the project instances of the given assignment,
+        which violate a hard constraint with their current members.
+
+        Args:
+            previous_project: The project instance id per student id.
+        """
+
+        members = {}
+        for s_id, p_id in previous_project.items():
+            members.setdefault(p_id, []).append(s_id)
+
+        broken_projects = set()
+        for p_id, s_ids in members.items():
+            n_wings = sum(1 for s_id in s_ids if self.__data_per_student[s_id]["is_wing"])
+            levels = {self.__data_per_student[s_id]["level_answer"] for s_id in s_ids}
+            has_valid_size = self.__min_students_per_project <= len(s_ids) <= self.__max_students_per_project
+            has_valid_wings = n_wings == 0 or self.__min_wings_per_project <= n_wings <= self.__max_wings_per_project
+            has_valid_levels = not (self.__use_level and self.__use_hc_no_level_24 and {2, 4} <= levels)
+            if not (has_valid_size and has_valid_wings and has_valid_levels):
+                broken_projects.add(p_id)
+
+        return broken_projects
+
+    def run(self):
+        """
+        Initializes needed variables, adds the hard and soft constraints,
+        starts the solver and extracts the result.
+
+        The function blocks until the calculation is finished or aborted.
+
+        The calculation is stopped if
+        - an optimal result was found,
+        - the given data or constraints are not solvable,
+        - the max runtime was exceeded or
+        - `stop()` was called. In the last two cases, the best solution
+          found will be used.
+        """
+
+        # Sets the algorithm as running, if no other algorithm is running.
+        if not AssignmentAlgorithm.__lock.acquire():
+            raise AssignmentAlgorithmException("Tried to run the algorithm while it is already running.")
+
+        try:
+            # Chooses the used project instances for the min cost flow first, if not all are required.
+            # Without a solution, the assignment is solved with CP-SAT in the remaining runtime.
+            if self.__use_min_cost_flow and self.__n_projects_required < self.__n_projects:
+                self.__solve_used_projects(self.__max_runtime)
+                if len(self.__project_ids) != self.__n_projects_required:
+                    self.__use_min_cost_flow = False
+                    self.__min_cost_flow_skip_reason = "phase one found no solution"
+
+            if self.__use_min_cost_flow:
+                # Solves the assignment as min cost flow.
+                self.__solve_min_cost_flow()
+                self.__result_info |= self.__phase_one_info
+            else:
+                # Chooses the used project instances first with at most a fifth of the max runtime.
+                if self.__use_two_phase:
+                    self.__solve_used_projects(max(1.0, self.__max_runtime / 5))
+
+                # Sets the start assignment, which is used as hint and fallback.
+                self.__start_name, self.__start = self.__find_start_assignment()
+
+                # Solves the pruned model first. Without a solution, e.g. because
+                # the pruned model is infeasible, all pairs are restored and the
+                # model is solved again in the remaining runtime.
+                start_time = time.monotonic()
+                max_runtime = self.__max_runtime
+                for is_pruned in [True, False] if self.__use_pruning else [False]:
+                    self.__is_pruned = is_pruned
+
+                    # Builds the model with the soft constraints as objective.
+                    build_start_time = time.perf_counter()
+                    self.__build_model()
+                    self.__model.maximize(self.__objective)
+
+                    # Adds the start assignment or the (infeasible) hint as solution hint.
+                    self.__add_hints(self.__start or None)
+                    build_time = time.perf_counter() - build_start_time
+
+                    # Solves the model.
+                    if self.__use_lns:
+                        self.__solve_lns()
+                    else:
+                        self.__solve()
+                    if self.__has_result or self.__is_stopped:
+                        break
+                    self.__max_runtime = max(1.0, max_runtime - (time.monotonic() - start_time))
+
+                # Improves a feasible result, which is not proven optimal.
+                is_feasible = self.__has_result and self.__result_info.get("status_name") == "FEASIBLE"
+                if is_feasible and self.__local_search_runtime > 0 and not self.__is_stopped:
+                    self.__improve_result()
+
+                self.__result_info |= self.__phase_one_info
+                self.__result_info["build_time"] = build_time
+                if self.__use_pruning:
+                    self.__result_info["is_pruning_restored"] = not self.__is_pruned
+        finally:
+            # Sets the algorithm as not running.
+            AssignmentAlgorithm.__lock.release()
+
+    def repair(self, max_runtime: float = 1):
+        """
+        Repairs the assignment set with `add_hint()`, e.g. after students
+        dropped out or were added late, and moves as few students as possible.
+
+        Students without a previous assignment are new and not counted as
+        moved. Among all repairs with the fewest moved students, the one
+        with the best score is chosen.
+
+        The repair is done in two stages:
+        - Only the new students and the members of broken project instances
+          (team size, wings or levels 2 and 4) can be (re)assigned.
+        - If this is not solvable, all students can be moved.
+
+        The repair always uses model `1` without student classes and
+        symmetry breaking, because every single student and project
+        instance of the previous assignment has to be kept apart.
+
+        Both stages share a short max runtime, because the repair runs
+        within a web request. The max runtime of the options is an upper limit.
+
+        Args:
+            max_runtime: The maximum runtime of both stages in seconds.
+        """
+
+        # Sets the algorithm as running, if no other algorithm is running.
+        if not AssignmentAlgorithm.__lock.acquire():
+            raise AssignmentAlgorithmException("Tried to run the algorithm while it is already running.")
+
+        try:
+            # Uses the model with one variable per project instance and student.
+            self.__use_min_cost_flow = False
+            self.__use_lns = False
+            self.__use_two_phase = False
+            self.__use_pruning = False
+            self.__is_pruned = False
+            self.__start = []
+            self.__use_aggregated_model = False
+            self.__symmetry_breaking = 0
+            self.__class_members = {s_id: [s_id] for s_id in self.__student_ids}
+            self.__class_ids = list(self.__class_members.keys())
+
+            # The previous project instance per student and the students who can stay.
+            previous_project = {s_id: p_id for p_id, s_id in self.__hint}
+            broken_projects = self.__find_broken_projects(previous_project)
+            fixed_students = [s_id for s_id, p_id in previous_project.items() if p_id not in broken_projects]
+
+            # The last stage, which was solved in the runtime.
+            solved_neighbourhood = "-"
+            start_time = time.monotonic()
+            max_runtime = min(self.__max_runtime, max_runtime)
+            for neighbourhood, fixed in (("broken_teams", fixed_students), ("all_students", [])):
+                # Solves the next stage only in the remaining runtime.
+                self.__max_runtime = max_runtime - (time.monotonic() - start_time)
+                if self.__max_runtime <= 0:
+                    break
+
+                self.__build_model()
+
+                # Keeps the fixed students in their previous project instance.
+                for s_id in fixed:
+                    self.__model.add(self.__model_x[(previous_project[s_id], s_id)] == 1)
+
+                # Weights a moved student higher than the whole objective, so the
+                # number of moved students is minimized first and the score second.
+                self.__model.maximize(self.__objective)
+                move_weight = self.__get_objective_bound() + 1
+                n_moved = sum(1 - self.__model_x[(p_id, s_id)] for s_id, p_id in previous_project.items())
+                self.__model.maximize(self.__objective - move_weight * n_moved)
+
+                # Adds the previous assignment as solution hint.
+                self.__add_hints()
+
+                # Solves the model.
+                self.__solve()
+                solved_neighbourhood = neighbourhood
+                if self.__has_result or self.__is_stopped:
+                    break
+        finally:
+            # Sets the algorithm as not running.
+            AssignmentAlgorithm.__lock.release()
+
+        # Sets the repair info.
+        self.__result_info["repair_neighbourhood"] = solved_neighbourhood
+        self.__result_info["n_broken_projects"] = len(broken_projects)
+        self.__result_info["n_moved_students"] = sum(
+            1 for p_id, s_id, _ in self.__results if s_id in previous_project and previous_project[s_id] != p_id
+        )
+
+    def add_hint(self, assignments: list[tuple[int, int]]):
+        """
+        Sets a known assignment, e.g. the teams of the previous generation,
+        as solution hint. The solver starts its search from the hint, so
+        after small changes a good solution is found right from the start.
+
+        Assignments with unknown project instances or students are ignored.
+
+        Args:
+            assignments: The assignments as `(project_id, student_id)` tuples.
+        """
+
+        self.__hint = [
+            (p_id, s_id) for p_id, s_id in assignments if p_id in self.__project_ids and s_id in self.__data_per_student
+        ]
+
+    def set_progress_callback(self, on_progress):
+        """
+        Sets the function called with the progress of every improving solution.
+
+        ```python
+        {
+            "n_solutions": ...,
+            "objective_value": ...,
+            "best_objective_bound": ...,
+            "gap": ...,  # None if the bound is 0
+            "wall_time": ...,
+        }
+        ```
+
+        Args:
+            on_progress: The function called with the progress.
+        """
+
+        self.__on_progress = on_progress
+
+    def stop(self):
+        """
+        Stops the search of the running algorithm, e.g. from another thread.
+        The best solution found so far is used as result.
+        """
+
+        self.__is_stopped = True
+
+        solver = self.__solver
+        if solver is not None:
+            solver.stop_search()
+
+    def export_model(self) -> bytes:
+        """
+        Returns the last built model as serialized `CpModelProto`, e.g. to
+        replay the run offline. It is empty for the min cost flow engine.
+        """
+
+        return self.__model.proto.SerializeToString()
 
     def get_result(self) -> dict:  # -> list[tuple[int, int, int]]:
         """
@@ -609,15 +2557,32 @@ class AssignmentAlgorithm:
         Forces the algorithm to run.
         """
 
-        AssignmentAlgorithm.__is_running = False
+        AssignmentAlgorithm.__lock.reset()
         self.run()
 
     @classmethod
     def get_is_running(cls):
         """
-        Returns whether the algorithm is running.
+        Returns whether an algorithm is running (in any process with a shared lock).
+        """
+        return cls.__lock.is_locked()
+
+    @classmethod
+    def get_lock(cls) -> AssignmentLock:
+        """
+        Returns the lock, e.g. to hold it while algorithms run in other processes.
+        """
+        return cls.__lock
+
+    @classmethod
+    def set_lock(cls, lock: AssignmentLock):
+        """
+        Sets the lock, which allows only one running algorithm at a time.
+
+        Args:
+            lock: The lock, e.g. a lock shared across processes.
         """
-        return cls.__is_running
+        cls.__lock = lock
 
 
 class AssignmentAlgorithmException(Exception):
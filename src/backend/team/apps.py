@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class TeamConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'team'
+
+    def ready(self):
+        from .algorithm import AssignmentAlgorithm
+        from .lock import DatabaseLock
+
+        # Shares the running algorithm across all processes (web and generation workers).
+        AssignmentAlgorithm.set_lock(DatabaseLock())
@@ -0,0 +1,288 @@
+"""
+This module implements benchmarks for the assignment algorithm.
+
+The benchmarks use seeded synthetic data with the same structure
+as the data created by `create_data_per_student()` in the helper.
+"""
+
+import multiprocessing
+import random
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .algorithm import AssignmentAlgorithm
+
+# The default options of the algorithm for the benchmarks.
+BENCHMARK_OPTS = {
+    "assignment_variant": 1,
+    "max_runtime": 60,
+    "relative_gap_limit": 0.0,
+    "num_workers": 8,
+    "symmetry_breaking": 1,
+    "model_variant": 1,
+    "compress_students": True,
+    "level_formulation": 2,
+    "use_min_cost_flow": True,
+    "lns_min_students": 0,
+    "use_two_phase": False,
+    "prune_score_limit": 0,
+    "use_decision_strategy": False,
+    "use_greedy_start": True,
+    "local_search_runtime": 5,
+}
+
+
+def generate_synthetic_data(
+    n_students: int,
+    n_projects: int,
+    n_instances: int,
+    seed: int = 0,
+    wing_ratio: float = 0.15,
+    level_weights: tuple[int, int, int, int] = (5, 5, 9, 1),
+    empty_ratio: float = 0.0,
+) -> tuple[dict[int, dict], dict[int, int]]:
+    """
+    Returns seeded synthetic data per student and the number of students per level.
+
+    Every project has a popularity, so the scores of popular projects are
+    higher for most students. Students with an empty poll answer every
+    project with the default score 3 and have level 1 (no answer), like
+    the generated poll data of `generate_missing_poll_data()`.
+
+    The sample data (`data/sample_data_students_*.csv`) has 11% to 24% wings.
+
+    Args:
+        n_students: The number of students.
+        n_projects: The number of projects.
+        n_instances: The number of instances per project.
+        seed: The seed of the random generator.
+        wing_ratio: The ratio of wings.
+        level_weights: The weights of the levels 1 to 4.
+        empty_ratio: The ratio of students with an empty poll.
+    """
+
+    rnd = random.Random(seed)
+    popularity = [rnd.random() for _ in range(n_projects)]
+
+    data = {}
+    n_students_per_level = {1: 0, 2: 0, 3: 0, 4: 0}
+    for s_id in range(n_students):
+        is_empty = empty_ratio > 0 and rnd.random() < empty_ratio
+
+        project_answers = {}
+        for p_idx in range(n_projects):
+            score = 3 if is_empty else max(1, min(5, round(rnd.gauss(2 + 2 * popularity[p_idx], 1.2))))
+            for i_idx in range(n_instances):
+                project_answers[p_idx * n_instances + i_idx] = score
+
+        level = 1 if is_empty else rnd.choices([1, 2, 3, 4], weights=level_weights)[0]
+        n_students_per_level[level] += 1
+
+        data[s_id] = {
+            "is_wing": int(rnd.random() < wing_ratio),
+            "project_answers": project_answers,
+            "level_answer": level,
+        }
+
+    return data, n_students_per_level
+
+
+def run_benchmark(
+    data: dict[int, dict], n_students_per_level: dict[int, int], min_students_per_project: int, opts: dict
+) -> dict:
+    """
+    Runs the algorithm once and returns the runtime and result info.
+
+    The search times are the solver times of the first solution and of the
+    first solution within 1% of the final objective value.
+
+    Args:
+        data: The data per student.
+        n_students_per_level: The number of students per level.
+        min_students_per_project: The minimum number of students per project.
+        opts: The options for the algorithm.
+    """
+
+    limits = {
+        "max_project_score": 5,
+        "min_students_per_project": min_students_per_project,
+        "n_students_per_level": n_students_per_level,
+    }
+
+    algorithm = AssignmentAlgorithm(data, limits, opts)
+    progress = []
+    algorithm.set_progress_callback(progress.append)
+    start_time = time.perf_counter()
+    algorithm.run()
+    runtime = time.perf_counter() - start_time
+    info = algorithm.get_result()["info"]
+
+    objective_value = info.get("objective_value")
+    near_best_times = [
+        entry["wall_time"]
+        for entry in progress
+        if objective_value is not None
+        and abs(objective_value - entry["objective_value"]) <= 0.01 * abs(objective_value)
+    ]
+
+    return {
+        "runtime": runtime,
+        "build_time": info.get("build_time", 0),
+        "solve_time": runtime - info.get("build_time", 0),
+        "engine": info["engine"].strip(),
+        "status_name": info["status_name"],
+        "objective_value": info.get("objective_value"),
+        "best_objective_bound": info.get("best_objective_bound"),
+        "solution_gap": info["solution_gap"] if isinstance(info.get("solution_gap"), int | float) else None,
+        "first_solution_time": progress[0]["wall_time"] if progress else None,
+        "near_best_time": near_best_times[0] if near_best_times else None,
+    }
+
+
+def run_benchmark_with_peak_memory(
+    data: dict[int, dict], n_students_per_level: dict[int, int], min_students_per_project: int, opts: dict
+) -> dict:
+    """
+    Runs the algorithm once like `run_benchmark()` and additionally returns
+    the peak memory (max resident set size) of the process in MB.
+
+    It must run in a new process per run (see `run_benchmark_suite()`),
+    because the peak memory of a process never decreases. The peak memory
+    includes the memory of the Python interpreter and OR-Tools.
+
+    Args:
+        data: The data per student.
+        n_students_per_level: The number of students per level.
+        min_students_per_project: The minimum number of students per project.
+        opts: The options for the algorithm.
+    """
+
+    result = run_benchmark(data, n_students_per_level, min_students_per_project, opts)
+    # The max resident set size is given in KB on Linux.
+    result["peak_memory_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return result
+
+
+def run_benchmark_suite(
+    cohorts: list[tuple[int, int]],
+    variants: list[int],
+    seeds: list[int],
+    max_runtime: int,
+    opts: dict | None = None,
+    data_opts: dict | None = None,
+) -> list[dict]:
+    """
+    Runs the algorithm for every cohort, assignment variant and seed in
+    a new process and returns one row per run with the model build time,
+    solve time, search times (see `run_benchmark()`), status, gap and peak memory.
+
+    Args:
+        cohorts: The cohorts as `(n_students, n_projects)` tuples.
+        variants: The assignment variants.
+        seeds: The seeds of the synthetic data.
+        max_runtime: The maximum runtime of the solver in seconds.
+        opts: The options, which override the benchmark options.
+        data_opts: The options of the synthetic data (see `generate_synthetic_data()`).
+    """
+
+    # Uses spawned processes like the portfolio, which only import the algorithm.
+    context = multiprocessing.get_context("spawn")
+
+    rows = []
+    for n_students, n_projects in cohorts:
+        for seed in seeds:
+            data, n_students_per_level = generate_synthetic_data(n_students, n_projects, 2, seed, **(data_opts or {}))
+            for variant in variants:
+                run_opts = BENCHMARK_OPTS | (opts or {}) | {"assignment_variant": variant, "max_runtime": max_runtime}
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(
+                        run_benchmark_with_peak_memory, data, n_students_per_level, 6, run_opts
+                    ).result()
+                rows.append({
+                    "n_students": n_students,
+                    "n_projects": n_projects,
+                    "seed": seed,
+                    "variant": variant,
+                    **result,
+                })
+
+    return rows
+
+
+def benchmark_level_formulations(
+    cohorts: list[tuple[int, int]], variants: list[int], seeds: list[int], max_runtime: int
+) -> list[dict]:
+    """
+    Compares the time to optimal of the level formulations for the
+    assignment variants with level and returns one row per run.
+
+    Args:
+        cohorts: The cohorts as `(n_students, n_projects)` tuples.
+        variants: The assignment variants.
+        seeds: The seeds of the synthetic data.
+        max_runtime: The maximum runtime of the solver in seconds.
+    """
+
+    rows = []
+    for n_students, n_projects in cohorts:
+        for seed in seeds:
+            data, n_students_per_level = generate_synthetic_data(n_students, n_projects, 2, seed)
+            for variant in variants:
+                for level_formulation in [1, 2]:
+                    opts = BENCHMARK_OPTS | {
+                        "assignment_variant": variant,
+                        "max_runtime": max_runtime,
+                        "level_formulation": level_formulation,
+                    }
+                    result = run_benchmark(data, n_students_per_level, 6, opts)
+                    rows.append({
+                        "n_students": n_students,
+                        "n_projects": n_projects,
+                        "seed": seed,
+                        "variant": variant,
+                        "level_formulation": level_formulation,
+                        **result,
+                    })
+
+    return rows
+
+
+def benchmark_two_phase(
+    cohorts: list[tuple[int, int]], variants: list[int], seeds: list[int], max_runtime: int
+) -> list[dict]:
+    """
+    Compares the monolithic instance model with the two-phase solve,
+    which chooses the used project instances first, and returns one
+    row per run.
+
+    Args:
+        cohorts: The cohorts as `(n_students, n_projects)` tuples.
+        variants: The assignment variants.
+        seeds: The seeds of the synthetic data.
+        max_runtime: The maximum runtime of the solver in seconds.
+    """
+
+    rows = []
+    for n_students, n_projects in cohorts:
+        for seed in seeds:
+            data, n_students_per_level = generate_synthetic_data(n_students, n_projects, 2, seed)
+            for variant in variants:
+                for use_two_phase in [False, True]:
+                    opts = BENCHMARK_OPTS | {
+                        "assignment_variant": variant,
+                        "max_runtime": max_runtime,
+                        "use_two_phase": use_two_phase,
+                    }
+                    result = run_benchmark(data, n_students_per_level, 6, opts)
+                    rows.append({
+                        "n_students": n_students,
+                        "n_projects": n_projects,
+                        "seed": seed,
+                        "variant": variant,
+                        "use_two_phase": use_two_phase,
+                        **result,
+                    })
+
+    return rows
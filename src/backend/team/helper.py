@@ -1,17 +1,28 @@
+import hashlib
+import json
+import logging
+import math
+import threading
+from contextlib import contextmanager
 from itertools import groupby
 
 from app.models import DevSettings, Info, Project, Settings, Student
-from django.db.models import F, ProtectedError
+from django.db import connection
+from django.db.models import Count, F, ProtectedError
 from django.utils import timezone
 from poll.helper import (
+    generate_missing_poll_data,
     get_happiness_icon,
     get_number_of_students_per_level,
     get_poll_stats_for_student,
+    get_project_ids_ordered_by_score,
 )
 from poll.models import POLL_LEVELS, POLL_SCORES, LevelAnswer, Poll, ProjectAnswer
 
-from .algorithm import AssignmentAlgorithm
-from .models import ProjectInstance, Team, TeamMember
+from .algorithm import AssignmentAlgorithm, AssignmentAlgorithmException
+from .models import CachedResult, GenerationJob, ProjectInstance, Team, TeamMember
+from .portfolio import run_portfolio, run_size_sweep
+from .snapshot import save_snapshot
 
 # Stores the ID to index mappings between database (model) and algorithm.
 id_idx_mappings = {
@@ -51,22 +62,75 @@ def recreate_project_instances():
     """
 
     settings = Settings.load()
+    dev_settings = DevSettings.load()
     projects = Project.objects.all().order_by("pid")
 
+    # Sets the number of instances to the project or the default setting.
+    n_instances_per_project = {
+        project.id: settings.project_instances if project.instances is None else project.instances
+        for project in projects
+    }
+
+    # Reduces the number of instances to the demand of the project answers.
+    if dev_settings.provision_project_instances:
+        n_instances_per_project = get_number_of_instances_by_demand(n_instances_per_project, settings.team_min_member)
+
     # Deletes the existing project instances.
     ProjectInstance.objects.all().delete()
 
     for project in projects:
-        # Sets the number of instances to the project or the default setting.
-        n_instances = settings.project_instances if project.instances is None else project.instances
-
         # Creates the project instances.
         project_instances = []
-        for idx in range(1, n_instances + 1):
+        for idx in range(1, n_instances_per_project[project.id] + 1):
             project_instances.append(ProjectInstance(project=project, number=idx))
         ProjectInstance.objects.bulk_create(project_instances)
 
 
+def get_number_of_instances_by_demand(max_instances_per_project: dict[int, int], min_students: int) -> dict[int, int]:
+    """
+    Returns the number of project instances per project, which the
+    algorithm could use based on the demand of the project answers.
+
+    Every project gets one instance per team of students, who rated the
+    project better than the default score, but at least one. If these
+    instances are less than the number of teams the algorithm requires,
+    the projects with the highest total score get further instances.
+
+    Args:
+        max_instances_per_project: The max number of instances per project id.
+        min_students: The min number of students per team.
+    """
+
+    # The number of students with project answers and the number of teams required
+    # by the algorithm (see `AssignmentAlgorithm`).
+    n_students = ProjectAnswer.objects.values("poll").distinct().count()
+    n_teams_required = min(n_students // min_students, sum(max_instances_per_project.values()))
+
+    # The number of students, who want the project, and the total score per project.
+    n_wanted = dict(
+        ProjectAnswer.objects
+        .filter(score__gt=POLL_SCORES["default"])
+        .values_list("project")
+        .annotate(n_students=Count("id"))
+    )
+    total_scores = {entry["project"]: entry["total_score"] for entry in get_project_ids_ordered_by_score()}
+
+    n_instances_per_project = {
+        project_id: min(max_instances, max(1, math.ceil(n_wanted.get(project_id, 0) / min_students)))
+        for project_id, max_instances in max_instances_per_project.items()
+    }
+
+    # Adds instances to the most popular projects until the required number of teams is reached.
+    project_ids = sorted(max_instances_per_project, key=lambda project_id: -total_scores.get(project_id, 0))
+    while sum(n_instances_per_project.values()) < n_teams_required:
+        for project_id in project_ids:
+            if n_instances_per_project[project_id] < max_instances_per_project[project_id]:
+                n_instances_per_project[project_id] += 1
+                break
+
+    return n_instances_per_project
+
+
 def get_project_instance_ids() -> list:
     """
     Returns a list of the project instances IDs.
@@ -192,10 +256,13 @@ def create_data_per_student(
     return data_per_student
 
 
-def create_data_for_algorithm() -> dict:
+def create_data_for_algorithm(students=None) -> dict:
     """
     Creates the data for the algorithm.
 
+    Args:
+        students: The students to assign (default: all students).
+
     Returns:
         The data for the algorithm.
     """
@@ -203,10 +270,11 @@ def create_data_for_algorithm() -> dict:
     # Sets the students data: student_id, is_wing.
     students_data = []
 
-    # Variant 1: Students in default order.
-    students = Student.objects.all()
-    # Variant 2: Students in random order.
-    # students = Student.objects.order_by("?").all()
+    if students is None:
+        # Variant 1: Students in default order.
+        students = Student.objects.all()
+        # Variant 2: Students in random order.
+        # students = Student.objects.order_by("?").all()
 
     for student in students:
         students_data.append({"id": student.pk, "is_wing": student.is_wing})
@@ -218,10 +286,15 @@ def create_data_for_algorithm() -> dict:
 
     # Sets the project answers data: student_id, project_id, score.
     project_answers_data = list(
-        ProjectAnswer.objects.order_by("poll").values("project", "score", student=F("poll__student"))
+        ProjectAnswer.objects
+        .filter(poll__student__in=students)
+        .order_by("poll")
+        .values("project", "score", student=F("poll__student"))
     )
 
-    level_answers_data = list(LevelAnswer.objects.values("level", student=F("poll__student")))
+    level_answers_data = list(
+        LevelAnswer.objects.filter(poll__student__in=students).values("level", student=F("poll__student"))
+    )
 
     # Prepares the data for the algorithm.
     create_id_idx_mappings(students_data, project_instances_data)
@@ -230,46 +303,259 @@ def create_data_for_algorithm() -> dict:
     return data
 
 
-def generate_teams_with_algorithm() -> dict:
+def get_team_assignments() -> list[tuple[int, int, int]]:
     """
-    Generates the teams with the algorithm and returns the result.
+    Returns the current team assignments as tuples of project ID,
+    project instance number and student ID.
+
+    The project instance number is used instead of the project instance ID,
+    because the project instances are recreated before each generation.
+    """
+
+    return list(
+        TeamMember.objects.values_list("team__project_instance__project", "team__project_instance__number", "student")
+    )
+
+
+def create_hint_for_algorithm(assignments: list[tuple[int, int, int]]) -> list[tuple[int, int]]:
+    """
+    Returns the given team assignments as solution hint for the algorithm.
+
+    Args:
+        assignments: The team assignments from `get_team_assignments()`.
 
     Returns:
-        The results of the algorithm.
+        The assignments as tuples of project instance index and student index.
     """
 
-    settings = Settings.load()
-    dev_settings = DevSettings.load()
+    project_instance_ids = {
+        (project_id, number): project_instance_id
+        for project_instance_id, project_id, number in ProjectInstance.objects.values_list("id", "project", "number")
+    }
 
-    # Creates the data for the algorithm.
-    data = create_data_for_algorithm()
+    hint = []
+    for project_id, number, student_id in assignments:
+        instance_idx = id_idx_mappings["project"]["db2algo"].get(project_instance_ids.get((project_id, number)))
+        student_idx = id_idx_mappings["student"]["db2algo"].get(student_id)
+        if instance_idx is not None and student_idx is not None:
+            hint.append((instance_idx, student_idx))
+
+    return hint
+
+
+def get_limits_for_algorithm(n_students_per_level: dict) -> dict:
+    """
+    Returns the limits for the algorithm.
+
+    Args:
+        n_students_per_level: The number of students per level.
+    """
+
+    settings = Settings.load()
 
-    # Sets the needed limits.
-    limits = {
+    return {
         "max_project_score": POLL_SCORES["max"],
         "min_students_per_project": settings.team_min_member,
-        "n_students_per_level": get_number_of_students_per_level(),
+        "n_students_per_level": n_students_per_level,
     }
 
-    # Sets the needed options.
-    opts = {
+
+def get_opts_for_algorithm() -> dict:
+    """
+    Returns the options for the algorithm from the dev settings.
+    """
+
+    dev_settings = DevSettings.load()
+
+    return {
         "assignment_variant": dev_settings.assignment_variant,
         "max_runtime": dev_settings.max_runtime,
         "relative_gap_limit": dev_settings.relative_gap_limit,
         "num_workers": dev_settings.num_workers,
+        "symmetry_breaking": dev_settings.symmetry_breaking,
+        "model_variant": dev_settings.model_variant,
+        "compress_students": dev_settings.compress_students,
+        "level_formulation": dev_settings.level_formulation,
+        "use_min_cost_flow": dev_settings.use_min_cost_flow,
+        "lns_min_students": dev_settings.lns_min_students,
+        "use_two_phase": dev_settings.use_two_phase,
+        "prune_score_limit": dev_settings.prune_score_limit,
+        "use_decision_strategy": dev_settings.use_decision_strategy,
+        "use_greedy_start": dev_settings.use_greedy_start,
+        "local_search_runtime": dev_settings.local_search_runtime,
+    }
+
+
+@contextmanager
+def stop_algorithm_if_requested(algorithm: AssignmentAlgorithm, should_stop=None, interval: float = 1.0):
+    """
+    Stops the algorithm as soon as `should_stop()` returns True. It is
+    checked in a thread while the context is active.
+
+    Args:
+        algorithm: The algorithm to stop.
+        should_stop: The function, which returns whether the algorithm should stop.
+        interval: The seconds between two checks.
+    """
+
+    if should_stop is None:
+        yield
+        return
+
+    is_finished = threading.Event()
+
+    def watch():
+        try:
+            while not is_finished.wait(interval):
+                if should_stop():
+                    algorithm.stop()
+        finally:
+            # Closes the database connection of this thread.
+            connection.close()
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        is_finished.set()
+        watcher.join()
+
+
+def get_cache_key(data: dict, limits: dict, opts: dict) -> str:
+    """
+    Returns the hash of the data, limits and options of the algorithm.
+
+    Args:
+        data: The data for the algorithm.
+        limits: The limits for the algorithm.
+        opts: The options for the algorithm.
+    """
+
+    content = json.dumps({"data": data, "limits": limits, "opts": opts}, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_cached_result(key: str) -> dict | None:
+    """
+    Returns the cached result for the given key or None.
+
+    Evicts all cached results created before the last poll change.
+
+    Args:
+        key: The hash of the data, limits and options (see `get_cache_key()`).
+    """
+
+    polls_last_update = Info.load().polls_last_update
+    CachedResult.objects.exclude(polls_last_update=polls_last_update).delete()
+    if polls_last_update is None:
+        CachedResult.objects.exclude(polls_last_update__isnull=True).delete()
+
+    cached_result = CachedResult.objects.filter(key=key).first()
+    if cached_result is None:
+        return None
+
+    return {
+        "assignments": [tuple(assignment) for assignment in cached_result.result["assignments"]],
+        "info": cached_result.result["info"] | {"from_cache": True},
     }
 
+
+def cache_result(key: str, result: dict):
+    """
+    Caches the result for the given key, if it has assignments from a
+    solution of the solver and the search was not stopped early.
+
+    The start assignment as result (see `start_name`) is not cached, because
+    the solver found no solution in the runtime.
+
+    Args:
+        key: The hash of the data, limits and options (see `get_cache_key()`).
+        result: The result of the algorithm.
+    """
+
+    info = result["info"]
+    if not result["assignments"] or info.get("is_stopped") or info.get("start_name"):
+        return
+    if info.get("status_name") not in ["OPTIMAL", "FEASIBLE"]:
+        return
+
+    CachedResult.objects.update_or_create(
+        key=key, defaults={"polls_last_update": Info.load().polls_last_update, "result": result}
+    )
+
+
+def generate_teams_with_algorithm(
+    previous_assignments: list[tuple[int, int, int]] | None = None,
+    on_progress=None,
+    should_stop=None,
+    force_solve: bool = False,
+) -> dict:
+    """
+    Generates the teams with the algorithm and returns the result.
+
+    Args:
+        previous_assignments: The team assignments of the previous generation
+            used as solution hint (see `get_team_assignments()`).
+        on_progress: The function called with the progress of every improving
+            solution (see `AssignmentAlgorithm.set_progress_callback()`).
+        should_stop: The function, which returns whether the search should
+            be stopped. The best solution found so far is used.
+        force_solve: Whether the algorithm runs even if a cached result exists.
+
+    Returns:
+        The results of the algorithm.
+    """
+
+    dev_settings = DevSettings.load()
+
+    # Creates the data for the algorithm.
+    data = create_data_for_algorithm()
+
+    # Sets the needed limits and options.
+    limits = get_limits_for_algorithm(get_number_of_students_per_level())
+    opts = get_opts_for_algorithm()
+
+    # Returns the cached result of identical data, limits and options.
+    cache_key = get_cache_key(data, limits, opts)
+    if not force_solve:
+        cached_result = get_cached_result(cache_key)
+        if cached_result is not None:
+            return cached_result
+
     result = {
         "assignments": [],
         "info": {},
     }
-    if not AssignmentAlgorithm.get_is_running():
+    # Holds the lock, so no other process starts an algorithm in the meantime.
+    lock = AssignmentAlgorithm.get_lock()
+    if not lock.acquire():
+        return result
+    try:
         # Creates and initializes the algorithm with the given data and options.
         algorithm = AssignmentAlgorithm(data, limits, opts)
+        # Warm-starts the algorithm with the previous teams.
+        hint = []
+        if dev_settings.use_warm_start and previous_assignments:
+            hint = create_hint_for_algorithm(previous_assignments)
+            algorithm.add_hint(hint)
+        # Reports the progress of the solver.
+        algorithm.set_progress_callback(on_progress)
         # Runs the algorithm to find an optimal assignment of students to projects.
-        algorithm.run()
+        with stop_algorithm_if_requested(algorithm, should_stop):
+            algorithm.run()
         # Gets the results.
         result = algorithm.get_result()
+        cache_result(cache_key, result)
+        # Saves a snapshot to replay the run offline.
+        if dev_settings.save_snapshots:
+            path = save_snapshot(data, limits, opts, hint, algorithm)
+            logging.getLogger(__name__).info(f"Saved snapshot of the algorithm: {path}")
+    except AssignmentAlgorithmException as e:
+        # Another algorithm is running.
+        logging.getLogger(__name__).warning(e)
+    finally:
+        lock.release()
 
     return result
 
@@ -357,34 +643,487 @@ def set_initial_contact_person():
             team_members[0].save()
 
 
-def generate_teams() -> bool:
+def summarize_result(data: dict[int, dict], result: dict) -> dict:
+    """
+    Returns the total score, happiness and level mix of the given result.
+
+    The happiness is calculated like `calc_happiness_score()` from the
+    project score of every student, normalized to 0-1 with the max
+    possible score (happiness) and with the own max score (poll happiness).
+
+    Args:
+        data: The data for the algorithm.
+        result: The result of the algorithm.
+    """
+
+    info = result["info"]
+    assignments = result["assignments"]
+    max_score = POLL_SCORES["max"]
+
+    happiness = 0
+    poll_happiness = 0
+    levels_per_team = {}
+    for p_idx, s_idx, _ in assignments:
+        project_answers = data[s_idx]["project_answers"]
+        score = project_answers[p_idx]
+        own_max_score = max(project_answers.values())
+        happiness += (score - 1) / (max_score - 1) if max_score > 1 else 0
+        poll_happiness += (score - 1) / (own_max_score - 1) if own_max_score > 1 else 0
+        levels_per_team.setdefault(p_idx, set()).add(data[s_idx]["level_answer"])
+
+    n_students = len(assignments)
+    # Levels 2 to 4 are ambition levels, level 1 is "no answer".
+    ambition_levels_per_team = [levels - {1} for levels in levels_per_team.values()]
+
+    return {
+        "status_name": info.get("status_name", "-"),
+        "objective_value": info.get("objective_value"),
+        "wall_time": info.get("wall_time"),
+        "solution_gap": info.get("solution_gap"),
+        "total_score": sum(score for _, _, score in assignments),
+        "happiness": round(happiness / n_students, 3) if n_students else None,
+        "poll_happiness": round(poll_happiness / n_students, 3) if n_students else None,
+        "n_teams": len(levels_per_team),
+        "n_mixed_level_teams": sum(1 for levels in ambition_levels_per_team if len(levels) > 1),
+        "n_level_24_teams": sum(1 for levels in ambition_levels_per_team if {2, 4} <= levels),
+    }
+
+
+def create_input_for_algorithm() -> tuple[dict, dict, dict]:
+    """
+    Returns the data, limits and options for the algorithm like
+    `generate_teams_with_algorithm()`, but keeps the existing teams.
+
+    Creates the project instances, if no teams were generated yet.
+    """
+
+    if not ProjectInstance.objects.exists():
+        recreate_project_instances()
+
+    data = create_data_for_algorithm()
+    limits = get_limits_for_algorithm(get_number_of_students_per_level())
+    opts = get_opts_for_algorithm()
+
+    return data, limits, opts
+
+
+def compare_assignment_variants(variants: list[int] | None = None, should_stop=None) -> list[dict] | None:
+    """
+    Solves the assignment variants at the same time in worker processes and
+    returns a summary per variant (see `summarize_result()`).
+
+    The results are cached, so applying a variant afterwards with
+    `generate_teams()` returns its teams at once.
+
+    Args:
+        variants: The assignment variants (default: all variants).
+        should_stop: The function, which returns whether the runs should be
+            stopped. Every run uses the best solution found so far.
+
+    Returns:
+        The summary per variant or None if an algorithm is already running.
+    """
+
+    if variants is None:
+        variants = [1, 2, 3]
+
+    data, limits, opts = create_input_for_algorithm()
+
+    # Holds the lock for all worker processes.
+    lock = AssignmentAlgorithm.get_lock()
+    if not lock.acquire():
+        return None
+    try:
+        results = run_portfolio(data, limits, opts, variants, should_stop)
+    finally:
+        lock.release()
+
+    summaries = []
+    for variant, result in results.items():
+        cache_result(get_cache_key(data, limits, opts | {"assignment_variant": variant}), result)
+        summaries.append({"variant": variant, **summarize_result(data, result)})
+
+    return summaries
+
+
+def sweep_team_sizes(min_sizes: list[int], max_runtime: int, should_stop=None) -> list[dict] | None:
+    """
+    Solves the assignment for the given minimum team sizes at the same time
+    in worker processes with a short runtime and returns a summary per size
+    (see `summarize_result()`), e.g. to choose `Settings.team_min_member`.
+
+    Args:
+        min_sizes: The minimum numbers of students per team.
+        max_runtime: The maximum runtime of every run in seconds.
+        should_stop: The function, which returns whether the runs should be
+            stopped. Every run uses the best solution found so far.
+
+    Returns:
+        The summary per size or None if an algorithm is already running.
+    """
+
+    data, limits, opts = create_input_for_algorithm()
+
+    # Skips the sizes without a single complete team.
+    min_sizes = [min_size for min_size in min_sizes if 0 < min_size <= len(data)]
+
+    # Holds the lock for all worker processes.
+    lock = AssignmentAlgorithm.get_lock()
+    if not lock.acquire():
+        return None
+    try:
+        results = run_size_sweep(data, limits, opts, min_sizes, max_runtime, should_stop)
+    finally:
+        lock.release()
+
+    return [{"min_size": min_size, **summarize_result(data, result)} for min_size, result in results.items()]
+
+
+def generate_teams(on_progress=None, should_stop=None, force_solve: bool = False) -> bool:
     """
     Generates the teams.
 
+    Args:
+        on_progress: The function called with the progress of every improving
+            solution (see `AssignmentAlgorithm.set_progress_callback()`).
+        should_stop: The function, which returns whether the search should
+            be stopped. The best solution found so far is used.
+        force_solve: Whether the algorithm runs even if a cached result exists.
+
     Returns:
         True if the teams were generated successfully, False otherwise.
     """
 
-    # Cleans up the existing teams and project instances.
-    clean_up()
+    # Holds the lock from the clean up until the teams are saved, so no other
+    # process deletes or saves teams in the meantime. Keeps the existing teams,
+    # if an algorithm is running in another process.
+    lock = AssignmentAlgorithm.get_lock()
+    if not lock.acquire():
+        return False
+
+    try:
+        # Keeps the existing teams to warm-start the algorithm.
+        previous_assignments = get_team_assignments()
+
+        # Cleans up the existing teams and project instances.
+        clean_up()
+
+        # Checks if polls and project answers exist.
+        # If not, the teams cannot be generated.
+        if not Poll.objects.exists() or not ProjectAnswer.objects.exists():
+            return False
+
+        # Generates the teams with the algorithm.
+        result = generate_teams_with_algorithm(previous_assignments, on_progress, should_stop, force_solve)
+
+        # Saves only a result with teams, e.g. not if the algorithm found no solution.
+        if not result["assignments"]:
+            return False
+
+        # Saves the teams to the database.
+        save_teams_to_db(result)
+
+        # Sets the initial contact person.
+        set_initial_contact_person()
+    finally:
+        lock.release()
+
+    return True
+
+
+def get_active_generation_job() -> GenerationJob | None:
+    """
+    Returns the queued or running generation job or None.
+    """
+
+    return (
+        GenerationJob.objects
+        .filter(status__in=[GenerationJob.Status.QUEUED, GenerationJob.Status.RUNNING])
+        .order_by("created_at")
+        .first()
+    )
+
+
+def queue_generation_job(
+    force_solve: bool = False, kind: GenerationJob.Kind = GenerationJob.Kind.GENERATION, params: dict | None = None
+) -> GenerationJob | None:
+    """
+    Queues a generation job, which is run by the generation worker
+    (see `manage.py run_generation_worker`).
+
+    Args:
+        force_solve: Whether the algorithm runs even if a cached result exists.
+        kind: The kind of the job, the team generation, the comparison of the
+            assignment variants (see `compare_assignment_variants()`) or of the
+            team sizes (see `sweep_team_sizes()`).
+        params: The arguments of the job, e.g. for `sweep_team_sizes()`.
+
+    Returns:
+        The queued job or None if a generation job is already queued or running.
+    """
+
+    if get_active_generation_job() is not None:
+        return None
+
+    return GenerationJob.objects.create(force_solve=force_solve, kind=kind, params=params)
+
+
+def run_generation_job(job: GenerationJob) -> bool:
+    """
+    Runs the given queued generation job and stores its status.
+
+    Args:
+        job: The queued generation job.
 
-    # Checks if polls and project answers exist.
-    # If not, the teams cannot be generated.
-    if not Poll.objects.exists() or not ProjectAnswer.objects.exists():
+    Returns:
+        True if the job was run, False if another worker claimed it first.
+    """
+
+    # Claims the job, so every job is run only once.
+    is_claimed = GenerationJob.objects.filter(pk=job.pk, status=GenerationJob.Status.QUEUED).update(
+        status=GenerationJob.Status.RUNNING, started_at=timezone.now()
+    )
+    if not is_claimed:
         return False
 
-    # Generates the teams with the algorithm.
-    result = generate_teams_with_algorithm()
+    job.refresh_from_db()
+    job_thread = threading.get_ident()
+
+    def save_progress(progress: dict):
+        # Stores the progress of the solver in the job, so the teams page can poll it.
+        GenerationJob.objects.filter(pk=job.pk).update(**progress)
+        # Closes the database connection of a solver thread, which calls the function.
+        if threading.get_ident() != job_thread:
+            connection.close()
+
+    def is_cancel_requested() -> bool:
+        # Checks whether the job was cancelled (see `cancel_generation_job()`).
+        return GenerationJob.objects.filter(pk=job.pk, cancel_requested=True).exists()
 
-    # Saves the teams to the database.
-    save_teams_to_db(result)
+    try:
+        generate_missing_poll_data()
+        if job.kind in (GenerationJob.Kind.PORTFOLIO, GenerationJob.Kind.SWEEP):
+            if job.kind == GenerationJob.Kind.PORTFOLIO:
+                # Compares the assignment variants.
+                job.result = compare_assignment_variants(should_stop=is_cancel_requested)
+            else:
+                # Compares the minimum team sizes.
+                job.result = sweep_team_sizes(**job.params, should_stop=is_cancel_requested)
+            if job.result is not None:
+                job.status = GenerationJob.Status.CANCELLED if is_cancel_requested() else GenerationJob.Status.DONE
+            else:
+                job.status = GenerationJob.Status.FAILED
+                job.error = "Es läuft bereits eine Teamgenerierung."
+        elif generate_teams(save_progress, is_cancel_requested, job.force_solve):
+            job.status = GenerationJob.Status.CANCELLED if is_cancel_requested() else GenerationJob.Status.DONE
+        else:
+            job.status = GenerationJob.Status.FAILED
+            job.error = (
+                "Es sind keine Fragebögen vorhanden, es läuft bereits eine Teamgenerierung "
+                + "oder es wurde keine gültige Teamzuordnung gefunden."
+            )
+    except Exception as e:
+        logging.getLogger(__name__).exception("Generation job failed")
+        job.status = GenerationJob.Status.FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    # Keeps the progress stored by `save_progress()`.
+    job.save(update_fields=["status", "error", "finished_at", "result"])
+
+    return True
+
+
+def cancel_generation_job() -> bool:
+    """
+    Cancels the queued or running generation job. A queued job is not run
+    anymore. A running team generation stops its search and saves the best
+    teams found so far. A running comparison of the assignment variants or
+    team sizes stops all its runs and is not shown.
 
-    # Sets the initial contact person.
-    set_initial_contact_person()
+    Returns:
+        True if a job was cancelled, False otherwise.
+    """
+
+    job = get_active_generation_job()
+    if job is None:
+        return False
+
+    # Cancels the job directly, if it is still queued.
+    is_cancelled = GenerationJob.objects.filter(pk=job.pk, status=GenerationJob.Status.QUEUED).update(
+        status=GenerationJob.Status.CANCELLED, cancel_requested=True, finished_at=timezone.now()
+    )
+    if not is_cancelled:
+        # Requests the running job to stop its search.
+        GenerationJob.objects.filter(pk=job.pk).update(cancel_requested=True)
 
     return True
 
 
+def run_next_generation_job() -> bool:
+    """
+    Runs the oldest queued generation job.
+
+    Returns:
+        True if a job was run, False otherwise.
+    """
+
+    job = GenerationJob.objects.filter(status=GenerationJob.Status.QUEUED).order_by("created_at").first()
+    if job is None:
+        return False
+
+    return run_generation_job(job)
+
+
+def fail_interrupted_generation_jobs():
+    """
+    Sets the running generation jobs as failed, e.g. after the worker was restarted.
+    """
+
+    GenerationJob.objects.filter(status=GenerationJob.Status.RUNNING).update(
+        status=GenerationJob.Status.FAILED,
+        finished_at=timezone.now(),
+        error="Die Teamgenerierung wurde unterbrochen.",
+    )
+
+
+def repair_teams_with_algorithm() -> dict:
+    """
+    Repairs the existing teams of the active students with the algorithm
+    and returns the result. As few students as possible are moved.
+
+    Returns:
+        The results of the algorithm.
+    """
+
+    # Creates the data for the active students.
+    data = create_data_for_algorithm(Student.objects.filter(is_active=True))
+
+    # Sets the needed limits and options.
+    n_students_per_level = dict.fromkeys(POLL_LEVELS["choices"], 0)
+    for student_data in data.values():
+        n_students_per_level[student_data["level_answer"]] += 1
+    limits = get_limits_for_algorithm(n_students_per_level)
+    opts = get_opts_for_algorithm()
+
+    result = {
+        "assignments": [],
+        "info": {},
+    }
+    # Holds the lock, so no other process starts an algorithm in the meantime.
+    lock = AssignmentAlgorithm.get_lock()
+    if not lock.acquire():
+        return result
+    try:
+        # Creates and initializes the algorithm with the given data and options.
+        algorithm = AssignmentAlgorithm(data, limits, opts)
+        # Sets the existing teams as assignment to repair.
+        algorithm.add_hint(create_hint_for_algorithm(get_team_assignments()))
+        # Runs the repair of the existing teams.
+        algorithm.repair()
+        # Gets the results.
+        result = algorithm.get_result()
+    except AssignmentAlgorithmException as e:
+        # Another algorithm is running.
+        logging.getLogger(__name__).warning(e)
+    finally:
+        lock.release()
+
+    return result
+
+
+def save_repaired_teams_to_db(result):
+    """
+    Saves the repaired teams in the result to the database.
+
+    Moves the team members to their new team, adds the new students and
+    deletes the teams without members. New teams get a contact person.
+
+    Args:
+        result: The result of the algorithm.
+    """
+
+    assignments = result["assignments"] or []
+    info = result["info"] or {}
+    team_members = {team_member.student_id: team_member for team_member in TeamMember.objects.all()}
+
+    for instance_idx, student_idx, score in assignments:
+        # Gets the project instance and student ID.
+        project_instance_id = id_idx_mappings["project"]["algo2db"].get(instance_idx)
+        student_id = id_idx_mappings["student"]["algo2db"].get(student_idx)
+
+        # Gets or creates the team of the project instance.
+        team, _ = Team.objects.get_or_create(project_instance_id=project_instance_id)
+
+        # Adds the new student or moves the student into the team.
+        team_member = team_members.get(student_id)
+        if team_member is None:
+            TeamMember.objects.create(team=team, student_id=student_id, student_is_initial_contact=False, score=score)
+        elif team_member.team_id != team.pk:
+            team_member.team = team
+            team_member.student_is_initial_contact = False
+            team_member.score = score
+            team_member.save()
+
+    # Deletes the teams without members (and without feedback).
+    try:
+        Team.objects.filter(teammember__isnull=True, peerfeedback1__isnull=True).delete()
+    except ProtectedError as e:
+        logging.getLogger(__name__).warning(f"Error deleting empty teams: {e}")
+
+    # Sets a random contact person for the teams without one.
+    teams = Team.objects.filter(teammember__isnull=False).exclude(teammember__student_is_initial_contact=True)
+    for team in teams.distinct():
+        team_member = TeamMember.objects.filter(team=team).order_by("?").first()
+        team_member.student_is_initial_contact = True
+        team_member.save()
+
+    # Saves the result info.
+    result_infos = []
+    for key in info:
+        result_infos.append(f"{key}: {info[key]}")
+    result_info = "\n".join(result_infos)
+    values = {
+        "teams_last_update": timezone.now(),
+        "result_info": result_info,
+    }
+    Info.objects.update_or_create(defaults=values)
+
+
+def repair_teams() -> dict | None:
+    """
+    Repairs the existing teams with as few moved students as possible,
+    e.g. after students dropped out or were added late.
+
+    Returns:
+        The result info or None if the teams could not be repaired.
+    """
+
+    # Checks if teams, polls and project answers exist.
+    # If not, the teams cannot be repaired.
+    if not Team.objects.exists() or not Poll.objects.exists() or not ProjectAnswer.objects.exists():
+        return None
+
+    # Holds the lock until the repaired teams are saved, so no other
+    # process deletes or saves teams in the meantime.
+    lock = AssignmentAlgorithm.get_lock()
+    if not lock.acquire():
+        return None
+
+    try:
+        # Repairs the teams with the algorithm.
+        result = repair_teams_with_algorithm()
+        if not result["assignments"]:
+            return None
+
+        # Saves the repaired teams to the database.
+        save_repaired_teams_to_db(result)
+    finally:
+        lock.release()
+
+    return result["info"]
+
+
 def get_teams_for_view() -> dict:
     """
     Returns the prepared teams for the view.
@@ -0,0 +1,133 @@
+"""
+This module implements the lock of the assignment algorithm shared
+across processes, e.g. the gunicorn workers and the generation worker.
+"""
+
+import os
+import threading
+import uuid
+from datetime import timedelta
+
+from django.db import close_old_connections, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .algorithm import AssignmentLock
+from .models import SolverLock
+
+
+class DatabaseLock(AssignmentLock):
+    """
+    The lock is a single database row with the owner and a heartbeat.
+
+    While the lock is held, a thread renews the heartbeat. If the owner
+    crashes, the heartbeat stops and the lock expires after the timeout.
+    """
+
+    def __init__(self, timeout: int = 60, heartbeat_interval: int = 10):
+        """
+        The constructor of the database lock.
+
+        Args:
+            timeout: The seconds without heartbeat after which the lock expires.
+            heartbeat_interval: The seconds between two heartbeats.
+        """
+
+        super().__init__()
+
+        self.__timeout = timedelta(seconds=timeout)
+        self.__heartbeat_interval = heartbeat_interval
+        self.__owner = ""
+        # The thread holding the lock and how often it acquired the lock (see `AssignmentLock`).
+        self.__holder = None
+        self.__n_acquired = 0
+        self.__stop_heartbeat = threading.Event()
+        self.__heartbeat_thread = None
+
+    def acquire(self) -> bool:
+        """
+        Acquires the lock and returns whether it was acquired.
+
+        The lock is acquired with a single conditional update, so only one
+        process can acquire a free or expired lock.
+        """
+
+        if self.__owner and self.__holder == threading.get_ident():
+            self.__n_acquired += 1
+            return True
+
+        owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        now = timezone.now()
+
+        SolverLock.objects.get_or_create(pk=1)
+        is_acquired = (
+            SolverLock.objects
+            .filter(pk=1)
+            .filter(Q(owner="") | Q(heartbeat_at__isnull=True) | Q(heartbeat_at__lt=now - self.__timeout))
+            .update(owner=owner, acquired_at=now, heartbeat_at=now)
+        )
+        if not is_acquired:
+            return False
+
+        self.__owner = owner
+        self.__holder = threading.get_ident()
+        self.__n_acquired = 1
+        self.__stop_heartbeat.clear()
+        self.__heartbeat_thread = threading.Thread(target=self.__heartbeat, daemon=True)
+        self.__heartbeat_thread.start()
+
+        return True
+
+    def release(self):
+        """
+        Releases the lock, if it is held by this process. If it was
+        acquired several times, only the last release frees it.
+        """
+
+        if self.__n_acquired > 1:
+            self.__n_acquired -= 1
+            return
+
+        self.__stop_heartbeat.set()
+        if self.__heartbeat_thread is not None:
+            self.__heartbeat_thread.join()
+            self.__heartbeat_thread = None
+
+        SolverLock.objects.filter(pk=1, owner=self.__owner).update(owner="", heartbeat_at=None)
+        self.__owner = ""
+        self.__holder = None
+        self.__n_acquired = 0
+
+    def reset(self):
+        """
+        Releases the lock, even if it is held by another process.
+        """
+
+        self.__n_acquired = 0
+        self.release()
+        SolverLock.objects.filter(pk=1).update(owner="", heartbeat_at=None)
+
+    def is_locked(self) -> bool:
+        """
+        Returns whether the lock is held by any process and not expired.
+        """
+
+        return (
+            SolverLock.objects
+            .filter(pk=1, heartbeat_at__gte=timezone.now() - self.__timeout)
+            .exclude(owner="")
+            .exists()
+        )
+
+    def __heartbeat(self):
+        """
+        Renews the heartbeat until the lock is released.
+        """
+
+        try:
+            while not self.__stop_heartbeat.wait(self.__heartbeat_interval):
+                SolverLock.objects.filter(pk=1, owner=self.__owner).update(heartbeat_at=timezone.now())
+        finally:
+            # Closes the database connection of this thread.
+            close_old_connections()
+            connection.close()
@@ -0,0 +1,104 @@
+import json
+import platform
+from pathlib import Path
+
+import ortools
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from team.benchmark import BENCHMARK_OPTS, run_benchmark_suite
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the algorithm with synthetic cohorts and prints the results as table and optionally as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--students", type=int, nargs="+", default=[50, 200, 500, 1000, 2000], help="The numbers of students."
+        )
+        parser.add_argument(
+            "--projects",
+            type=int,
+            nargs="+",
+            help="The numbers of projects with two instances each (default: one project per 10 students).",
+        )
+        parser.add_argument("--variants", type=int, nargs="+", default=[1, 3], help="The assignment variants.")
+        parser.add_argument("--seeds", type=int, nargs="+", default=[1], help="The seeds of the data.")
+        parser.add_argument("--max-runtime", type=int, default=60, help="The maximum runtime in seconds.")
+        parser.add_argument("--wing-ratio", type=float, default=0.15, help="The ratio of wings.")
+        parser.add_argument(
+            "--level-weights", type=int, nargs=4, default=[5, 5, 9, 1], help="The weights of the levels 1 to 4."
+        )
+        parser.add_argument("--empty-ratio", type=float, default=0.0, help="The ratio of students with an empty poll.")
+        parser.add_argument(
+            "--opt",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="Overrides an option of the algorithm with a JSON value, e.g. `lns_min_students=400`.",
+        )
+        parser.add_argument("--json", type=Path, help="The path of the JSON file for the results.")
+
+    def handle(self, *args, **options):
+        opts = {}
+        for override in options["opt"]:
+            key, _, value = override.partition("=")
+            if key not in BENCHMARK_OPTS:
+                raise CommandError(f"Unknown option: {key} (available: {', '.join(BENCHMARK_OPTS)})")
+            try:
+                opts[key] = json.loads(value)
+            except json.JSONDecodeError as e:
+                raise CommandError(f"Invalid JSON value for {key}: {value}") from e
+
+        if options["projects"]:
+            cohorts = [
+                (n_students, n_projects) for n_students in options["students"] for n_projects in options["projects"]
+            ]
+        else:
+            cohorts = [(n_students, max(6, n_students // 10)) for n_students in options["students"]]
+
+        data_opts = {
+            "wing_ratio": options["wing_ratio"],
+            "level_weights": tuple(options["level_weights"]),
+            "empty_ratio": options["empty_ratio"],
+        }
+
+        started_at = timezone.localtime()
+        rows = run_benchmark_suite(
+            cohorts, options["variants"], options["seeds"], options["max_runtime"], opts, data_opts
+        )
+
+        self.stdout.write(
+            f"{'students':>8} {'projects':>8} {'seed':>4} {'variant':>7} {'engine':>15} {'status':>10} "
+            + f"{'build':>8} {'solve':>8} {'first':>8} {'1%':>8} {'objective':>10} {'gap':>7} {'memory':>9}"
+        )
+        for row in rows:
+            objective = f"{row['objective_value']:.0f}" if row["objective_value"] is not None else "-"
+            gap = f"{row['solution_gap']:.4f}" if row["solution_gap"] is not None else "-"
+            first = f"{row['first_solution_time']:.2f}s" if row["first_solution_time"] is not None else "-"
+            near_best = f"{row['near_best_time']:.2f}s" if row["near_best_time"] is not None else "-"
+            self.stdout.write(
+                f"{row['n_students']:>8} {row['n_projects']:>8} {row['seed']:>4} {row['variant']:>7} "
+                + f"{row['engine']:>15} {row['status_name']:>10} {row['build_time']:>7.2f}s {row['solve_time']:>7.2f}s "
+                + f"{first:>8} {near_best:>8} {objective:>10} {gap:>7} {row['peak_memory_mb']:>7.0f}MB"
+            )
+
+        if options["json"]:
+            # Saves the results with the environment, so runs can be compared over time.
+            results = {
+                "started_at": started_at.isoformat(),
+                "python": platform.python_version(),
+                "ortools": ortools.__version__,
+                "machine": platform.machine(),
+                "max_runtime": options["max_runtime"],
+                "data_opts": data_opts,
+                # The assignment variant and max runtime are set per row.
+                "opts": {
+                    key: value
+                    for key, value in (BENCHMARK_OPTS | opts).items()
+                    if key not in ["assignment_variant", "max_runtime"]
+                },
+                "rows": rows,
+            }
+            options["json"].write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Saved the results to {options['json']}")
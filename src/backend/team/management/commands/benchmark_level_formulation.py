@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from team.benchmark import benchmark_level_formulations
+
+
+class Command(BaseCommand):
+    help = "Compares the time to optimal of the level formulations with synthetic data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, nargs="+", default=[60, 90], help="The numbers of students.")
+        parser.add_argument("--variants", type=int, nargs="+", default=[2, 3], help="The assignment variants.")
+        parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3], help="The seeds of the data.")
+        parser.add_argument("--max-runtime", type=int, default=60, help="The maximum runtime in seconds.")
+
+    def handle(self, *args, **options):
+        # Uses one project with two instances per 10 students.
+        cohorts = [(n_students, max(6, n_students // 10)) for n_students in options["students"]]
+
+        self.stdout.write(
+            f"{'students':>8} {'seed':>4} {'variant':>7} {'formulation':>11} "
+            + f"{'status':>10} {'runtime':>8} {'objective':>10} {'bound':>10}"
+        )
+        rows = benchmark_level_formulations(cohorts, options["variants"], options["seeds"], options["max_runtime"])
+        for row in rows:
+            objective = f"{row['objective_value']:.0f}" if row["objective_value"] is not None else "-"
+            bound = f"{row['best_objective_bound']:.0f}" if row["best_objective_bound"] is not None else "-"
+            self.stdout.write(
+                f"{row['n_students']:>8} {row['seed']:>4} {row['variant']:>7} {row['level_formulation']:>11} "
+                + f"{row['status_name']:>10} {row['runtime']:>7.2f}s {objective:>10} {bound:>10}"
+            )
@@ -0,0 +1,167 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from ortools.sat.python import cp_model
+
+from team.algorithm import AssignmentAlgorithm, AssignmentLock
+from team.snapshot import load_snapshot
+
+
+class Command(BaseCommand):
+    help = "Replays a snapshot of the assignment algorithm with other parameters and prints the timing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("snapshot", type=Path, help="The path of the snapshot file.")
+        parser.add_argument("--max-runtime", type=int, help="Overrides the maximum runtime in seconds.")
+        parser.add_argument("--num-workers", type=int, help="Overrides the number of workers.")
+        parser.add_argument(
+            "--opt",
+            action="append",
+            default=[],
+            metavar="KEY=VALUE",
+            help="Overrides an option of the algorithm with a JSON value, e.g. `use_two_phase=true`.",
+        )
+        parser.add_argument("--no-hint", action="store_true", help="Runs the algorithm without the solution hint.")
+        parser.add_argument(
+            "--model", action="store_true", help="Solves the exported model instead of building it from the data."
+        )
+        parser.add_argument("--log", action="store_true", help="Logs the search progress (only with `--model`).")
+
+    def handle(self, *args, **options):
+        try:
+            snapshot = load_snapshot(options["snapshot"])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not load the snapshot: {e}") from e
+
+        opts = snapshot["opts"] | self.__parse_opts(snapshot["opts"], options["opt"])
+        if options["max_runtime"] is not None:
+            opts["max_runtime"] = options["max_runtime"]
+        if options["num_workers"] is not None:
+            opts["num_workers"] = options["num_workers"]
+
+        info = snapshot["result_info"]
+        self.stdout.write(
+            f"Snapshot:  {snapshot['created_at']}, {len(snapshot['data'])} students, "
+            + f"{len(snapshot['hint'])} hinted students"
+        )
+        self.stdout.write(self.__format_result(info.get("engine", "-").strip(), info))
+
+        if options["model"]:
+            self.__replay_model(snapshot["model"], opts, options["log"])
+        else:
+            self.__replay_algorithm(snapshot, opts, options["no_hint"])
+
+    def __parse_opts(self, opts: dict, overrides: list[str]) -> dict:
+        """
+        Returns the options given as `KEY=VALUE` with JSON values.
+
+        Args:
+            opts: The options of the snapshot.
+            overrides: The options to override.
+        """
+
+        parsed_opts = {}
+        for override in overrides:
+            key, _, value = override.partition("=")
+            if key not in opts:
+                raise CommandError(f"Unknown option: {key} (available: {', '.join(opts)})")
+            try:
+                parsed_opts[key] = json.loads(value)
+            except json.JSONDecodeError as e:
+                raise CommandError(f"Invalid JSON value for {key}: {value}") from e
+
+        return parsed_opts
+
+    def __format_result(self, label: str, info: dict) -> str:
+        """
+        Returns one line with the status, timing and objective of the result info.
+
+        Args:
+            label: The label of the line.
+            info: The result info.
+        """
+
+        def format_number(key: str, format_spec: str) -> str:
+            value = info.get(key)
+            return format(value, format_spec) if isinstance(value, int | float) else "-"
+
+        return (
+            f"{label + ':':<10} {info.get('status_name', '-')}, wall time {format_number('wall_time', '.2f')} s, "
+            + f"objective {format_number('objective_value', '.0f')}, "
+            + f"bound {format_number('best_objective_bound', '.0f')}, gap {format_number('solution_gap', '.4f')}"
+        )
+
+    def __replay_algorithm(self, snapshot: dict, opts: dict, no_hint: bool):
+        """
+        Runs the algorithm with the data, limits and hint of the snapshot.
+
+        Args:
+            snapshot: The loaded snapshot.
+            opts: The options for the algorithm.
+            no_hint: Whether the algorithm runs without the solution hint.
+        """
+
+        # Uses a lock within this process, because the replay is independent of the database.
+        AssignmentAlgorithm.set_lock(AssignmentLock())
+
+        start_time = time.perf_counter()
+        algorithm = AssignmentAlgorithm(snapshot["data"], snapshot["limits"], opts)
+        if not no_hint:
+            algorithm.add_hint(snapshot["hint"])
+        init_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        algorithm.run()
+        run_time = time.perf_counter() - start_time
+
+        info = algorithm.get_result()["info"]
+        self.stdout.write(self.__format_result(f"Replay ({info.get('engine', '-').strip()})", info))
+        self.stdout.write(f"Timing:    init {init_time:.2f} s, run {run_time:.2f} s")
+
+    def __replay_model(self, model_proto: bytes, opts: dict, log: bool):
+        """
+        Solves the exported model of the snapshot with the solver options.
+
+        Args:
+            model_proto: The serialized `CpModelProto`.
+            opts: The options for the solver.
+            log: Whether the search progress is logged.
+        """
+
+        start_time = time.perf_counter()
+        model = cp_model.CpModel()
+        model.proto.ParseFromString(model_proto)
+        load_time = time.perf_counter() - start_time
+        if len(model.proto.variables) == 0:
+            raise CommandError("The snapshot has no model, e.g. because the min cost flow engine was used.")
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = opts["max_runtime"]
+        solver.parameters.relative_gap_limit = opts["relative_gap_limit"]
+        solver.parameters.num_workers = opts["num_workers"]
+        solver.parameters.log_search_progress = log
+
+        start_time = time.perf_counter()
+        solver.Solve(model)
+        solve_time = time.perf_counter() - start_time
+
+        self.stdout.write(
+            self.__format_result(
+                "Model",
+                {
+                    "status_name": solver.status_name(),
+                    "wall_time": solver.wall_time,
+                    "objective_value": solver.objective_value,
+                    "best_objective_bound": solver.best_objective_bound,
+                    "solution_gap": abs(1 - solver.objective_value / solver.best_objective_bound)
+                    if solver.best_objective_bound != 0
+                    else "-",
+                },
+            )
+        )
+        self.stdout.write(
+            f"Timing:    load {load_time:.2f} s, solve {solve_time:.2f} s, "
+            + f"{len(model.proto.variables)} variables, {len(model.proto.constraints)} constraints"
+        )
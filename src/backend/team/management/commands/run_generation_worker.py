@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from team.helper import fail_interrupted_generation_jobs, run_next_generation_job
+
+
+class Command(BaseCommand):
+    help = "Runs the queued team generation jobs outside of the web workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=2.0, help="The polling interval in seconds.")
+        parser.add_argument("--once", action="store_true", help="Runs the queued jobs and exits.")
+
+    def handle(self, *args, **options):
+        # Jobs still running belong to a previous worker, which was stopped.
+        fail_interrupted_generation_jobs()
+
+        self.stdout.write("Waiting for team generation jobs ...")
+        while True:
+            while run_next_generation_job():
+                self.stdout.write("Finished a team generation job.")
+
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0017_solverlock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='best_objective_bound',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='gap',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='n_solutions',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='objective_value',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='wall_time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
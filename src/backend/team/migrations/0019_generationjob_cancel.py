@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0018_generationjob_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='cancel_requested',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='generationjob',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Wartend'), ('running', 'Läuft'), ('done', 'Fertig'), ('failed', 'Fehlgeschlagen'), ('cancelled', 'Abgebrochen')], default='queued', max_length=16),
+        ),
+    ]
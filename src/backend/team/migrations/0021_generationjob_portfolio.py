@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0020_cachedresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='kind',
+            field=models.CharField(choices=[('generation', 'Teamgenerierung'), ('portfolio', 'Variantenvergleich')], default='generation', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='result',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0021_generationjob_portfolio'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='params',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='generationjob',
+            name='kind',
+            field=models.CharField(choices=[('generation', 'Teamgenerierung'), ('portfolio', 'Variantenvergleich'), ('sweep', 'Teamgrößenvergleich')], default='generation', max_length=16),
+        ),
+    ]
@@ -47,3 +47,66 @@ class TeamMember(models.Model):
 
     def __str__(self) -> str:
         return f"{self.team.project_instance}: {self.student.name2}"
+
+
+class GenerationJob(models.Model):
+    class Kind(models.TextChoices):
+        GENERATION = "generation", "Teamgenerierung"
+        PORTFOLIO = "portfolio", "Variantenvergleich"
+        SWEEP = "sweep", "Teamgrößenvergleich"
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Wartend"
+        RUNNING = "running", "Läuft"
+        DONE = "done", "Fertig"
+        FAILED = "failed", "Fehlgeschlagen"
+        CANCELLED = "cancelled", "Abgebrochen"
+
+    kind = models.CharField(max_length=16, choices=Kind.choices, default=Kind.GENERATION)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True, default="")
+    cancel_requested = models.BooleanField(default=False)
+    force_solve = models.BooleanField(default=False)
+    # The arguments of the job, e.g. the team sizes of a sweep job.
+    params = models.JSONField(blank=True, null=True)
+    # The summary per assignment variant or team size of a portfolio or sweep job.
+    result = models.JSONField(blank=True, null=True)
+    # The progress of the solver (see `AssignmentAlgorithm.set_progress_callback()`).
+    n_solutions = models.IntegerField(default=0)
+    objective_value = models.FloatField(blank=True, null=True)
+    best_objective_bound = models.FloatField(blank=True, null=True)
+    gap = models.FloatField(blank=True, null=True)
+    wall_time = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:
+        return f"{self.created_at}: {self.status}"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (self.Status.QUEUED, self.Status.RUNNING)
+
+
+class SolverLock(models.Model):
+    owner = models.CharField(max_length=64, blank=True, default="")
+    acquired_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"{self.owner or '-'}: {self.heartbeat_at}"
+
+
+class CachedResult(models.Model):
+    # The hash of the data, limits and options of the algorithm.
+    key = models.CharField(max_length=64, unique=True)
+    polls_last_update = models.DateTimeField(blank=True, null=True)
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.key[:12]}: {self.created_at}"
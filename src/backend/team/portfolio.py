@@ -0,0 +1,147 @@
+"""
+This module solves several assignments at the same time in a process
+pool (portfolio), e.g. to compare the assignment variants or team sizes
+side by side.
+
+The worker processes are spawned and only import the algorithm, so
+they don't use the database and don't need the shared lock.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .algorithm import AssignmentAlgorithm
+
+
+def solve_variant(data: dict[int, dict], limits: dict, opts: dict, stop_event=None, interval: float = 1.0) -> dict:
+    """
+    Solves the assignment with the given limits and options and returns the result.
+
+    Args:
+        data: The data per student.
+        limits: The limits for the algorithm.
+        opts: The options for the algorithm.
+        stop_event: The event of the main process, which stops the search if
+            it is set. The best solution found so far is used.
+        interval: The seconds between two checks of the stop event.
+    """
+
+    algorithm = AssignmentAlgorithm(data, limits, opts)
+    if stop_event is None:
+        algorithm.run()
+        return algorithm.get_result()
+
+    is_finished = threading.Event()
+
+    def watch():
+        while not stop_event.is_set():
+            if is_finished.wait(interval):
+                return
+        algorithm.stop()
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        algorithm.run()
+    finally:
+        is_finished.set()
+        watcher.join()
+
+    return algorithm.get_result()
+
+
+def solve_in_parallel(
+    data: dict[int, dict], runs: dict, num_workers: int, should_stop=None, interval: float = 1.0
+) -> dict:
+    """
+    Solves the given runs at the same time and returns the result per run.
+
+    The cores of the solver (`num_workers`, `0` for all cores) are split
+    across the runs. If there are more runs than cores, the remaining
+    runs wait for a free worker process. A failed run has no assignments
+    and the error in its info.
+
+    Args:
+        data: The data per student.
+        runs: The limits and options per run as `{key: (limits, opts)}`.
+        num_workers: The number of cores for all runs.
+        should_stop: The function, which returns whether the runs should be
+            stopped. Every run uses the best solution found so far.
+        interval: The seconds between two calls of `should_stop`.
+    """
+
+    n_cores = num_workers or os.cpu_count() or 1
+    n_processes = max(1, min(len(runs), n_cores))
+    num_workers_per_run = max(1, n_cores // n_processes)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager, ProcessPoolExecutor(max_workers=n_processes, mp_context=context) as executor:
+        # The event is shared with the worker processes to stop their search.
+        stop_event = manager.Event() if should_stop is not None else None
+        futures = {
+            key: executor.submit(solve_variant, data, limits, opts | {"num_workers": num_workers_per_run}, stop_event)
+            for key, (limits, opts) in runs.items()
+        }
+
+        # Stops the runs, if requested.
+        if should_stop is not None:
+            not_done = set(futures.values())
+            while not_done:
+                _, not_done = wait(not_done, timeout=interval)
+                if not_done and should_stop():
+                    stop_event.set()
+                    break
+
+        results = {}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logging.getLogger(__name__).exception(f"Run {key} failed")
+                results[key] = {"assignments": [], "info": {"status_name": "ERROR", "error": str(e)}}
+
+        return results
+
+
+def run_portfolio(
+    data: dict[int, dict], limits: dict, opts: dict, variants: list[int], should_stop=None
+) -> dict[int, dict]:
+    """
+    Solves the given assignment variants at the same time and returns the result per variant.
+
+    Args:
+        data: The data per student.
+        limits: The limits for the algorithm.
+        opts: The options for the algorithm.
+        variants: The assignment variants.
+        should_stop: The function, which returns whether the runs should be stopped.
+    """
+
+    runs = {variant: (limits, opts | {"assignment_variant": variant}) for variant in variants}
+    return solve_in_parallel(data, runs, opts["num_workers"], should_stop)
+
+
+def run_size_sweep(
+    data: dict[int, dict], limits: dict, opts: dict, min_sizes: list[int], max_runtime: int, should_stop=None
+) -> dict[int, dict]:
+    """
+    Solves the assignment for the given minimum team sizes at the same time
+    with a short runtime and returns the result per minimum team size.
+
+    Args:
+        data: The data per student.
+        limits: The limits for the algorithm.
+        opts: The options for the algorithm.
+        min_sizes: The minimum numbers of students per project instance.
+        max_runtime: The maximum runtime of every run in seconds.
+        should_stop: The function, which returns whether the runs should be stopped.
+    """
+
+    runs = {
+        min_size: (limits | {"min_students_per_project": min_size}, opts | {"max_runtime": max_runtime})
+        for min_size in min_sizes
+    }
+    return solve_in_parallel(data, runs, opts["num_workers"], should_stop)
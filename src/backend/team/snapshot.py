@@ -0,0 +1,90 @@
+"""
+This module implements snapshots of the input, model and result info of the
+assignment algorithm, which can be replayed offline without the database
+(see `python manage.py replay_assignment`).
+
+A snapshot is a gzipped JSON file with the model as base64-encoded
+serialized `CpModelProto`.
+"""
+
+import base64
+import gzip
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .algorithm import AssignmentAlgorithm
+
+# The version of the snapshot format.
+SNAPSHOT_VERSION = 1
+
+
+def save_snapshot(
+    data: dict[int, dict], limits: dict, opts: dict, hint: list[tuple[int, int]], algorithm: AssignmentAlgorithm
+) -> Path:
+    """
+    Saves a snapshot of a finished run of the algorithm in the snapshot
+    directory and returns its path.
+
+    Args:
+        data: The data per student.
+        limits: The limits for the algorithm.
+        opts: The options for the algorithm.
+        hint: The solution hint as `(project_id, student_id)` tuples.
+        algorithm: The algorithm after the run.
+    """
+
+    created_at = timezone.localtime()
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": created_at.isoformat(),
+        "data": data,
+        "limits": limits,
+        "opts": opts,
+        "hint": hint,
+        "model": base64.b64encode(algorithm.export_model()).decode("ascii"),
+        "result_info": algorithm.get_result()["info"],
+    }
+
+    settings.SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    path = settings.SNAPSHOT_DIR / f"snapshot_{created_at:%Y%m%d_%H%M%S_%f}.json.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(snapshot, file, default=str)
+
+    return path
+
+
+def load_snapshot(path: Path) -> dict:
+    """
+    Loads a snapshot and returns it with the data, limits and hint as
+    given to the algorithm and the model as serialized `CpModelProto`.
+
+    JSON only supports string keys, so the student, project instance
+    and level ids are converted back to integers.
+
+    Args:
+        path: The path of the snapshot.
+    """
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        snapshot = json.load(file)
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}")
+
+    snapshot["data"] = {
+        int(s_id): {
+            **student_data,
+            "project_answers": {int(p_id): score for p_id, score in student_data["project_answers"].items()},
+        }
+        for s_id, student_data in snapshot["data"].items()
+    }
+    snapshot["limits"]["n_students_per_level"] = {
+        int(level): n_students for level, n_students in snapshot["limits"]["n_students_per_level"].items()
+    }
+    snapshot["hint"] = [(p_id, s_id) for p_id, s_id in snapshot["hint"]]
+    snapshot["model"] = base64.b64decode(snapshot["model"])
+
+    return snapshot
@@ -1,3 +1,335 @@
-# from django.test import TestCase
+import math
+from datetime import timedelta
 
-# Create your tests here.
+from app.models import Info
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .algorithm import AssignmentAlgorithm, AssignmentLock
+from .benchmark import BENCHMARK_OPTS, generate_synthetic_data
+from .helper import (
+    cache_result,
+    cancel_generation_job,
+    fail_interrupted_generation_jobs,
+    get_active_generation_job,
+    get_cache_key,
+    get_cached_result,
+    queue_generation_job,
+    run_generation_job,
+    run_next_generation_job,
+)
+from .lock import DatabaseLock
+from .models import GenerationJob, SolverLock
+
+
+class AssignmentAlgorithmTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Uses a lock within this process, because the tests are independent of the database.
+        cls.lock = AssignmentAlgorithm.get_lock()
+        AssignmentAlgorithm.set_lock(AssignmentLock())
+
+    @classmethod
+    def tearDownClass(cls):
+        AssignmentAlgorithm.set_lock(cls.lock)
+        super().tearDownClass()
+
+    def __get_objective_value(self, data: dict[int, dict], assignments: list[tuple[int, int, int]]) -> int:
+        """
+        Returns the objective of the given assignments with score and level (variant `3`).
+
+        Args:
+            data: The data per student.
+            assignments: The assignments as `(project_id, student_id, score)` tuples.
+        """
+
+        levels_per_project = {}
+        for p_id, s_id, _ in assignments:
+            levels_per_project.setdefault(p_id, []).append(data[s_id]["level_answer"])
+
+        objective_value = sum(score for _, _, score in assignments)
+        for levels in levels_per_project.values():
+            for level, weight in {2: 100, 3: 25, 4: 100}.items():
+                if 0 < levels.count(level) < len(levels):
+                    objective_value -= weight
+
+        return objective_value
+
+    def test_local_search_with_two_phase(self):
+        n_students, min_students_per_project = 200, 6
+        data, n_students_per_level = generate_synthetic_data(n_students, 20, 2, seed=1)
+        limits = {
+            "max_project_score": 5,
+            "min_students_per_project": min_students_per_project,
+            "n_students_per_level": n_students_per_level,
+        }
+
+        for lns_min_students in [0, 100]:
+            with self.subTest(lns_min_students=lns_min_students):
+                opts = BENCHMARK_OPTS | {
+                    "assignment_variant": 3,
+                    "max_runtime": 2,
+                    "use_two_phase": True,
+                    "lns_min_students": lns_min_students,
+                    "local_search_runtime": 5,
+                }
+                algorithm = AssignmentAlgorithm(data, limits, opts)
+                algorithm.run()
+                result = algorithm.get_result()
+                info = result["info"]
+
+                self.assertTrue(info["engine"].startswith("two_phase"))
+                self.assertIn(info["status_name"], ["OPTIMAL", "FEASIBLE"])
+
+                # Every student is assigned once to a project instance with a valid size.
+                assignments = result["assignments"]
+                self.assertEqual(sorted(s_id for _, s_id, _ in assignments), list(data))
+                members = {}
+                for p_id, s_id, _ in assignments:
+                    members.setdefault(p_id, []).append(s_id)
+                self.assertEqual(len(members), math.floor(n_students / min_students_per_project))
+                for s_ids in members.values():
+                    self.assertIn(len(s_ids), [min_students_per_project, min_students_per_project + 1])
+                    levels = {data[s_id]["level_answer"] for s_id in s_ids}
+                    self.assertFalse({2, 4} <= levels)
+
+                # The local search only runs after a feasible result and never lowers the objective.
+                if info["status_name"] == "FEASIBLE":
+                    self.assertGreaterEqual(info["local_search_gain"], 0)
+                    # The start assignment as result has no objective (see `__extract_start_result()`).
+                    if info["objective_value"] is not None:
+                        self.assertEqual(info["objective_value"], self.__get_objective_value(data, assignments))
+
+    def test_local_search_moves_and_swaps(self):
+        # Students 0 to 5 want project 1, students 6 to 12 want project 0.
+        data = {
+            s_id: {"is_wing": 0, "project_answers": {int(s_id < 6): 5, int(s_id >= 6): 1}, "level_answer": 1}
+            for s_id in range(13)
+        }
+        limits = {
+            "max_project_score": 5,
+            "min_students_per_project": 6,
+            "n_students_per_level": {1: 13, 2: 0, 3: 0, 4: 0},
+        }
+        opts = BENCHMARK_OPTS | {"max_runtime": 0, "use_min_cost_flow": False, "local_search_runtime": 5}
+
+        # Without runtime, the solver finds no solution and the hint (every student
+        # in the unwanted project) is the result, which the local search improves.
+        algorithm = AssignmentAlgorithm(data, limits, opts)
+        algorithm.add_hint([(0, s_id) for s_id in range(6)] + [(1, s_id) for s_id in range(6, 13)])
+        algorithm.run()
+        result = algorithm.get_result()
+        info = result["info"]
+
+        self.assertEqual(info["start_name"], "hint")
+        self.assertEqual(info["local_search_gain"], 1300)
+        self.assertGreater(info["local_search_swaps"], 0)
+        self.assertGreater(info["local_search_moves"], 0)
+        self.assertEqual(info["total_score"], 1300)
+        self.assertEqual(
+            sorted((p_id, s_id) for p_id, s_id, _ in result["assignments"]),
+            sorted([(1, s_id) for s_id in range(6)] + [(0, s_id) for s_id in range(6, 13)]),
+        )
+
+    def test_min_cost_flow_has_the_objective_of_cp_sat(self):
+        for n_projects, n_instances, engine in [(10, 1, "min_cost_flow"), (10, 2, "two_phase_min_cost_flow")]:
+            data, n_students_per_level = generate_synthetic_data(60, n_projects, n_instances, seed=2)
+            limits = {
+                "max_project_score": 5,
+                "min_students_per_project": 6,
+                "n_students_per_level": n_students_per_level,
+            }
+
+            results = {}
+            for use_min_cost_flow in [False, True]:
+                opts = BENCHMARK_OPTS | {
+                    "assignment_variant": 1,
+                    "max_runtime": 20,
+                    "use_min_cost_flow": use_min_cost_flow,
+                    "use_greedy_start": False,
+                    "local_search_runtime": 0,
+                }
+                algorithm = AssignmentAlgorithm(data, limits, opts)
+                algorithm.run()
+                results[use_min_cost_flow] = algorithm.get_result()["info"]
+
+            with self.subTest(engine=engine):
+                self.assertEqual(results[True]["engine"].strip(), engine)
+                self.assertEqual(results[False]["status_name"], "OPTIMAL")
+                self.assertEqual(results[True]["status_name"], "OPTIMAL")
+                self.assertEqual(results[True]["objective_value"], results[False]["objective_value"])
+
+    def test_repair_moves_only_students_of_broken_teams(self):
+        # Project instance 2 is broken (too few members) and students 18 and 19 are new.
+        previous_project = {s_id: 0 if s_id < 7 else 1 if s_id < 14 else 2 for s_id in range(18)}
+        # The students of the intact project instances 0 and 1 would rather be in project instance 2.
+        data = {
+            s_id: {
+                "is_wing": 0,
+                "project_answers": {0: 1, 1: 1, 2: 5} if previous_project.get(s_id, 2) != 2 else {0: 5, 1: 5, 2: 1},
+                "level_answer": 1,
+            }
+            for s_id in range(20)
+        }
+        limits = {
+            "max_project_score": 5,
+            "min_students_per_project": 6,
+            "n_students_per_level": {1: 20, 2: 0, 3: 0, 4: 0},
+        }
+        opts = BENCHMARK_OPTS | {"max_runtime": 10, "local_search_runtime": 0}
+
+        algorithm = AssignmentAlgorithm(data, limits, opts)
+        algorithm.add_hint([(p_id, s_id) for s_id, p_id in previous_project.items()])
+        algorithm.repair(max_runtime=10)
+        result = algorithm.get_result()
+        info = result["info"]
+
+        self.assertEqual(info["repair_neighbourhood"], "broken_teams")
+        self.assertEqual(info["n_broken_projects"], 1)
+        self.assertEqual(sorted(s_id for _, s_id, _ in result["assignments"]), list(data))
+        for p_id, s_id, _ in result["assignments"]:
+            if previous_project.get(s_id, 2) != 2:
+                self.assertEqual(p_id, previous_project[s_id])
+            else:
+                self.assertEqual(p_id, 2)
+
+        # Without runtime, no stage is solved.
+        algorithm = AssignmentAlgorithm(data, limits, opts)
+        algorithm.add_hint([(p_id, s_id) for s_id, p_id in previous_project.items()])
+        algorithm.repair(max_runtime=0)
+        self.assertEqual(algorithm.get_result()["info"]["repair_neighbourhood"], "-")
+
+    def test_symmetry_breaking_keeps_the_best_score(self):
+        # Identical students, so they are compressed into one class, which is split over
+        # the two instances of the project with the best score.
+        data = {
+            s_id: {"is_wing": 0, "project_answers": {0: 5, 1: 5, 2: 1, 3: 1}, "level_answer": 1} for s_id in range(12)
+        }
+        limits = {
+            "max_project_score": 5,
+            "min_students_per_project": 6,
+            "n_students_per_level": {1: 12, 2: 0, 3: 0, 4: 0},
+        }
+
+        for symmetry_breaking in [0, 1, 2]:
+            for compress_students in [False, True]:
+                with self.subTest(symmetry_breaking=symmetry_breaking, compress_students=compress_students):
+                    opts = BENCHMARK_OPTS | {
+                        "max_runtime": 10,
+                        "symmetry_breaking": symmetry_breaking,
+                        "compress_students": compress_students,
+                        "use_min_cost_flow": False,
+                        "use_greedy_start": False,
+                        "local_search_runtime": 0,
+                    }
+                    algorithm = AssignmentAlgorithm(data, limits, opts)
+                    algorithm.run()
+                    result = algorithm.get_result()
+
+                    self.assertEqual(result["info"]["status_name"], "OPTIMAL")
+                    self.assertEqual(sum(score for _, _, score in result["assignments"]), 1200)
+
+
+class CachedResultTests(TestCase):
+    def setUp(self):
+        self.key = get_cache_key({0: {"level_answer": 1}}, {"min_students_per_project": 6}, {"max_runtime": 1})
+        self.result = {"assignments": [(0, 0, 5)], "info": {"status_name": "OPTIMAL"}}
+
+    def test_cache_hit_until_polls_change(self):
+        cache_result(self.key, self.result)
+        cached_result = get_cached_result(self.key)
+        self.assertEqual(cached_result["assignments"], self.result["assignments"])
+        self.assertTrue(cached_result["info"]["from_cache"])
+
+        # A changed poll evicts the cached result.
+        Info.objects.update_or_create(defaults={"polls_last_update": timezone.now()})
+        self.assertIsNone(get_cached_result(self.key))
+
+        cache_result(self.key, self.result)
+        self.assertIsNotNone(get_cached_result(self.key))
+
+    def test_cache_only_solutions_of_the_solver(self):
+        for info in [
+            {"status_name": "FEASIBLE", "start_name": "greedy"},
+            {"status_name": "FEASIBLE", "is_stopped": True},
+            {"status_name": "UNKNOWN"},
+        ]:
+            with self.subTest(info=info):
+                cache_result(self.key, {"assignments": self.result["assignments"], "info": info})
+                self.assertIsNone(get_cached_result(self.key))
+
+
+class DatabaseLockTests(TestCase):
+    def setUp(self):
+        # Another process is simulated by another lock, so the heartbeat is not needed.
+        self.lock = DatabaseLock(heartbeat_interval=3600)
+        self.other_lock = DatabaseLock(heartbeat_interval=3600)
+
+    def tearDown(self):
+        self.lock.reset()
+        self.other_lock.reset()
+
+    def test_acquire_and_release(self):
+        self.assertTrue(self.lock.acquire())
+        self.assertTrue(self.lock.is_locked())
+        self.assertFalse(self.other_lock.acquire())
+
+        # The lock is re-entrant for the holding thread and freed by the last release.
+        self.assertTrue(self.lock.acquire())
+        self.lock.release()
+        self.assertFalse(self.other_lock.acquire())
+        self.lock.release()
+        self.assertFalse(self.lock.is_locked())
+
+        self.assertTrue(self.other_lock.acquire())
+        self.assertFalse(self.lock.acquire())
+
+    def test_expired_lock_is_acquired(self):
+        self.assertTrue(self.lock.acquire())
+
+        # The owner crashed and the heartbeat stopped.
+        SolverLock.objects.filter(pk=1).update(heartbeat_at=timezone.now() - timedelta(seconds=61))
+        self.assertFalse(self.lock.is_locked())
+        self.assertTrue(self.other_lock.acquire())
+
+        # The release of the previous owner keeps the lock of the new owner.
+        self.lock.release()
+        self.assertTrue(self.other_lock.is_locked())
+        self.assertFalse(self.lock.acquire())
+
+
+class GenerationJobTests(TestCase):
+    def test_job_is_run_once(self):
+        job = queue_generation_job()
+        self.assertIsNone(queue_generation_job())
+
+        # Without polls, the teams cannot be generated.
+        self.assertTrue(run_next_generation_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.FAILED)
+        self.assertIn("keine Fragebögen", job.error)
+        self.assertIsNotNone(job.started_at)
+        self.assertIsNotNone(job.finished_at)
+
+        self.assertFalse(run_generation_job(job))
+        self.assertFalse(run_next_generation_job())
+        self.assertIsNotNone(queue_generation_job())
+
+    def test_cancel_queued_job(self):
+        job = queue_generation_job()
+        self.assertTrue(cancel_generation_job())
+        self.assertFalse(cancel_generation_job())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.CANCELLED)
+        self.assertFalse(run_generation_job(job))
+
+    def test_fail_interrupted_jobs(self):
+        job = queue_generation_job()
+        GenerationJob.objects.filter(pk=job.pk).update(status=GenerationJob.Status.RUNNING)
+        fail_interrupted_generation_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, GenerationJob.Status.FAILED)
+        self.assertIsNone(get_active_generation_job())